@@ -0,0 +1,217 @@
+import json
+from django.db.models import Count, Max
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+from .live import broker
+from .models import Game, GameScoreEvent, TeamSeasonStats
+from .timeline import game_timeline, scoreboard_at, scoring_plays
+from .utils import get_live_snapshot
+from .views import calculate_team_stats_before_game, calculate_head_to_head
+
+
+def _rows_etag(prefix, queryset):
+    """Strong ETag from the row count and newest last_updated of a queryset"""
+    stamp = queryset.order_by().aggregate(count=Count('id'), latest=Max('last_updated'))
+    latest = stamp['latest'].timestamp() if stamp['latest'] else 0
+    return f"{prefix}-{stamp['count']}-{latest:.6f}"
+
+
+def _team_json(team):
+    return {
+        'abbr': team.name,
+        'name': team.full_name or team.name,
+        'conference': team.conference,
+        'division': team.division,
+    }
+
+
+def _game_json(game):
+    return {
+        'id': game.id,
+        'season': game.season,
+        'week': game.week,
+        'game_date': game.game_date.isoformat(),
+        'away_team': _team_json(game.away_team),
+        'home_team': _team_json(game.home_team),
+        'away_score': game.away_score,
+        'home_score': game.home_score,
+        'is_live': game.is_live,
+        'is_finished': game.is_finished,
+        'status': game.game_status,
+        'quarter': game.quarter_display,
+        'time_remaining': game.time_remaining,
+        'last_updated': game.last_updated.isoformat(),
+    }
+
+
+def _score_event_json(event):
+    return {
+        'recorded_at': event.recorded_at.isoformat(),
+        'home_score': event.home_score,
+        'away_score': event.away_score,
+        'is_live': event.is_live,
+        'status': event.game_status,
+        'quarter': event.quarter,
+        'time_remaining': event.time_remaining,
+    }
+
+
+def scoreboard_etag(request, season, week):
+    return _rows_etag(f'scoreboard-{season}-{week}', Game.objects.filter(season=season, week=week))
+
+
+def live_games_etag(request):
+    return f"live-{get_live_snapshot()['version']}"
+
+
+def team_records_etag(request, season):
+    return _rows_etag(f'teams-{season}', TeamSeasonStats.objects.filter(season=season))
+
+
+def game_detail_etag(request, game_id):
+    game = Game.objects.filter(pk=game_id).values('home_team', 'away_team', 'last_updated').first()
+    if game is None:
+        return None
+    # Pre-game records and the head-to-head series change with any game of either team
+    team_stats = TeamSeasonStats.objects.filter(team__in=[game['home_team'], game['away_team']])
+    return f"game-{game_id}-{game['last_updated'].timestamp():.6f}-" + _rows_etag('teams', team_stats)
+
+
+def game_timeline_etag(request, game_id):
+    # The log is append-only, so its size and newest id identify its contents
+    stamp = GameScoreEvent.objects.filter(game_id=game_id).aggregate(count=Count('id'), latest=Max('id'))
+    return f"timeline-{game_id}-{stamp['count']}-{stamp['latest'] or 0}"
+
+
+@require_GET
+@cache_control(no_cache=True)
+@condition(etag_func=scoreboard_etag)
+def scoreboard(request, season, week):
+    """All games of one week"""
+    games = Game.objects.filter(season=season, week=week).select_related('home_team', 'away_team').order_by('game_date')
+    return JsonResponse({
+        'season': season,
+        'week': week,
+        'games': [_game_json(game) for game in games],
+    })
+
+
+@require_GET
+@cache_control(no_cache=True)
+@condition(etag_func=live_games_etag)
+def live_games(request):
+    """Games currently in progress"""
+    return JsonResponse({
+        'games': [_game_json(game_info['game']) for game_info in get_live_snapshot()['games']],
+    })
+
+
+@require_GET
+@cache_control(no_cache=True)
+@condition(etag_func=team_records_etag)
+def team_records(request, season):
+    """W/L/T and points of every team in a season"""
+    season_stats = TeamSeasonStats.objects.filter(season=season).select_related('team').order_by('team__name')
+    return JsonResponse({
+        'season': season,
+        'teams': [
+            {
+                **_team_json(stats.team),
+                'wins': stats.wins,
+                'losses': stats.losses,
+                'ties': stats.ties,
+                'games_played': stats.games_played,
+                'games_scheduled': stats.games_scheduled,
+                'points_for': stats.points_for,
+                'points_against': stats.points_against,
+                'home': {'wins': stats.home_wins, 'losses': stats.home_losses, 'ties': stats.home_ties},
+                'away': {'wins': stats.away_wins, 'losses': stats.away_losses, 'ties': stats.away_ties},
+            }
+            for stats in season_stats
+        ],
+    })
+
+
+@require_GET
+@cache_control(no_cache=True)
+@condition(etag_func=game_detail_etag)
+def game_detail(request, game_id):
+    """One game with both teams' records before it and their head-to-head series"""
+    game = get_object_or_404(Game.objects.select_related('home_team', 'away_team'), id=game_id)
+    h2h_stats = calculate_head_to_head(game.away_team, game.home_team, before_date=game.game_date)
+    return JsonResponse({
+        'game': _game_json(game),
+        'away_team_stats': calculate_team_stats_before_game(game.away_team, game),
+        'home_team_stats': calculate_team_stats_before_game(game.home_team, game),
+        'head_to_head': {
+            'away_wins': h2h_stats['away_wins'],
+            'home_wins': h2h_stats['home_wins'],
+            'ties': h2h_stats['ties'],
+            'recent_games': [_game_json(recent_game) for recent_game in h2h_stats['recent_games']],
+        },
+    })
+
+
+@require_GET
+@cache_control(no_cache=True)
+@condition(etag_func=game_timeline_etag)
+def game_score_timeline(request, game_id):
+    """Every recorded scoreboard state of a game and its scoring changes, for timelines and momentum charts"""
+    game = get_object_or_404(Game, id=game_id)
+    events = list(game_timeline(game.id))
+    return JsonResponse({
+        'game_id': game.id,
+        'events': [_score_event_json(event) for event in events],
+        'scoring': [
+            {
+                'recorded_at': play['event'].recorded_at.isoformat(),
+                'quarter': play['event'].quarter,
+                'time_remaining': play['event'].time_remaining,
+                'home_points': play['home_points'],
+                'away_points': play['away_points'],
+                'home_score': play['event'].home_score,
+                'away_score': play['event'].away_score,
+                'margin': play['margin'],
+            }
+            for play in scoring_plays(events)
+        ],
+    })
+
+
+@require_GET
+def scoreboard_replay(request, season, week):
+    """A week's scoreboard as it stood at ``?at=<ISO 8601 timestamp>``, rebuilt from the score log"""
+    moment = parse_datetime(request.GET.get('at', ''))
+    if moment is None or moment.tzinfo is None:
+        return HttpResponseBadRequest('at must be an ISO 8601 timestamp with a UTC offset')
+    states = scoreboard_at(moment, season, week)
+    return JsonResponse({
+        'season': season,
+        'week': week,
+        'at': moment.isoformat(),
+        'games': [{'id': game_id, **_score_event_json(event)} for game_id, event in sorted(states.items())],
+    })
+
+
+@require_GET
+async def live_stream(request):
+    """
+    Server-sent events: the live games once, then a diff each time one changes.
+
+    Needs the ASGI application; under WSGI the response would never finish.
+    """
+    async def stream():
+        yield f'retry: {broker.interval * 1000}\n\n'
+        async for event, data in broker.events():
+            if event is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Don't let a proxy hold events back
+    return response
@@ -0,0 +1,72 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from .espn import fetch_scoreboard
+
+# Defaults for parallel backfills: requests in flight, and requests per second
+# allowed to reach ESPN (cached responses don't count)
+BACKFILL_WORKERS = 8
+BACKFILL_RATE = 4.0
+
+
+class TokenBucket:
+    """Thread-safe rate limiter allowing ``rate`` calls per second with bursts of ``burst``"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def fetch_scoreboards(queries, workers=BACKFILL_WORKERS, rate=BACKFILL_RATE):
+    """
+    Fetch many scoreboards concurrently, yielding ``(query, payload, error)`` as each completes.
+
+    ``queries`` are dicts of fetch_scoreboard parameters. At most
+    ``workers`` requests are in flight and at most ``rate`` per second
+    reach the network; one of payload or error is None. Any exception
+    fetching or decoding one query, or a payload that isn't a scoreboard,
+    is yielded as that query's error rather than ending the backfill.
+    Nothing here touches the database, so the caller stays the only writer.
+    """
+    bucket = TokenBucket(rate)
+    local = threading.local()
+    sessions = []
+
+    def fetch(query):
+        if not hasattr(local, 'session'):
+            # requests.Session isn't safe to share between threads
+            local.session = requests.Session()
+            sessions.append(local.session)
+        payload = fetch_scoreboard(local.session, throttle=bucket.acquire, **query)
+        if not isinstance(payload, dict) or not isinstance(payload.get('events', []), list):
+            raise ValueError(f'Unexpected scoreboard payload: {str(payload)[:100]}')
+        return payload
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(fetch, query): query for query in queries}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+    finally:
+        for session in sessions:
+            session.close()
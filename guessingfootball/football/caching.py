@@ -0,0 +1,102 @@
+import time
+from functools import wraps
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from .models import Game
+from .schedule import get_current_nfl_week
+
+# Version stamps are kept in the shared cache and bumped by the Game and
+# Team signal handlers, so a page is re-rendered as soon as any game it
+# shows is written and is otherwise served from cache indefinitely.
+VERSION_KEY_PREFIX = 'version'
+PAGE_KEY_PREFIX = 'page'
+
+
+def season_scope(season):
+    return f'season:{season}'
+
+
+def week_scope(season, week):
+    return f'week:{season}:{week}'
+
+
+def team_scope(team_name):
+    return f'team:{team_name}'
+
+
+# Any Team row (names, 2024 rankings) shown across pages
+TEAMS_SCOPE = 'teams'
+
+
+def game_page_scopes(game_id):
+    """A game page shows both teams' season records and their head-to-head series"""
+    team_names = Game.objects.filter(pk=game_id).values_list('home_team__name', 'away_team__name').first()
+    return [team_scope(name) for name in team_names or ()] + [TEAMS_SCOPE]
+
+
+def _version_key(scope):
+    return f'{VERSION_KEY_PREFIX}:{scope}'
+
+
+def get_versions(scopes):
+    """Current version of each scope, starting any missing counters"""
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed with the clock so a counter lost to eviction never repeats an old value
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(scopes):
+    """
+    Invalidate every cached page that depends on any of the scopes, once the current transaction commits.
+
+    Bumping before the commit would let a concurrent request render the
+    old rows and cache them under the new version. Versions are replaced
+    with the clock rather than incremented: FileBasedCache implements
+    incr as a read and a write, so two concurrent bumps could store the
+    same next value, while a set always leaves a value no page was keyed on.
+    """
+    keys = {_version_key(scope) for scope in scopes}
+    if keys:
+        transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), timeout=None))
+
+
+def versioned_page(scopes, timeout=None):
+    """
+    Cache a public page for anonymous visitors, keyed on the versions of its scopes.
+
+    ``scopes`` is called with the view's arguments and returns the scope
+    names whose data the page shows. Logged-in users always get a fresh
+    render since the header shows their account.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+
+            page_scopes = scopes(*args, **kwargs)
+            versions = get_versions(page_scopes)
+            key = ':'.join(str(part) for part in (
+                PAGE_KEY_PREFIX,
+                request.get_full_path(),
+                get_current_nfl_week(),  # Shown in the navigation
+                *versions,
+            ))
+
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(key, (response.content, response['Content-Type']), timeout)
+            return response
+        return wrapper
+    return decorator
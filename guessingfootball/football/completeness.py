@@ -0,0 +1,130 @@
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from .models import Game, Team
+
+# Reports are cached under the season's game count and newest last_updated,
+# so any write to the season's games makes the next check recompute it
+COMPLETENESS_CACHE_SECONDS = 24 * 60 * 60
+
+# Unplayed games are stored as 0-0
+PLAYED = ~Q(home_score=0, away_score=0)
+
+
+def expected_schedule(season):
+    """(games per team, regular season weeks): 17 games over 18 weeks since 2021"""
+    return (17, range(1, 19)) if season >= 2021 else (16, range(1, 18))
+
+
+def _cache_key(season):
+    stamp = Game.objects.filter(season=season).aggregate(count=Count('id'), latest=Max('last_updated'))
+    latest = stamp['latest'].timestamp() if stamp['latest'] else 0
+    return f"completeness:{season}:{stamp['count']}:{latest:.6f}"
+
+
+def _team_weeks(games):
+    """{(team_id, week): (games, played)} over both sides, from two grouped queries"""
+    team_weeks = {}
+    for side in ('home_team', 'away_team'):
+        rows = games.order_by().values_list(side, 'week').annotate(games=Count('id'), played=Count('id', filter=PLAYED))
+        for team_id, week, count, played in rows:
+            total, total_played = team_weeks.get((team_id, week), (0, 0))
+            team_weeks[(team_id, week)] = (total + count, total_played + played)
+    return team_weeks
+
+
+def build_report(season, now=None):
+    """
+    Check a season's regular season games (preseason and playoffs aside) for gaps and inconsistencies.
+
+    Everything is computed from a handful of grouped queries, whatever
+    the number of teams. The report is a plain dict:
+
+    - ``teams``: every team with its game and played counts, weeks with
+      games, ``missing_weeks`` and ``is_complete``; ``incomplete_team_details``
+      holds the incomplete ones
+    - ``duplicate_matchups``: the same home/away pair stored more than once in a week
+    - ``double_booked``: a team with more than one game in a week
+    - ``unplayed_games``: 0-0 games whose kickoff has passed and aren't live
+    - ``missing_weeks``: every week some team is missing
+    """
+    now = now or timezone.now()
+    expected_games, weeks = expected_schedule(season)
+    games = Game.objects.filter(season=season, week__in=weeks)
+
+    team_weeks = _team_weeks(games)
+    per_team = {}
+    for (team_id, week), (count, played) in team_weeks.items():
+        team = per_team.setdefault(team_id, {'total_games': 0, 'games_with_scores': 0, 'weeks': set()})
+        team['total_games'] += count
+        team['games_with_scores'] += played
+        team['weeks'].add(week)
+
+    names = dict(Team.objects.order_by('name').values_list('id', 'name'))
+    teams = []
+    for team_id, name in names.items():
+        counts = per_team.get(team_id, {'total_games': 0, 'games_with_scores': 0, 'weeks': set()})
+        teams.append({
+            'name': name,
+            'total_games': counts['total_games'],
+            'games_with_scores': counts['games_with_scores'],
+            'existing_weeks': sorted(counts['weeks']),
+            'missing_weeks': sorted(set(weeks) - counts['weeks']),
+            'is_complete': (
+                counts['total_games'] >= expected_games
+                and counts['games_with_scores'] == counts['total_games']
+            ),
+        })
+
+    duplicates = (
+        games.order_by().values_list('home_team', 'away_team', 'week')
+        .annotate(games=Count('id')).filter(games__gt=1)
+    )
+    unplayed = (
+        games.filter(home_score=0, away_score=0, is_live=False, game_date__lt=now)
+        .order_by('game_date').values_list('id', 'home_team', 'away_team', 'week', 'game_date')
+    )
+    incomplete = [team for team in teams if not team['is_complete']]
+
+    return {
+        'season': season,
+        'expected_games': expected_games,
+        'total_teams': len(teams),
+        'complete_teams': len(teams) - len(incomplete),
+        'incomplete_teams': len(incomplete),
+        'total_games_in_db': games.count(),
+        'games_with_scores': games.filter(PLAYED).count(),
+        'teams': teams,
+        'incomplete_team_details': incomplete,
+        'missing_weeks': sorted({week for team in incomplete for week in team['missing_weeks']}),
+        'duplicate_matchups': [
+            {'home_team': names.get(home), 'away_team': names.get(away), 'week': week, 'games': count}
+            for home, away, week, count in duplicates
+        ],
+        'double_booked': [
+            {'team': names.get(team_id), 'week': week, 'games': count}
+            for (team_id, week), (count, _) in sorted(team_weeks.items())
+            if count > 1
+        ],
+        'unplayed_games': [
+            {
+                'id': game_id,
+                'home_team': names.get(home),
+                'away_team': names.get(away),
+                'week': week,
+                'game_date': game_date.isoformat(),
+            }
+            for game_id, home, away, week, game_date in unplayed
+        ],
+        'last_checked': now.isoformat(),
+    }
+
+
+def season_completeness(season, refresh=False):
+    """The completeness report for a season, recomputed only after its games change"""
+    key = _cache_key(season)
+    report = None if refresh else cache.get(key)
+    if report is None:
+        report = build_report(season)
+        cache.set(key, report, COMPLETENESS_CACHE_SECONDS)
+    return report
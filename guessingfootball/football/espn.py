@@ -0,0 +1,175 @@
+import threading
+import time
+from datetime import datetime, timezone
+import requests
+from django.conf import settings
+from .espn_cache import cache_key, get_cache
+from .teams import get_or_create_team, get_team
+
+REQUEST_TIMEOUT = 30
+
+LIVE_STATUSES = ('STATUS_IN_PROGRESS', 'STATUS_HALFTIME')
+# Events that aren't games between two teams
+SPECIAL_EVENT_TERMS = ('pro bowl', 'all-star', 'hall of fame')
+INVALID_TEAMS = ('AFC', 'NFC', 'PRO', 'ALL')
+
+# Whether this thread's last fetch went over the network; pause() skips waiting otherwise
+_last_fetch = threading.local()
+
+
+def fetch_scoreboard(session=None, timeout=REQUEST_TIMEOUT, max_age=None, throttle=None, **params):
+    """
+    Fetch one ESPN scoreboard payload.
+
+    ``params`` are passed as query parameters (dates, seasontype, week,
+    limit); parameters that are None are left out. Responses go through
+    the on-disk cache in football.espn_cache when ESPN_CACHE_DIR is set;
+    ``max_age`` caps how old a cached payload may be, and 0 always
+    revalidates, which live polling uses. ``throttle`` is called before
+    every request that goes over the network.
+    """
+    params = {key: str(value) for key, value in params.items() if value is not None}
+    url = settings.ESPN_SCOREBOARD_URL
+    cache = get_cache()
+    key = cache_key(url, params) if cache else None
+    payload, meta = cache.load(key) if cache else (None, None)
+    if payload is not None and cache.is_fresh(meta, max_age):
+        cache.hits += 1
+        _last_fetch.network = False
+        return payload
+
+    headers = cache.conditional_headers(meta) if payload is not None else {}
+    if throttle:
+        throttle()
+    response = (session or requests).get(url, params=params, headers=headers, timeout=timeout)
+    _last_fetch.network = True
+    if response.status_code == 304 and payload is not None:
+        cache.revalidated += 1
+        cache.store(key, url, params, payload, response.headers)
+        return payload
+    response.raise_for_status()
+    payload = response.json()
+    if cache:
+        cache.misses += 1
+        cache.store(key, url, params, payload, response.headers, body=response.text)
+    return payload
+
+
+def pause(seconds):
+    """
+    Wait between requests to be gentle on ESPN.
+
+    Off when ESPN_PAUSE_BETWEEN_REQUESTS is False, and skipped when the
+    last fetch was answered from the cache.
+    """
+    if getattr(settings, 'ESPN_PAUSE_BETWEEN_REQUESTS', True) and getattr(_last_fetch, 'network', True):
+        time.sleep(seconds)
+
+
+def _competitors(competition):
+    """(home, away) competitor dicts, falling back to ESPN's order (home first)"""
+    competitors = competition.get('competitors', [])
+    if len(competitors) != 2:
+        return None, None
+    home = next((c for c in competitors if c.get('homeAway') == 'home'), None)
+    away = next((c for c in competitors if c.get('homeAway') == 'away'), None)
+    if not home or not away:
+        home, away = competitors
+    return home, away
+
+
+def _resolve_team(competitor, create):
+    # ESPN spellings we store differently (WSH, LAR) are TeamAlias rows,
+    # see football.teams.DEFAULT_ALIASES
+    abbr = competitor['team']['abbreviation']
+    if not create:
+        return get_team(abbr)
+    team, _ = get_or_create_team(abbr, defaults={
+        'full_name': competitor['team'].get('displayName', abbr),
+        'city': competitor['team'].get('location', ''),
+    })
+    return team
+
+
+def parse_event(event, season=None, week=None, default_week=1, create_teams=False):
+    """
+    Normalize one ESPN event into a game record, or None if it isn't a game we track.
+
+    ``season`` and ``week`` override what the event reports. Teams are
+    resolved through football.teams; unknown teams are created when
+    ``create_teams`` is set and make the event be skipped otherwise.
+    """
+    if any(term in event.get('name', '').lower() for term in SPECIAL_EVENT_TERMS):
+        return None
+
+    competitions = event.get('competitions', [])
+    if not competitions:
+        return None
+    competition = competitions[0]
+
+    home, away = _competitors(competition)
+    if not home or not away:
+        return None
+    home_abbr = home['team']['abbreviation']
+    away_abbr = away['team']['abbreviation']
+    if home_abbr in INVALID_TEAMS or away_abbr in INVALID_TEAMS:
+        return None
+
+    home_team = _resolve_team(home, create_teams)
+    away_team = _resolve_team(away, create_teams)
+    if not home_team or not away_team:
+        raise ValueError(f'Team not found: {home_abbr} or {away_abbr}')
+
+    status = competition.get('status', {})
+    status_type = status.get('type', {})
+    is_live = status_type.get('name') in LIVE_STATUSES
+    clock = status.get('displayClock', '')
+    period = status.get('period', 0)
+
+    if event.get('date'):
+        game_date = datetime.fromisoformat(event['date'].replace('Z', '+00:00'))
+    else:
+        game_date = datetime.now(timezone.utc)
+
+    if week is None:
+        week = (event.get('week') or competition.get('week') or {}).get('number')
+        if week is None:
+            week = default_week
+    if season is None:
+        season = event.get('season', {}).get('year', game_date.year)
+
+    return {
+        'espn_id': event.get('id'),
+        'season': season,
+        'week': week,
+        'game_date': game_date,
+        'home_team': home_team,
+        'away_team': away_team,
+        'home_score': int(home.get('score') or 0),
+        'away_score': int(away.get('score') or 0),
+        'is_live': is_live,
+        'completed': status_type.get('completed', False),
+        'game_status': status_type.get('description', ''),
+        'current_quarter': period if is_live else None,
+        'time_remaining': clock if is_live else '',
+        'period': period,
+        'clock': clock,
+    }
+
+
+def iter_game_records(payload, on_error=None, **options):
+    """
+    Yield a game record for every game in a scoreboard payload.
+
+    Events that fail to parse are passed to ``on_error(event, error)``
+    and skipped. ``options`` are passed to parse_event.
+    """
+    for event in payload.get('events', []):
+        try:
+            record = parse_event(event, **options)
+        except (KeyError, TypeError, ValueError) as e:
+            if on_error:
+                on_error(event, e)
+            continue
+        if record is not None:
+            yield record
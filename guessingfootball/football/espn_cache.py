@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from django.conf import settings
+
+# On-disk cache of ESPN scoreboard responses. Entries are addressed by a
+# hash of the URL and query, stored as <key>.json with the headers needed
+# to revalidate them in <key>.meta.json.
+#
+# Freshness:
+# - a season or date range that is over never expires;
+# - a payload whose games are all final and a day old is settled and never
+#   expires, if its query is pinned to a week or to dates (a query for just a
+#   season returns whichever week ESPN considers current);
+# - a payload with games in progress is fresh for ESPN_CACHE_LIVE_TTL;
+# - anything else is fresh for ESPN_CACHE_TTL.
+# A stale entry is revalidated with If-None-Match/If-Modified-Since, and a
+# 304 keeps the stored body.
+
+# Final scores are occasionally corrected right after the game
+SETTLE_AFTER = timedelta(days=1)
+
+
+def cache_key(url, params):
+    query = '&'.join(f'{key}={value}' for key, value in sorted(params.items()))
+    return hashlib.sha256(f'{url}?{query}'.encode()).hexdigest()
+
+
+def _season_is_over(season, today):
+    # A season runs from September into February
+    return season < today.year - 1 or (season == today.year - 1 and today.month >= 3)
+
+
+def query_is_final(params, today=None):
+    """Whether a scoreboard query asks only for games in the past"""
+    today = today or date.today()
+    dates = str(params.get('dates', ''))
+    if not dates:
+        return False  # The current scoreboard
+    try:
+        if '-' in dates:
+            end = datetime.strptime(dates.split('-', 1)[1], '%Y%m%d').date()
+            return end + SETTLE_AFTER < today
+        if len(dates) == 8:
+            return datetime.strptime(dates, '%Y%m%d').date() + SETTLE_AFTER < today
+        return _season_is_over(int(dates), today)
+    except ValueError:
+        return False
+
+
+def query_is_pinned(params):
+    """Whether a scoreboard query names the games it returns: a week, a day or a date range"""
+    dates = str(params.get('dates', ''))
+    return bool(params.get('week')) or len(dates) == 8 or '-' in dates
+
+
+def payload_state(payload, now=None):
+    """'settled', 'live' or 'open' for a scoreboard payload"""
+    now = now or datetime.now().astimezone()
+    events = payload.get('events', [])
+    latest = None
+    for event in events:
+        status = (event.get('competitions') or [{}])[0].get('status', {}).get('type', {})
+        if status.get('state') == 'in' or status.get('name') in ('STATUS_IN_PROGRESS', 'STATUS_HALFTIME'):
+            return 'live'
+        if not status.get('completed'):
+            return 'open'
+        if event.get('date'):
+            kickoff = datetime.fromisoformat(event['date'].replace('Z', '+00:00'))
+            latest = max(latest or kickoff, kickoff)
+    if events and latest is not None and latest + SETTLE_AFTER < now:
+        return 'settled'
+    return 'open'
+
+
+_caches = {}
+
+
+class ResponseCache:
+    """Scoreboard responses kept under ``directory``; see the module comment for freshness rules"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _paths(self, key):
+        return self.directory / f'{key}.json', self.directory / f'{key}.meta.json'
+
+    def load(self, key):
+        """(payload, meta) of a stored response, or (None, None)"""
+        body, meta = self._paths(key)
+        try:
+            return json.loads(body.read_text()), json.loads(meta.read_text())
+        except (OSError, ValueError):
+            return None, None
+
+    def is_fresh(self, meta, max_age=None):
+        if meta.get('expires') is None:
+            return max_age != 0  # Only an explicit max_age=0 revalidates a final entry
+        age = time.time() - meta['fetched_at']
+        return age < (meta['expires'] if max_age is None else min(max_age, meta['expires']))
+
+    def conditional_headers(self, meta):
+        headers = {}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, key, url, params, payload, headers, body=None):
+        """Save a response; ``body`` is its raw text when available"""
+        state = payload_state(payload)
+        if query_is_final(params) or (state == 'settled' and query_is_pinned(params)):
+            expires = None
+        elif state == 'live':
+            expires = settings.ESPN_CACHE_LIVE_TTL
+        else:
+            expires = settings.ESPN_CACHE_TTL
+        meta = {
+            'url': url,
+            'params': params,
+            'fetched_at': time.time(),
+            'expires': expires,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+        }
+        body_path, meta_path = self._paths(key)
+        if body is not None or not body_path.exists():
+            self._write(body_path, body if body is not None else json.dumps(payload))
+        self._write(meta_path, json.dumps(meta))
+
+    def _write(self, path, text):
+        # Write then rename so parallel readers never see half a file
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+
+def get_cache():
+    """The configured ResponseCache, or None when ESPN_CACHE_DIR is unset"""
+    directory = getattr(settings, 'ESPN_CACHE_DIR', None)
+    if not directory:
+        return None
+    if _caches.get('directory') != str(directory):
+        _caches.update(directory=str(directory), cache=ResponseCache(directory))
+    return _caches['cache']
@@ -0,0 +1,286 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+import requests
+from django.db import connection
+from .models import Game
+
+# A local stand-in for the ESPN scoreboard API. Queries are answered from a
+# recorded payload when the fixture directory has one, and are otherwise
+# synthesized from the Game table, or from a snapshot of it taken at start
+# so a load into the same table doesn't change what is served. One week can
+# be replayed as a simulated live Sunday whose scores build up to the stored
+# finals on a sped-up clock. Responses carry an ETag and Last-Modified and
+# a matching If-None-Match is answered with 304, like ESPN's CDN.
+GAME_LENGTH = timedelta(hours=3)
+HALFTIME = (0.48, 0.55)  # Share of the game spent before and after the break
+
+
+def fixture_name(params):
+    """File name of the recorded payload for a query, e.g. dates-2024_seasontype-2_week-3.json"""
+    parts = [f'{key}-{value}' for key, value in sorted(params.items())]
+    return re.sub(r'[^\w.-]', '_', '_'.join(parts) or 'current') + '.json'
+
+
+def _week_filter(params):
+    """Game filter for an ESPN query; preseason is stored as week 0, playoffs after week 18"""
+    filters = {}
+    dates = params.get('dates', '')
+    if '-' in dates:
+        start, end = dates.split('-', 1)
+        filters['game_date__gte'] = datetime.strptime(start, '%Y%m%d').replace(tzinfo=timezone.utc)
+        filters['game_date__lt'] = datetime.strptime(end, '%Y%m%d').replace(tzinfo=timezone.utc) + timedelta(days=1)
+    elif dates:
+        filters['season'] = int(dates)
+
+    seasontype = int(params.get('seasontype', 2))
+    week = params.get('week')
+    if seasontype == 1:
+        filters['week'] = 0
+    elif week:
+        filters['week'] = int(week) + (18 if seasontype == 3 else 0)
+    elif seasontype == 3:
+        filters['week__gt'] = 18
+    else:
+        filters['week__range'] = (1, 18)
+    return filters
+
+
+def _matches(game, filters):
+    """Whether a game passes a _week_filter() filter, for snapshots"""
+    for lookup, value in filters.items():
+        field, _, operator = lookup.partition('__')
+        actual = getattr(game, field)
+        if operator == 'gte' and not actual >= value:
+            return False
+        if operator == 'lt' and not actual < value:
+            return False
+        if operator == 'gt' and not actual > value:
+            return False
+        if operator == 'range' and not value[0] <= actual <= value[1]:
+            return False
+        if not operator and actual != value:
+            return False
+    return True
+
+
+def _competitor(team, home_away, score):
+    return {
+        'homeAway': home_away,
+        'score': str(score),
+        'team': {
+            'abbreviation': team.name,
+            'displayName': team.full_name or team.name,
+            'location': team.city,
+        },
+    }
+
+
+def _status(name, description, completed=False, period=0, clock='0:00'):
+    return {
+        'type': {'name': name, 'description': description, 'completed': completed},
+        'period': period,
+        'displayClock': clock,
+    }
+
+
+def final_status(game):
+    if game.home_score == 0 and game.away_score == 0:
+        return _status('STATUS_SCHEDULED', 'Scheduled')
+    return _status('STATUS_FINAL', 'Final', completed=True, period=4)
+
+
+def game_event(game, home_score=None, away_score=None, status=None):
+    """An ESPN scoreboard event for a stored game, optionally at an earlier state"""
+    return {
+        'id': str(game.id),
+        'name': f'{game.away_team.full_name or game.away_team.name} at {game.home_team.full_name or game.home_team.name}',
+        'date': game.game_date.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%MZ'),
+        'season': {'year': game.season},
+        'week': {'number': game.week if game.week <= 18 else game.week - 18},
+        'competitions': [{
+            'competitors': [
+                _competitor(game.home_team, 'home', game.home_score if home_score is None else home_score),
+                _competitor(game.away_team, 'away', game.away_score if away_score is None else away_score),
+            ],
+            'status': status or final_status(game),
+        }],
+    }
+
+
+class LiveTimeline:
+    """
+    Replays one week as if it were being played now.
+
+    Each game kicks off ``offset / speed`` seconds after the timeline
+    starts, where offset is its distance from the week's first kickoff,
+    and its final score is split into touchdowns and field goals spread
+    over the game.
+    """
+
+    def __init__(self, games, speed=60.0, seed=0):
+        self.speed = speed
+        self.started = time.monotonic()
+        self.games = sorted(games, key=lambda game: game.game_date)
+        first_kickoff = self.games[0].game_date if self.games else None
+        rng = random.Random(seed)
+        self.kickoffs = {game.id: (game.game_date - first_kickoff).total_seconds() for game in self.games}
+        self.plays = {game.id: self._plays(game, rng) for game in self.games}
+
+    @staticmethod
+    def _plays(game, rng):
+        """(share of the game elapsed, side, points) for every score, in order"""
+        plays = []
+        for side, score in (('home', game.home_score), ('away', game.away_score)):
+            remaining = score
+            while remaining > 0:
+                # Touchdowns, then field goals, then a safety or extra point
+                points = 7 if remaining >= 7 else 3 if remaining >= 3 else remaining
+                plays.append((rng.random(), side, points))
+                remaining -= points
+        return sorted(plays)
+
+    def elapsed(self):
+        """Simulated seconds since the first kickoff"""
+        return (time.monotonic() - self.started) * self.speed
+
+    def event(self, game):
+        progress = (self.elapsed() - self.kickoffs[game.id]) / GAME_LENGTH.total_seconds()
+        if progress < 0:
+            return game_event(game, 0, 0, _status('STATUS_SCHEDULED', 'Scheduled'))
+        if progress >= 1:
+            return game_event(game, status=final_status(game))
+
+        scores = {'home': 0, 'away': 0}
+        for share, side, points in self.plays[game.id]:
+            if share <= progress:
+                scores[side] += points
+
+        if HALFTIME[0] <= progress < HALFTIME[1]:
+            status = _status('STATUS_HALFTIME', 'Halftime', period=2)
+        else:
+            # Stretch the playing time around the break over four 15:00 quarters
+            playing = progress if progress < HALFTIME[0] else progress - (HALFTIME[1] - HALFTIME[0])
+            game_clock = playing / (1 - (HALFTIME[1] - HALFTIME[0])) * 4
+            period = min(int(game_clock) + 1, 4)
+            seconds_left = int((1 - (game_clock - (period - 1))) * 900)
+            status = _status('STATUS_IN_PROGRESS', 'In Progress', period=period,
+                             clock=f'{seconds_left // 60}:{seconds_left % 60:02d}')
+        return game_event(game, scores['home'], scores['away'], status)
+
+
+class StandIn:
+    """Answers scoreboard queries; shared by every request handler thread"""
+
+    def __init__(self, fixtures=None, live_season=None, live_week=None, speed=60.0, record_from=None, snapshot=False):
+        self.fixtures = Path(fixtures) if fixtures else None
+        self.loaded_at = time.time()
+        # Every game, read once, when ``snapshot`` is set
+        self.snapshot = None
+        if snapshot:
+            self.snapshot = list(Game.objects.select_related('home_team', 'away_team').order_by('game_date'))
+        # Upstream URL whose responses are saved as fixtures for queries not recorded yet
+        self.record_from = record_from
+        self.timeline = None
+        self.live_key = None
+        if live_season is not None and live_week is not None:
+            self.live_key = (live_season, live_week)
+            games = Game.objects.filter(season=live_season, week=live_week).select_related('home_team', 'away_team')
+            self.timeline = LiveTimeline(list(games), speed=speed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.events_served = 0
+        self.not_modified = 0
+
+    def scoreboard(self, params):
+        if self.fixtures:
+            recorded = self.fixtures / fixture_name(params)
+            if recorded.exists():
+                return json.loads(recorded.read_text())
+            if self.record_from:
+                response = requests.get(self.record_from, params=params, timeout=30)
+                response.raise_for_status()
+                self.fixtures.mkdir(parents=True, exist_ok=True)
+                recorded.write_text(response.text)
+                return response.json()
+
+        filters = _week_filter(params)
+        if self.timeline and self._is_live_query(params, filters):
+            events = [self.timeline.event(game) for game in self.timeline.games]
+        elif self.snapshot is not None:
+            events = [game_event(game) for game in self.snapshot if _matches(game, filters)]
+        else:
+            games = Game.objects.filter(**filters).select_related('home_team', 'away_team').order_by('game_date')
+            events = [game_event(game) for game in games]
+        return {'events': events}
+
+    def modified_at(self, params):
+        """Last-Modified time of a query's payload: now for the live week, otherwise the stand-in's start"""
+        if self.timeline and self._is_live_query(params, _week_filter(params)):
+            return time.time()
+        return self.loaded_at
+
+    def _is_live_query(self, params, filters):
+        # Queries without dates or a week are for the current games
+        if 'dates' not in params and 'week' not in params:
+            return True
+        return (filters.get('season'), filters.get('week')) == self.live_key
+
+    def count(self, payload, not_modified=False):
+        """Record a response; a 304 serves no events"""
+        with self.lock:
+            self.requests += 1
+            if not_modified:
+                self.not_modified += 1
+            else:
+                self.events_served += len(payload.get('events', []))
+
+
+def make_handler(standin):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if not url.path.rstrip('/').endswith('scoreboard'):
+                self.send_error(404)
+                return
+            params = dict(parse_qsl(url.query))
+            try:
+                payload = standin.scoreboard(params)
+            finally:
+                connection.close()  # Each handler thread opens its own connection
+            body = json.dumps(payload).encode()
+            etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+            not_modified = self.headers.get('If-None-Match') == etag
+            standin.count(payload, not_modified)
+
+            self.send_response(304 if not_modified else 200)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', formatdate(standin.modified_at(params), usegmt=True))
+            if not_modified:
+                self.end_headers()
+                return
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep benchmark and command output readable
+
+    return Handler
+
+
+def start_server(standin, host='127.0.0.1', port=0):
+    """Serve the stand-in from a background thread; returns (server, scoreboard URL)"""
+    server = ThreadingHTTPServer((host, port), make_handler(standin))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f'http://{host}:{server.server_port}/scoreboard'
@@ -0,0 +1,312 @@
+import json
+from abc import ABC, abstractmethod
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .espn import iter_game_records
+from .models import Game
+from .signals import refresh_derived_tables, refresh_seasons
+
+# Scoreboard fields a live update may change
+SCORE_FIELDS = ('home_score', 'away_score', 'is_live', 'game_status', 'current_quarter', 'time_remaining')
+
+
+def _aware(value):
+    return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+
+def apply_game_updates(season, updates, fields=SCORE_FIELDS):
+    """
+    Write a batch of scoreboard updates for one season, touching only rows that changed.
+
+    Each update is a dict with ``home_team``, ``away_team``, ``week``,
+    ``game_date`` and the ``fields`` to compare. An update belongs to the
+    game stored with the same teams and kickoff (the table's unique key)
+    or, failing that, with the same teams in the same week of the season,
+    so a moved kickoff or a renumbered week still finds its game. The
+    games involved are read in one query; new games are inserted and
+    games whose fields differ are written with a single bulk_update, all
+    in one transaction. Unchanged games keep their ``last_updated``.
+
+    An update whose teams and kickoff belong to a game of another season
+    can't be stored without breaking the unique key; it is left out and
+    returned in ``collisions``.
+
+    Returns the lists of created and updated games and of collisions.
+    """
+    if not updates:
+        return [], [], []
+
+    with transaction.atomic():
+        weeks = {update['week'] for update in updates}
+        dates = {_aware(update['game_date']) for update in updates}
+        by_date = {}
+        by_week = {}
+        for game in Game.objects.filter(Q(season=season, week__in=weeks) | Q(game_date__in=dates)):
+            by_date[(game.home_team_id, game.away_team_id, game.game_date)] = game
+            if game.season == season:
+                by_week.setdefault((game.home_team_id, game.away_team_id, game.week), game)
+
+        now = timezone.now()
+        created = []
+        changed = {}
+        collisions = []
+        for update in updates:
+            teams = (update['home_team'].id, update['away_team'].id)
+            date_key = (*teams, _aware(update['game_date']))
+            week_key = (*teams, update['week'])
+            game = by_date.get(date_key) or by_week.get(week_key)
+            if game is None:
+                game = Game(
+                    season=season,
+                    home_team=update['home_team'],
+                    away_team=update['away_team'],
+                    week=update['week'],
+                    game_date=update['game_date'],
+                    **{field: update[field] for field in SCORE_FIELDS},
+                )
+                by_date[date_key] = by_week[week_key] = game
+                created.append(game)
+                continue
+            if game.season != season:
+                collisions.append(update)
+                continue
+
+            differs = [field for field in fields if getattr(game, field) != update[field]]
+            if differs:
+                for field in differs:
+                    setattr(game, field, update[field])
+                if 'game_date' in differs:
+                    by_date[(*teams, _aware(game.game_date))] = game
+                if game.pk is not None:  # Not one created earlier in this batch
+                    # bulk_update skips auto_now
+                    game.last_updated = now
+                    changed[game.pk] = game
+
+        if created:
+            Game.objects.bulk_create(created)
+        updated = list(changed.values())
+        if updated:
+            Game.objects.bulk_update(updated, [*fields, 'last_updated'])
+
+        # Neither bulk operation sends post_save
+        refresh_derived_tables(created, created=True)
+        refresh_derived_tables(updated)
+
+    return created, updated, collisions
+
+
+class Sink(ABC):
+    """
+    Receives game records from football.espn and writes them in batches.
+
+    Records are buffered and handed to ``write`` ``batch_size`` at a time;
+    leaving the ``with`` block writes what is left. Subclasses append the
+    games they insert or change to ``created`` and ``updated``.
+    """
+    batch_size = 500
+
+    def __init__(self, batch_size=None):
+        self.batch_size = batch_size or self.batch_size
+        self.pending = []
+        self.received = 0
+        self.created = []
+        self.updated = []
+
+    def add(self, record):
+        self.pending.append(record)
+        self.received += 1
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            records, self.pending = self.pending, []
+            self.write(records)
+
+    @abstractmethod
+    def write(self, records):
+        """Write a batch of records"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+
+class LiveUpsertSink(Sink):
+    """Creates missing games and writes score/status changes; see apply_game_updates"""
+
+    def __init__(self, fields=SCORE_FIELDS, batch_size=None):
+        super().__init__(batch_size)
+        self.fields = fields
+        # Records left out because their game belongs to another season
+        self.collisions = []
+
+    def write(self, records):
+        seasons = {}
+        for record in records:
+            seasons.setdefault(record['season'], []).append(record)
+        for season, season_records in seasons.items():
+            created, updated, collisions = apply_game_updates(season, season_records, self.fields)
+            self.created += created
+            self.updated += updated
+            self.collisions += collisions
+
+
+class HistoricalInsertSink(Sink):
+    """Inserts games that aren't stored yet and leaves existing ones untouched"""
+
+    def __init__(self, batch_size=None):
+        super().__init__(batch_size)
+        self.existing = 0
+
+    def write(self, records):
+        with transaction.atomic():
+            seasons = {record['season'] for record in records}
+            seen = set()
+            for home_id, away_id, season, week, game_date in Game.objects.filter(season__in=seasons).values_list(
+                'home_team_id', 'away_team_id', 'season', 'week', 'game_date'
+            ):
+                seen.add((home_id, away_id, game_date))
+                seen.add((home_id, away_id, season, week))
+
+            games = []
+            for record in records:
+                home_id, away_id = record['home_team'].id, record['away_team'].id
+                # A matchup is already stored if either its date or its week matches
+                keys = {(home_id, away_id, record['game_date']), (home_id, away_id, record['season'], record['week'])}
+                if keys & seen:
+                    self.existing += 1
+                    continue
+                seen |= keys
+                games.append(Game(
+                    season=record['season'],
+                    week=record['week'],
+                    game_date=record['game_date'],
+                    home_team=record['home_team'],
+                    away_team=record['away_team'],
+                    **{field: record[field] for field in SCORE_FIELDS},
+                ))
+
+            Game.objects.bulk_create(games)
+            refresh_derived_tables(games, created=True)
+        self.created += games
+
+
+class BulkLoadSink(Sink):
+    """
+    Inserts historical games with bulk_create, one transaction per batch.
+
+    Games already stored under the same (home_team, away_team,
+    game_date) key are skipped: the batch's keys are read in one query
+    first, and ignore_conflicts covers writes from other processes. The
+    derived tables of the seasons that got new games are rebuilt once,
+    when the sink is closed, instead of after every batch. ``inserted``
+    counts the rows written; games aren't kept in ``created``.
+    """
+    batch_size = 1000
+
+    def __init__(self, batch_size=None):
+        super().__init__(batch_size)
+        self.inserted = 0
+        self.seasons = set()
+
+    def write(self, records):
+        with transaction.atomic():
+            dates = {_aware(record['game_date']) for record in records}
+            seen = set(Game.objects.filter(game_date__in=dates).values_list('home_team_id', 'away_team_id', 'game_date'))
+            games = []
+            for record in records:
+                key = (record['home_team'].id, record['away_team'].id, _aware(record['game_date']))
+                if key in seen:
+                    continue
+                seen.add(key)
+                games.append(Game(
+                    season=record['season'],
+                    week=record['week'],
+                    game_date=record['game_date'],
+                    home_team=record['home_team'],
+                    away_team=record['away_team'],
+                    home_score=record['home_score'],
+                    away_score=record['away_score'],
+                ))
+            Game.objects.bulk_create(games, ignore_conflicts=True)
+        self.inserted += len(games)
+        self.seasons.update(game.season for game in games)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.close()
+
+    def close(self):
+        """Rebuild the derived tables of the seasons loaded; called on leaving the ``with`` block"""
+        with transaction.atomic():
+            refresh_seasons(self.seasons)
+
+
+class DryRunSink(Sink):
+    """Keeps the records it receives without writing anything"""
+
+    def __init__(self, batch_size=None):
+        super().__init__(batch_size)
+        self.records = []
+
+    def write(self, records):
+        self.records += records
+
+
+def _json_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'name'):  # Team
+        return value.name
+    return value
+
+
+class JsonArchiveSink(Sink):
+    """Appends records to a JSON Lines file, with teams as their abbreviations"""
+
+    def __init__(self, path, batch_size=None):
+        super().__init__(batch_size)
+        self.path = path
+
+    def write(self, records):
+        with open(self.path, 'a') as archive:
+            for record in records:
+                archive.write(json.dumps({key: _json_value(value) for key, value in record.items()}) + '\n')
+
+
+def drain(records, *sinks):
+    """Feed a stream of game records to every sink, then flush them; returns the sinks"""
+    for record in records:
+        for sink in sinks:
+            sink.add(record)
+    for sink in sinks:
+        sink.flush()
+    return sinks
+
+
+def preseason_week(record):
+    """Store preseason games as week 0 to distinguish them from the regular season"""
+    game_date = record['game_date']
+    if record['week'] == 1 and game_date.month == 8 and game_date.day <= 15:  # Early August = preseason
+        record['week'] = 0
+    return record
+
+
+def ingest_preseason_scoreboard(data, on_error=None):
+    """
+    Write the games of a 2025 preseason scoreboard payload; returns their records.
+
+    Used by the admin's Fetch ESPN API Data job and fetch_espn_live.
+    """
+    records = [
+        preseason_week(record)
+        for record in iter_game_records(data, on_error=on_error, season=2025, default_week=0)
+    ]
+    drain(records, LiveUpsertSink(fields=(*SCORE_FIELDS, 'game_date')))
+    return records
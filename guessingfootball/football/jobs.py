@@ -0,0 +1,110 @@
+import os
+import socket
+import traceback
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .models import Job
+
+# A running job whose worker hasn't reported progress for this long is
+# assumed dead and marked failed, so the same kind can be queued again
+STALE_AFTER = timedelta(minutes=15)
+
+_handlers = {}
+
+
+def job_handler(kind):
+    """Register ``function(job, progress)`` as the handler for a job kind; it returns the result summary"""
+    def register(function):
+        _handlers[kind] = function
+        return function
+    return register
+
+
+def enqueue(kind, **params):
+    """
+    Queue a job, or return the queued or running job of the same kind and params.
+
+    Pressing an admin button twice doesn't start the work twice.
+    """
+    if kind not in _handlers:
+        raise ValueError(f'Unknown job kind: {kind}')
+    with transaction.atomic():
+        pending = Job.objects.filter(kind=kind, params=params, status__in=[Job.QUEUED, Job.RUNNING]).first()
+        return pending or Job.objects.create(kind=kind, params=params)
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def fail_stale_jobs(now=None):
+    """Mark running jobs whose worker went quiet as failed; returns how many"""
+    now = now or timezone.now()
+    return Job.objects.filter(status=Job.RUNNING, heartbeat_at__lt=now - STALE_AFTER).update(
+        status=Job.FAILED, finished_at=now, result='Worker stopped responding',
+    )
+
+
+def claim_next(worker):
+    """Take the oldest queued job for this worker, or None when the queue is empty"""
+    while True:
+        job = Job.objects.filter(status=Job.QUEUED).order_by('created_at', 'id').first()
+        if job is None:
+            return None
+        now = timezone.now()
+        # Conditional update, so two workers can't both claim the job
+        claimed = Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(
+            status=Job.RUNNING, worker=worker, started_at=now, heartbeat_at=now,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def run_job(job):
+    """Run a claimed job to completion, recording its result or traceback"""
+    def progress(rows_processed, rows_total=None):
+        job.rows_processed = rows_processed
+        updates = {'rows_processed': rows_processed, 'heartbeat_at': timezone.now()}
+        if rows_total is not None:
+            job.rows_total = updates['rows_total'] = rows_total
+        Job.objects.filter(pk=job.pk).update(**updates)
+
+    try:
+        result = _handlers[job.kind](job, progress)
+        job.status, job.result = Job.SUCCEEDED, result or ''
+    except Exception:
+        job.status, job.result = Job.FAILED, traceback.format_exc()
+    job.finished_at = timezone.now()
+    Job.objects.filter(pk=job.pk).update(status=job.status, result=job.result, finished_at=job.finished_at)
+    return job
+
+
+@job_handler('fetch_espn_preseason')
+def fetch_espn_preseason(job, progress):
+    """The admin's Fetch ESPN API Data button"""
+    from .espn import fetch_scoreboard
+    from .ingest import ingest_preseason_scoreboard
+
+    data = fetch_scoreboard(seasontype=1, max_age=0)
+    progress(0, len(data.get('events', [])))
+    errors = []
+    records = ingest_preseason_scoreboard(data, on_error=lambda event, error: errors.append(str(error)))
+    progress(len(records))
+    live_games_found = sum(1 for record in records if record['is_live'])
+    result = f'Updated {len(records)} games from ESPN API. Found {live_games_found} live games.'
+    if errors:
+        result += f' Skipped {len(errors)} events:\n' + '\n'.join(errors)
+    return result
+
+
+@job_handler('calculate_rankings')
+def calculate_rankings(job, progress):
+    """The admin's Calculate 2024 Rankings button"""
+    from .models import Team
+
+    progress(0, Team.objects.count())
+    teams_updated = Team.calculate_2024_rankings()
+    progress(teams_updated)
+    return f'Calculated 2024 season rankings for {teams_updated} teams.'
@@ -0,0 +1,115 @@
+import hashlib
+import json
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from .ingest import SCORE_FIELDS, apply_game_updates
+from .models import Game, ImportLedger
+
+# An import records a fingerprint of every (source, season, week) it writes.
+# Re-running it skips the weeks whose source data hashes the same and writes
+# the others through apply_game_updates, which leaves unchanged rows (and
+# their last_updated) alone. Games are never deleted here; clearing a week
+# is still up to the loader's own --clear options.
+
+# Values given to score fields a source doesn't provide, such as a schedule
+SCORE_DEFAULTS = {
+    'home_score': 0,
+    'away_score': 0,
+    'is_live': False,
+    'game_status': '',
+    'current_quarter': None,
+    'time_remaining': '',
+}
+FINGERPRINT_FIELDS = ('week', 'home_team', 'away_team', 'game_date', *SCORE_FIELDS)
+
+
+def _normalized(record):
+    record = {**SCORE_DEFAULTS, **record}
+    if timezone.is_naive(record['game_date']):
+        # What saving the game would store
+        record['game_date'] = timezone.make_aware(record['game_date'])
+    return record
+
+
+def _fingerprint_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'name'):  # Team
+        return value.name
+    return value
+
+
+def fingerprint(records):
+    """sha256 of a week's games, independent of their order"""
+    rows = sorted(
+        json.dumps([_fingerprint_value(record[field]) for field in FINGERPRINT_FIELDS])
+        for record in records
+    )
+    return hashlib.sha256('\n'.join(rows).encode()).hexdigest()
+
+
+def import_weeks(source, season, records, fields=SCORE_FIELDS, force=False):
+    """
+    Import one season's game records from ``source``, a week at a time.
+
+    Records are the dicts apply_game_updates takes; missing score fields
+    default to an unplayed game. Weeks whose fingerprint matches the
+    ledger are skipped without reading their games, unless ``force`` or
+    fewer games than were imported are left (a --clear, say). Edits made
+    to the games since aren't detected; the ledger tracks the source.
+    ``fields`` are the Game fields the source is trusted to update; a
+    schedule passes ('game_date',) so it never resets scores.
+
+    Records whose teams and kickoff are already stored under another
+    season (results.py repeats some games) are skipped and listed in
+    ``collisions`` rather than aborting the import.
+
+    Returns {'unchanged': weeks, 'written': weeks, 'created': games,
+    'updated': games, 'collisions': records}.
+    """
+    weeks = {}
+    for record in records:
+        record = _normalized(record)
+        weeks.setdefault(record['week'], []).append(record)
+
+    ledger = {
+        entry.week: entry
+        for entry in ImportLedger.objects.filter(source=source, season=season, week__in=weeks)
+    }
+    stored = dict(
+        Game.objects.filter(season=season, week__in=weeks).order_by().values('week')
+        .annotate(games=Count('id')).values_list('week', 'games')
+    )
+    summary = {'unchanged': [], 'written': [], 'created': 0, 'updated': 0, 'collisions': []}
+    for week, week_records in sorted(weeks.items()):
+        digest = fingerprint(week_records)
+        entry = ledger.get(week)
+        if entry is not None and entry.fingerprint == digest and stored.get(week, 0) >= entry.games and not force:
+            summary['unchanged'].append(week)
+            continue
+
+        with transaction.atomic():
+            created, updated, collisions = apply_game_updates(season, week_records, fields)
+            # Colliding records are stored under another season, so they
+            # don't count towards the week's games
+            ImportLedger.objects.update_or_create(
+                source=source, season=season, week=week,
+                defaults={'fingerprint': digest, 'games': len(week_records) - len(collisions)},
+            )
+        summary['written'].append(week)
+        summary['created'] += len(created)
+        summary['updated'] += len(updated)
+        summary['collisions'] += collisions
+    return summary
+
+
+def describe(summary):
+    """One line summary of an import_weeks result for command output"""
+    line = (
+        f"{len(summary['written'])} weeks written ({summary['created']} games created, "
+        f"{summary['updated']} updated), {len(summary['unchanged'])} unchanged"
+    )
+    if summary['collisions']:
+        line += f", {len(summary['collisions'])} games skipped as already stored in another season"
+    return line
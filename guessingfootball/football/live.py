@@ -0,0 +1,157 @@
+import asyncio
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.db.models import Max, Q
+from .models import Game
+
+# The live poller runs in its own process, so the broker watches the Game
+# table rather than relying on signals alone: one query per interval is
+# shared by every connected client, however many there are.
+POLL_INTERVAL = 2
+HEARTBEAT_INTERVAL = 15
+# A client this far behind is dropped; EventSource reconnects and gets a fresh snapshot
+MAX_PENDING_EVENTS = 100
+# Rows are re-read this far behind the cursor so a write committed late is
+# not skipped; unchanged rows produce no diff
+CURSOR_OVERLAP = timedelta(seconds=5)
+
+LIVE_FIELDS = ('home_score', 'away_score', 'is_live', 'status', 'quarter', 'time_remaining')
+
+
+def _game_state(game):
+    return {
+        'id': game.id,
+        'home_score': game.home_score,
+        'away_score': game.away_score,
+        'is_live': game.is_live,
+        'status': game.game_status,
+        'quarter': game.quarter_display,
+        'time_remaining': game.time_remaining,
+    }
+
+
+def _fetch_games(since=None, tracked=()):
+    """Live games when ``since`` is None, otherwise the live and ``tracked`` games written since then"""
+    games = Game.objects.order_by().only(
+        'id', 'home_score', 'away_score', 'is_live', 'game_status',
+        'current_quarter', 'time_remaining', 'last_updated',
+    )
+    if since is None:
+        games = games.filter(is_live=True)
+    else:
+        # Schedule writes and bulk loads touch games nobody is watching
+        games = games.filter(Q(is_live=True) | Q(id__in=list(tracked)), last_updated__gte=since - CURSOR_OVERLAP)
+    games = list(games)
+    if since is None:
+        latest = Game.objects.aggregate(latest=Max('last_updated'))['latest']
+    else:
+        latest = max((game.last_updated for game in games), default=since)
+    return [_game_state(game) for game in games], latest
+
+
+class LiveScoreBroker:
+    """
+    Fans out live score changes to subscribers in this process.
+
+    A watcher task runs while at least one client is subscribed. Each
+    subscriber first receives the live games, then a list of per-game
+    diffs holding only the fields that changed. Only live games are
+    tracked; a game is dropped once the diff that ends it has been sent.
+    """
+
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self._subscribers = set()
+        self._state = {}
+        self._cursor = None
+        self._task = None
+        self._loop = None
+        self._wake = None
+        self._lock = None
+
+    async def _start(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or a new event loop (e.g. async views under WSGI)
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._wake = asyncio.Event()
+            self._task = None
+
+        async with self._lock:
+            if self._task is None or self._task.done():
+                games, self._cursor = await sync_to_async(_fetch_games)()
+                self._state = {game['id']: game for game in games}
+                self._task = loop.create_task(self._watch())
+
+    async def _watch(self):
+        while self._subscribers:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            games, self._cursor = await sync_to_async(_fetch_games)(self._cursor, list(self._state))
+            diffs = self._changes(games)
+            if diffs:
+                self._publish(diffs)
+
+    def _changes(self, games):
+        """Diffs of the games against the tracked state, which is then updated"""
+        diffs = []
+        for game in games:
+            previous = self._state.get(game['id'])
+            if previous is None and not game['is_live']:
+                continue  # Never seen live
+            changed = {field: game[field] for field in LIVE_FIELDS if (previous or {}).get(field) != game[field]}
+            if changed:
+                diffs.append({'id': game['id'], **changed})
+            if game['is_live']:
+                self._state[game['id']] = game
+            else:
+                # Final: the diff above was its last
+                self._state.pop(game['id'], None)
+        return diffs
+
+    def _publish(self, diffs):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(diffs)
+            except asyncio.QueueFull:
+                self._subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+    def notify(self):
+        """Check for changes now rather than at the next interval; safe to call from any thread"""
+        loop = self._loop
+        if loop is not None and not loop.is_closed() and self._subscribers:
+            loop.call_soon_threadsafe(self._wake.set)
+
+    async def events(self):
+        """
+        Yield ``('snapshot', games)`` once, then ``('update', diffs)`` for every change.
+
+        ``(None, None)`` is yielded when nothing changed for a while so the
+        caller can keep the connection open.
+        """
+        queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        self._subscribers.add(queue)
+        try:
+            await self._start()
+            yield 'snapshot', list(self._state.values())
+            while True:
+                try:
+                    diffs = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield None, None
+                    continue
+                if diffs is None:
+                    return  # Fell too far behind
+                yield 'update', diffs
+        finally:
+            self._subscribers.discard(queue)
+
+
+broker = LiveScoreBroker()
@@ -0,0 +1,152 @@
+import tempfile
+import time
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from football.espn import fetch_scoreboard
+from football.espn_standin import StandIn, start_server
+from football.ingest import ingest_preseason_scoreboard
+from football.models import Game
+from football.schedule import invalidate_season_calendar
+from football.teams import invalidate_teams
+
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class QueryCounter:
+    """execute_wrapper that counts the statements a run sends"""
+
+    def __init__(self):
+        self.queries = 0
+        self.writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        if sql.lstrip().upper().startswith(WRITE_STATEMENTS):
+            self.writes += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Time ESPN ingestion against the local stand-in; every run is rolled back. '
+        'The stand-in serves a snapshot of the games taken at start, and "load" '
+        'runs against a table emptied of the season, so every game is inserted'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            choices=['poll', 'load', 'admin'],
+            action='append',
+            help='Ingestion path to run; repeat for several (default: all)'
+        )
+        parser.add_argument(
+            '--season',
+            type=int,
+            default=2024,
+            help='Season served to the poller and the loader (default: 2024)'
+        )
+        parser.add_argument(
+            '--week',
+            type=int,
+            default=1,
+            help='Week polled by poll_live_games (default: 1)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per target (default: 3)'
+        )
+        parser.add_argument(
+            '--fixtures',
+            type=str,
+            help='Directory of recorded scoreboard payloads to serve'
+        )
+        parser.add_argument(
+            '--live',
+            action='store_true',
+            help='Serve --season/--week as a live Sunday, so polls see changing scores'
+        )
+        parser.add_argument(
+            '--speed',
+            type=float,
+            default=600.0,
+            help='Simulated seconds per real second for --live (default: 600)'
+        )
+        parser.add_argument(
+            '--cache',
+            action='store_true',
+            help='Keep ESPN responses in a temporary cache shared by the runs, so later runs send conditional requests'
+        )
+
+    def handle(self, *args, **options):
+        season = options['season']
+        week = options['week']
+        standin = StandIn(
+            fixtures=options['fixtures'],
+            live_season=season if options['live'] else None,
+            live_week=week if options['live'] else None,
+            speed=options['speed'],
+            snapshot=True,
+        )
+        server, url = start_server(standin)
+
+        # Target name: (run, setup done in the run's transaction but not timed)
+        targets = {
+            'poll': (lambda: call_command(
+                'poll_live_games', season=season, week=week, seasontype=2, stdout=StringIO(),
+            ), None),
+            'load': (lambda: call_command(
+                'load_espn_data', start_year=season, end_year=season, season_type=2, stdout=StringIO(),
+            ), lambda: Game.objects.filter(season=season).delete()),
+            'admin': (lambda: ingest_preseason_scoreboard(fetch_scoreboard(seasontype=1)), None),
+        }
+
+        self.stdout.write(f'ESPN stand-in at {url}\n')
+        self.stdout.write(
+            f'{"target":<8}{"run":>4}{"events":>9}{"events/s":>11}{"304s":>6}{"queries":>9}{"writes":>8}{"wall s":>9}'
+        )
+        with tempfile.TemporaryDirectory() as cache_dir:
+            try:
+                with override_settings(
+                    ESPN_SCOREBOARD_URL=url,
+                    ESPN_PAUSE_BETWEEN_REQUESTS=False,
+                    ESPN_CACHE_DIR=cache_dir if options['cache'] else None,
+                ):
+                    for name in options['target'] or list(targets):
+                        for run in range(1, options['repeat'] + 1):
+                            self.report(name, run, *self.measure(standin, *targets[name]))
+            finally:
+                server.shutdown()
+
+    def measure(self, standin, target, setup=None):
+        """(events served, 304 responses, queries, writes, wall seconds) of one rolled back run"""
+        counter = QueryCounter()
+
+        with transaction.atomic():
+            if setup:
+                setup()
+            events_before, not_modified_before = standin.events_served, standin.not_modified
+            with connection.execute_wrapper(counter):
+                started = time.perf_counter()
+                target()
+                wall = time.perf_counter() - started
+            transaction.set_rollback(True)
+
+        # Teams and calendars cached during the run may no longer exist
+        invalidate_teams()
+        invalidate_season_calendar()
+        return (
+            standin.events_served - events_before, standin.not_modified - not_modified_before,
+            counter.queries, counter.writes, wall,
+        )
+
+    def report(self, name, run, events, not_modified, queries, writes, wall):
+        rate = events / wall if wall else 0
+        self.stdout.write(
+            f'{name:<8}{run:>4}{events:>9}{rate:>11.0f}{not_modified:>6}{queries:>9}{writes:>8}{wall:>9.3f}'
+        )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from football.results_archive import archive_dir, build_archive
+
+
+class Command(BaseCommand):
+    help = 'Compile results.py (2011-2019) into the columnar results archive, one file per season'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            type=str,
+            help='Path of results.py (default: results.py next to manage.py)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Directory to write the archive to (default: RESULTS_ARCHIVE_DIR)'
+        )
+        parser.add_argument(
+            '--seasons',
+            type=int,
+            nargs='+',
+            help='Only build these seasons (default: every season in results.py)'
+        )
+
+    def handle(self, *args, **options):
+        directory = options['output'] or archive_dir()
+        built = build_archive(options['source'], directory, options['seasons'])
+        for season, (games, skipped) in built.items():
+            line = f'  {season}: {games} games'
+            if skipped:
+                line += f' ({skipped} malformed or unscored entries skipped)'
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {len(built)} seasons to {directory}'))
@@ -1,11 +1,8 @@
 from django.core.management.base import BaseCommand
-from football.models import Team, Game
-from django.db.models import Q
-from django.core.cache import cache
-import json
+from football.completeness import season_completeness
 
 class Command(BaseCommand):
-    help = 'Check data completeness for NFL seasons and cache results to avoid repeated API calls'
+    help = 'Check NFL season data for missing weeks, duplicates, double bookings and unplayed games'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -17,75 +14,15 @@ class Command(BaseCommand):
         parser.add_argument(
             '--force-refresh',
             action='store_true',
-            help='Force refresh of cached completeness data'
+            help='Recompute the report even if the season is unchanged since the cached one'
         )
 
     def handle(self, *args, **options):
         season = options['season']
-        force_refresh = options['force_refresh']
-        
-        cache_key = f'data_completeness_{season}'
-        
-        # Check if we have cached results and use them unless forced to refresh
-        if not force_refresh:
-            cached_result = cache.get(cache_key)
-            if cached_result:
-                self.stdout.write(f'Using cached completeness data for {season}')
-                self.display_results(cached_result, season)
-                return
         
         self.stdout.write(f'Checking {season} season data completeness...')
-        
-        # Check all teams for season data completeness
-        teams = Team.objects.all()
-        complete_teams = []
-        incomplete_teams = []
-        
-        total_games_in_season = Game.objects.filter(season=season).count()
-        games_with_scores = Game.objects.filter(season=season).exclude(home_score=0, away_score=0).count()
-        
-        for team in teams:
-            all_games = Game.objects.filter(
-                Q(home_team=team, season=season) | Q(away_team=team, season=season)
-            )
-            
-            total_games = all_games.count()
-            games_with_scores_team = all_games.exclude(home_score=0, away_score=0).count()
-            existing_weeks = set(all_games.values_list('week', flat=True))
-            
-            # For regular season, expect 17 games (18 weeks with 1 bye)
-            expected_games = 17 if season >= 2021 else 16
-            missing_weeks = set(range(1, 19)) - existing_weeks if season >= 2021 else set(range(1, 18)) - existing_weeks
-            
-            team_data = {
-                'name': team.name,
-                'total_games': total_games,
-                'games_with_scores': games_with_scores_team,
-                'existing_weeks': sorted(existing_weeks),
-                'missing_weeks': sorted(missing_weeks),
-                'is_complete': total_games >= expected_games and games_with_scores_team == total_games
-            }
-            
-            if team_data['is_complete']:
-                complete_teams.append(team_data)
-            else:
-                incomplete_teams.append(team_data)
-        
-        # Prepare results
-        results = {
-            'season': season,
-            'total_teams': len(teams),
-            'complete_teams': len(complete_teams),
-            'incomplete_teams': len(incomplete_teams),
-            'total_games_in_db': total_games_in_season,
-            'games_with_scores': games_with_scores,
-            'incomplete_team_details': incomplete_teams,
-            'last_checked': str(cache.now() if hasattr(cache, 'now') else 'now')
-        }
-        
-        # Cache the results for 1 hour to avoid repeated checks
-        cache.set(cache_key, results, 3600)
-        
+        # Cached until the season's games change; --force-refresh recomputes anyway
+        results = season_completeness(season, refresh=options['force_refresh'])
         self.display_results(results, season)
     
     def display_results(self, results, season):
@@ -120,6 +57,22 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.SUCCESS(f"\n✓ All teams have complete {season} data!"))
         
-        if 'last_checked' in results:
-            self.stdout.write(f"\nLast checked: {results['last_checked']}")
-            self.stdout.write("Use --force-refresh to update this cache")
\ No newline at end of file
+        if results['duplicate_matchups']:
+            self.stdout.write(self.style.WARNING(f"\nDuplicate matchups ({len(results['duplicate_matchups'])}):"))
+            for duplicate in results['duplicate_matchups']:
+                self.stdout.write(
+                    f"Week {duplicate['week']}: {duplicate['away_team']} @ {duplicate['home_team']} stored {duplicate['games']} times"
+                )
+        
+        if results['double_booked']:
+            self.stdout.write(self.style.WARNING(f"\nTeams with more than one game in a week ({len(results['double_booked'])}):"))
+            for booking in results['double_booked']:
+                self.stdout.write(f"Week {booking['week']}: {booking['team']} has {booking['games']} games")
+        
+        if results['unplayed_games']:
+            self.stdout.write(self.style.WARNING(f"\nPast games still 0-0 ({len(results['unplayed_games'])}):"))
+            for game in results['unplayed_games']:
+                self.stdout.write(f"Week {game['week']}: {game['away_team']} @ {game['home_team']} ({game['game_date'][:10]})")
+        
+        self.stdout.write(f"\nLast checked: {results['last_checked']}")
+        self.stdout.write("Results are reused until the season's games change; use --force-refresh to recompute")
\ No newline at end of file
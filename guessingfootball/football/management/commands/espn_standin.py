@@ -0,0 +1,66 @@
+import time
+from django.core.management.base import BaseCommand
+from football.espn_standin import StandIn, start_server
+
+class Command(BaseCommand):
+    help = 'Serve ESPN scoreboard payloads locally from recordings and the Game table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--port',
+            type=int,
+            default=8765,
+            help='Port to listen on (default: 8765)'
+        )
+        parser.add_argument(
+            '--fixtures',
+            type=str,
+            help='Directory of recorded scoreboard payloads to serve before falling back to the database'
+        )
+        parser.add_argument(
+            '--record',
+            type=str,
+            metavar='UPSTREAM_URL',
+            help='Fetch queries missing from --fixtures from this URL and save them'
+        )
+        parser.add_argument(
+            '--live',
+            type=int,
+            nargs=2,
+            metavar=('SEASON', 'WEEK'),
+            help='Replay this week as a live Sunday starting now'
+        )
+        parser.add_argument(
+            '--speed',
+            type=float,
+            default=60.0,
+            help='Simulated seconds per real second for --live (default: 60)'
+        )
+
+    def handle(self, *args, **options):
+        if options['record'] and not options['fixtures']:
+            self.stdout.write(self.style.ERROR('--record needs --fixtures to save into'))
+            return
+        
+        live_season, live_week = options['live'] or (None, None)
+        standin = StandIn(
+            fixtures=options['fixtures'],
+            live_season=live_season,
+            live_week=live_week,
+            speed=options['speed'],
+            record_from=options['record'],
+        )
+        server, url = start_server(standin, port=options['port'])
+        
+        self.stdout.write(self.style.SUCCESS(f'ESPN stand-in serving {url}'))
+        self.stdout.write(f'Run ingestion against it with ESPN_SCOREBOARD_URL={url}')
+        if standin.timeline:
+            self.stdout.write(f'Replaying {live_season} week {live_week} ({len(standin.timeline.games)} games) at {options["speed"]:g}x')
+        
+        try:
+            while True:
+                time.sleep(60)
+                self.stdout.write(f'{standin.requests} requests, {standin.events_served} events served')
+        except KeyboardInterrupt:
+            server.shutdown()
+            self.stdout.write('ESPN stand-in stopped.')
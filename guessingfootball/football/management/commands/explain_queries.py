@@ -0,0 +1,105 @@
+import re
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from football.models import Team, Game, MatchupRecord, SeasonWeek, TeamGameRecord, TeamSeasonStats
+from football.standings import _side_rows
+
+class Command(BaseCommand):
+    help = 'Print EXPLAIN output for the queries behind each public view and flag full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season',
+            type=int,
+            default=2025,
+            help='Season to build the queries for (default: 2025)'
+        )
+        parser.add_argument(
+            '--week',
+            type=int,
+            default=1,
+            help='Week to build the queries for (default: 1)'
+        )
+        parser.add_argument(
+            '--team',
+            type=str,
+            default='KC',
+            help='Team abbreviation to build the queries for (default: KC)'
+        )
+        parser.add_argument(
+            '--show-sql',
+            action='store_true',
+            help='Print the SQL of each query above its plan'
+        )
+
+    def handle(self, *args, **options):
+        season = options['season']
+        week = options['week']
+        
+        team = Team.objects.filter(name=options['team'].upper()).first()
+        if team is None:
+            self.stdout.write(self.style.ERROR(f"Team {options['team']} not found"))
+            return
+        game = Game.objects.filter(
+            Q(home_team=team) | Q(away_team=team), season=season
+        ).order_by('game_date').last()
+        if game is None:
+            self.stdout.write(self.style.ERROR(f'No {season} games found for {team.name}'))
+            return
+        
+        queries = [
+            ('home', 'Current week games', Game.objects.filter(season=season, week=week).order_by('game_date')),
+            ('home', 'Live games', Game.get_live_games()),
+            ('home', 'Season calendar', SeasonWeek.objects.filter(season=season).order_by('week')),
+            ('teams_list', 'Season stats', TeamSeasonStats.objects.filter(season=season).select_related('team')),
+            ('teams_list', 'Standings rebuild', _side_rows(season, 'home').union(_side_rows(season, 'away'), all=True)),
+            ('team_detail', 'Team season games', Game.objects.filter(
+                Q(home_team=team, season=season) | Q(away_team=team, season=season)
+            ).select_related('home_team', 'away_team').order_by('-game_date')),
+            ('team_detail', 'Team season stats', TeamSeasonStats.objects.filter(team=team, season__in=[season - 1, season])),
+            ('week_detail', 'Week games', Game.objects.filter(season=season, week=week).select_related('home_team', 'away_team').order_by('game_date')),
+            ('game_detail', 'Record before game', TeamGameRecord.objects.filter(
+                team=team, season=game.season, game_date__lt=game.game_date
+            ).order_by('-game_date')[:1]),
+            ('game_detail', 'Head-to-head', MatchupRecord.meetings(
+                game.away_team, game.home_team, before_date=game.game_date
+            ).select_related('game__home_team', 'game__away_team')[:5]),
+            ('loaders', 'Games in date range', Game.objects.filter(
+                game_date__gte=game.game_date, game_date__lt=game.game_date.replace(year=game.game_date.year + 1)
+            )),
+        ]
+        
+        full_scans = []
+        for view_name, description, queryset in queries:
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{view_name}: {description}'))
+            if options['show_sql']:
+                self.stdout.write(str(queryset.query))
+            plan = queryset.explain()
+            self.stdout.write(plan)
+            
+            scanned = self.find_full_scans(plan)
+            if scanned:
+                full_scans.append((view_name, description, scanned))
+        
+        self.stdout.write('\n' + '=' * 50)
+        if full_scans:
+            self.stdout.write(self.style.WARNING(f'Full table scans in {len(full_scans)} queries:'))
+            for view_name, description, tables in full_scans:
+                self.stdout.write(f"  {view_name}: {description} ({', '.join(tables)})")
+        elif connection.vendor in ('sqlite', 'postgresql'):
+            self.stdout.write(self.style.SUCCESS(f'✓ No full table scans in {len(queries)} queries'))
+        else:
+            self.stdout.write(f'Scan detection is not supported on {connection.vendor}; review the plans above')
+
+    def find_full_scans(self, plan):
+        """Tables read without an index according to the query plan"""
+        if connection.vendor == 'sqlite':
+            # e.g. "SCAN football_game" vs "SCAN football_game USING INDEX ..."
+            return sorted({
+                match.group(1) for match in re.finditer(r'SCAN (\w+)(?!\w| USING)', plan)
+                if not match.group(1).startswith('CONSTANT')
+            })
+        if connection.vendor == 'postgresql':
+            return sorted(set(re.findall(r'Seq Scan on (\w+)', plan)))
+        return []
@@ -1,42 +1,31 @@
 from django.core.management.base import BaseCommand
-from football.admin import GameAdmin
-from football.models import Game
-from django.contrib.admin.sites import AdminSite
+from football.espn import fetch_scoreboard
+from football.ingest import ingest_preseason_scoreboard
 import requests
 
 class Command(BaseCommand):
     help = 'Fetch current ESPN preseason data (same as admin button)'
 
     def handle(self, *args, **options):
-        # Create admin instance to use the same logic
-        game_admin = GameAdmin(Game, AdminSite())
-        
         self.stdout.write('Fetching ESPN preseason data...')
         
         try:
-            url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?seasontype=1"
-            
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data = fetch_scoreboard(seasontype=1, max_age=0)
             
-            games_updated = 0
+            records = ingest_preseason_scoreboard(data, on_error=self.report_event_error)
+            games_updated = len(records)
             live_games_found = 0
             
-            if 'events' in data:
-                for event in data['events']:
-                    result = game_admin.process_game_event(event)
-                    if result:
-                        games_updated += 1
-                        if result['is_live']:
-                            live_games_found += 1
-                            self.stdout.write(
-                                self.style.SUCCESS(
-                                    f'LIVE: {result["away_team"]} {result["away_score"]} @ '
-                                    f'{result["home_team"]} {result["home_score"]} - '
-                                    f'Q{result["quarter"]} {result["clock"]}'
-                                )
-                            )
+            for record in records:
+                if record['is_live']:
+                    live_games_found += 1
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f'LIVE: {record["away_team"].name} {record["away_score"]} @ '
+                            f'{record["home_team"].name} {record["home_score"]} - '
+                            f'Q{record["period"]} {record["clock"]}'
+                        )
+                    )
             
             self.stdout.write(
                 self.style.SUCCESS(
@@ -47,4 +36,7 @@ class Command(BaseCommand):
         except requests.RequestException as e:
             self.stdout.write(self.style.ERROR(f'Error fetching ESPN API: {e}'))
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Error processing data: {e}'))
\ No newline at end of file
+            self.stdout.write(self.style.ERROR(f'Error processing data: {e}'))
+
+    def report_event_error(self, event, error):
+        self.stdout.write(f'Error processing game event: {error}')
@@ -1,11 +1,10 @@
 from django.core.management.base import BaseCommand
 from football.models import Team, Game
+from football.espn import fetch_scoreboard, iter_game_records, pause
+from football.ingest import JsonArchiveSink, LiveUpsertSink, drain
 import requests
-import json
 from datetime import datetime
 import pytz
-from django.db import transaction
-import time
 
 class Command(BaseCommand):
     help = 'Fix 2025 NFL schedule by importing clean data from ESPN API'
@@ -19,7 +18,7 @@ class Command(BaseCommand):
         parser.add_argument(
             '--save-json',
             action='store_true',
-            help='Save API response to JSON file for future reference'
+            help='Save the parsed games to a JSON Lines file for future reference'
         )
 
     def handle(self, *args, **options):
@@ -29,12 +28,13 @@ class Command(BaseCommand):
             Game.objects.filter(season=2025).delete()
             self.stdout.write(f'Deleted {deleted_count} existing 2025 games')
 
-        # ESPN API endpoint for NFL schedule
-        # Use 2025 season - ESPN typically has schedule data available
-        espn_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
-        
         games_created = 0
-        api_responses = []
+        sinks = [LiveUpsertSink(fields=('game_date', 'home_score', 'away_score'))]
+        
+        # Save the parsed games to a JSON Lines file if requested
+        if options['save_json']:
+            json_filename = f'espn_2025_schedule_{datetime.now().strftime("%Y%m%d_%H%M%S")}.jsonl'
+            sinks.append(JsonArchiveSink(json_filename))
         
         # Try to get schedule for different date ranges in 2025
         # NFL season typically runs September-January
@@ -47,33 +47,22 @@ class Command(BaseCommand):
             try:
                 self.stdout.write(f'Fetching schedule for date range: {date_range}')
                 
-                # Add parameters for date range
-                params = {
-                    'dates': date_range,
-                    'seasontype': 2,  # Regular season (1=preseason, 2=regular, 3=postseason)
-                    'limit': 1000
-                }
-                
-                response = requests.get(espn_url, params=params, timeout=30)
-                response.raise_for_status()
-                
-                data = response.json()
-                api_responses.append({
-                    'date_range': date_range,
-                    'response': data,
-                    'fetched_at': datetime.now().isoformat()
-                })
+                data = fetch_scoreboard(
+                    dates=date_range,
+                    seasontype=2,  # Regular season (1=preseason, 2=regular, 3=postseason)
+                    limit=1000,
+                )
                 
                 # Process games from this response
                 if 'events' in data:
-                    games_in_range = self.process_espn_games(data['events'])
+                    games_in_range = self.process_espn_games(data, sinks)
                     games_created += games_in_range
                     self.stdout.write(f'  Processed {games_in_range} games from {date_range}')
                 else:
                     self.stdout.write(f'  No events found for {date_range}')
                 
                 # Rate limiting - be respectful to ESPN API
-                time.sleep(1)
+                pause(1)
                 
             except requests.exceptions.RequestException as e:
                 self.stdout.write(f'Error fetching data for {date_range}: {e}')
@@ -82,15 +71,8 @@ class Command(BaseCommand):
                 self.stdout.write(f'Error processing data for {date_range}: {e}')
                 continue
         
-        # Save API responses to JSON file if requested
         if options['save_json']:
-            json_filename = f'/Users/ares/Documents/_web/guessingfootball/guessingfootball/guessingfootball/espn_2025_schedule_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            try:
-                with open(json_filename, 'w') as f:
-                    json.dump(api_responses, f, indent=2)
-                self.stdout.write(f'Saved API responses to: {json_filename}')
-            except Exception as e:
-                self.stdout.write(f'Error saving JSON file: {e}')
+            self.stdout.write(f'Saved parsed games to: {json_filename}')
         
         # Final validation
         total_2025_games = Game.objects.filter(season=2025).count()
@@ -112,123 +94,31 @@ class Command(BaseCommand):
         # Basic validation
         self.validate_schedule()
 
-    def process_espn_games(self, events):
-        """Process games from ESPN API response"""
-        games_created = 0
+    def process_espn_games(self, data, sinks):
+        """Write the games of an ESPN scoreboard payload; returns the number created"""
+        upsert = sinks[0]
+        created_before, updated_before = len(upsert.created), len(upsert.updated)
         
-        with transaction.atomic():
-            for event in events:
-                try:
-                    # Extract game information
-                    game_date = datetime.fromisoformat(event['date'].replace('Z', '+00:00'))
-                    
-                    # Get teams
-                    competitions = event.get('competitions', [])
-                    if not competitions:
-                        continue
-                    
-                    competition = competitions[0]
-                    competitors = competition.get('competitors', [])
-                    
-                    if len(competitors) != 2:
-                        continue
-                    
-                    # Identify home and away teams
-                    home_team_data = None
-                    away_team_data = None
-                    
-                    for competitor in competitors:
-                        if competitor.get('homeAway') == 'home':
-                            home_team_data = competitor
-                        elif competitor.get('homeAway') == 'away':
-                            away_team_data = competitor
-                    
-                    if not home_team_data or not away_team_data:
-                        continue
-                    
-                    # Get team abbreviations
-                    home_abbr = home_team_data['team']['abbreviation']
-                    away_abbr = away_team_data['team']['abbreviation']
-                    
-                    # Handle team name mapping (if needed)
-                    home_abbr = self.map_team_abbreviation(home_abbr)
-                    away_abbr = self.map_team_abbreviation(away_abbr)
-                    
-                    # Get or create teams
-                    home_team, _ = Team.objects.get_or_create(
-                        name=home_abbr,
-                        defaults={
-                            'full_name': home_team_data['team'].get('displayName', home_abbr),
-                            'city': home_team_data['team'].get('location', ''),
-                        }
-                    )
-                    away_team, _ = Team.objects.get_or_create(
-                        name=away_abbr,
-                        defaults={
-                            'full_name': away_team_data['team'].get('displayName', away_abbr),
-                            'city': away_team_data['team'].get('location', ''),
-                        }
-                    )
-                    
-                    # Get scores (if game is completed)
-                    home_score = 0
-                    away_score = 0
-                    
-                    if competition.get('status', {}).get('type', {}).get('completed', False):
-                        home_score = int(home_team_data.get('score', 0))
-                        away_score = int(away_team_data.get('score', 0))
-                    
-                    # Determine week number (ESPN should provide this)
-                    week_number = event.get('week', {}).get('number', 1)
-                    
-                    # Create or update game
-                    game, created = Game.objects.get_or_create(
-                        home_team=home_team,
-                        away_team=away_team,
-                        season=2025,
-                        week=week_number,
-                        defaults={
-                            'game_date': game_date,
-                            'home_score': home_score,
-                            'away_score': away_score,
-                        }
-                    )
-                    
-                    if created:
-                        games_created += 1
-                        self.stdout.write(f'  ✓ {away_abbr} @ {home_abbr} - Week {week_number} - {game_date.strftime("%m/%d/%Y")}')
-                    else:
-                        # Update existing game if needed
-                        updated = False
-                        if game.game_date != game_date:
-                            game.game_date = game_date
-                            updated = True
-                        if game.home_score != home_score:
-                            game.home_score = home_score
-                            updated = True
-                        if game.away_score != away_score:
-                            game.away_score = away_score
-                            updated = True
-                        
-                        if updated:
-                            game.save()
-                            self.stdout.write(f'  ↻ Updated {away_abbr} @ {home_abbr} - Week {week_number}')
-                
-                except Exception as e:
-                    self.stdout.write(f'Error processing game: {e}')
-                    continue
+        records = iter_game_records(
+            data,
+            on_error=lambda event, error: self.stdout.write(f'Error processing game: {error}'),
+            season=2025,
+            create_teams=True,
+        )
+        drain(map(self.completed_scores, records), *sinks)
+        
+        for game in upsert.created[created_before:]:
+            self.stdout.write(f'  ✓ {game.away_team.name} @ {game.home_team.name} - Week {game.week} - {game.game_date.strftime("%m/%d/%Y")}')
+        for game in upsert.updated[updated_before:]:
+            self.stdout.write(f'  ↻ Updated {game.away_team.name} @ {game.home_team.name} - Week {game.week}')
         
-        return games_created
+        return len(upsert.created) - created_before
 
-    def map_team_abbreviation(self, espn_abbr):
-        """Map ESPN team abbreviations to our database abbreviations"""
-        mapping = {
-            'WSH': 'WAS',  # Washington Commanders
-            'LV': 'LV',    # Las Vegas Raiders
-            'LAR': 'LA',   # Los Angeles Rams
-            # Add other mappings as needed
-        }
-        return mapping.get(espn_abbr, espn_abbr)
+    def completed_scores(self, record):
+        """Only completed games keep their scores; the rest are stored as unplayed (0-0)"""
+        if not record['completed']:
+            record['home_score'] = record['away_score'] = 0
+        return record
 
     def validate_schedule(self):
         """Basic validation of imported schedule"""
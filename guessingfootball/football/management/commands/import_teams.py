@@ -1,9 +1,17 @@
 from django.core.management.base import BaseCommand
 from football.models import Team
+from football.teams import ensure_default_aliases
 
 class Command(BaseCommand):
     help = 'Import team data from teams.py with corrections'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--default-aliases',
+            action='store_true',
+            help='Also alias old and ESPN abbreviations (STL, OAK, SD, JAC, WSH, LAR) to the current teams'
+        )
+
     def handle(self, *args, **options):
         # Updated teams data with corrections
         teams_data = [
@@ -76,6 +84,9 @@ class Command(BaseCommand):
                 updated_teams += 1
                 self.stdout.write(f'  Updated: {team_id} - {full_name}')
         
+        # Old and ESPN abbreviations resolve to the teams above, when asked
+        aliases_created = ensure_default_aliases() if options['default_aliases'] else 0
+        
         # Handle deprecated team abbreviations
         deprecated_teams = ['JAC', 'WSH', 'OAK']  # JAC->JAX, WSH->WAS, OAK->LV
         for deprecated_id in deprecated_teams:
@@ -95,6 +106,7 @@ class Command(BaseCommand):
                 f'\nTeam import completed:\n'
                 f'- Teams created: {created_teams}\n'
                 f'- Teams updated: {updated_teams}\n'
+                f'- Aliases created: {aliases_created}\n'
                 f'- Total teams in database: {Team.objects.count()}'
             )
         )
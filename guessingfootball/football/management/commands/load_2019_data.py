@@ -1,52 +1,60 @@
 from django.core.management.base import BaseCommand
-from football.models import Team, Game
-from datetime import datetime
-import sys
-import os
+from football.models import Game
+from football.signals import deferred_refresh
+from football.results_archive import ensure_archive, open_season
+from football.teams import get_or_create_team
+from .load_all_seasons import bulk_load
 
 class Command(BaseCommand):
-    help = 'Load 2019 NFL season data from results.py'
+    help = 'Load 2019 NFL season data from the results archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Insert with bulk_create in batched transactions instead of one get_or_create per game'
+        )
 
     def handle(self, *args, **options):
-        # Import the results data
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
-        from results import results2019
+        for season, (games, skipped) in ensure_archive([2019]).items():
+            self.stdout.write(f'Built the {season} results archive: {games} games, {skipped} entries without scores skipped')
+        
+        if options['bulk']:
+            bulk_load(self, [2019])
+            return
         
         self.stdout.write('Loading 2019 NFL season data...')
         
         teams_created = 0
         games_created = 0
         
-        # Process each week
-        for week_num, week_games in enumerate(results2019, 1):
-            self.stdout.write(f'Processing week {week_num}...')
-            
-            for game_data in week_games:
-                # Parse game data: [('TEAM1', score1), ('TEAM2', score2), (year, month, day, hour, minute, second)]
-                away_team_data, home_team_data, date_tuple = game_data
+        # Rebuild the derived tables once at the end, not per game
+        with deferred_refresh():
+            week_num = None
+            for game_data in open_season(2019).iter_games():
+                if game_data['week'] != week_num:
+                    week_num = game_data['week']
+                    self.stdout.write(f'Processing week {week_num}...')
                 
-                away_team_name, away_score = away_team_data
-                home_team_name, home_score = home_team_data
-                year, month, day, hour, minute, second = date_tuple
+                away_team_name, home_team_name = game_data['away_team'], game_data['home_team']
+                away_score, home_score = game_data['away_score'], game_data['home_score']
                 
                 # Create or get teams
-                away_team, created = Team.objects.get_or_create(name=away_team_name)
+                away_team, created = get_or_create_team(away_team_name)
                 if created:
                     teams_created += 1
-                    self.stdout.write(f'Created team: {away_team_name}')
+                    self.stdout.write(f'Created team: {away_team.name}')
                 
-                home_team, created = Team.objects.get_or_create(name=home_team_name)
+                home_team, created = get_or_create_team(home_team_name)
                 if created:
                     teams_created += 1
-                    self.stdout.write(f'Created team: {home_team_name}')
+                    self.stdout.write(f'Created team: {home_team.name}')
                 
                 # Create game
-                game_date = datetime(year, month, day, hour, minute, second)
-                
                 game, created = Game.objects.get_or_create(
                     home_team=home_team,
                     away_team=away_team,
-                    game_date=game_date,
+                    game_date=game_data['game_date'],
                     defaults={
                         'home_score': home_score,
                         'away_score': away_score,
@@ -1,11 +1,37 @@
+import time
 from django.core.management.base import BaseCommand
+from football.ledger import describe, import_weeks
 from football.models import Team, Game
-from datetime import datetime, timedelta
-import sys
-import os
+from football.signals import deferred_refresh
+from football.results_archive import archive_path, bulk_load_seasons, ensure_archive, open_season
+from football.teams import get_or_create_team
+
+# Seasons compiled from results.py
+ARCHIVE_SEASONS = range(2011, 2020)
+
+
+def bulk_load(command, seasons):
+    """Bulk load archived seasons for a management command and report on its stdout; shared with load_2019_data"""
+    teams_before = Team.objects.count()
+    command.stdout.write(f'Bulk loading {len(seasons)} seasons...')
+    started = time.perf_counter()
+    sink = bulk_load_seasons(seasons)
+    elapsed = time.perf_counter() - started
+    
+    rate = sink.received / elapsed if elapsed else 0
+    command.stdout.write(
+        command.style.SUCCESS(
+            f'\nBulk loaded {", ".join(str(season) for season in seasons)}:\n'
+            f'- Teams: {Team.objects.count() - teams_before} created\n'
+            f'- Games: {sink.inserted} created, {sink.received - sink.inserted} already stored\n'
+            f'- {sink.received} rows in {elapsed:.2f}s ({rate:,.0f} rows/s, including derived tables)\n'
+            f'- Total games in database: {Game.objects.count()}'
+        )
+    )
+
 
 class Command(BaseCommand):
-    help = 'Load all NFL season data from results.py (2011-2019)'
+    help = 'Load all NFL season data from the results archive (2011-2019)'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -13,14 +39,28 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before loading'
         )
+        parser.add_argument(
+            '--seasons',
+            type=int,
+            nargs='+',
+            help='Only load these seasons (default: 2011-2019)'
+        )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Insert with bulk_create in batched transactions instead of one get_or_create per game'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only write weeks whose results changed since the last incremental import'
+        )
 
     def handle(self, *args, **options):
-        # Import the results data
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
-        from results import (
-            results2019, results2018, results2017, results2016, results2015,
-            results2014, results2013, results2012, results2011
-        )
+        seasons = sorted(options['seasons'] or ARCHIVE_SEASONS)
+        # Rebuilds the seasons whose archive is missing or older than results.py
+        for season, (games, skipped) in ensure_archive(seasons).items():
+            self.stdout.write(f'Built the {season} results archive: {games} games, {skipped} entries without scores skipped')
         
         if options['clear']:
             self.stdout.write('Clearing existing data...')
@@ -28,73 +68,51 @@ class Command(BaseCommand):
             Team.objects.all().delete()
             self.stdout.write('Data cleared.')
         
-        # Map of season data to year
-        seasons_data = {
-            2019: results2019,
-            2018: results2018,
-            2017: results2017,
-            2016: results2016,
-            2015: results2015,
-            2014: results2014,
-            2013: results2013,
-            2012: results2012,
-            2011: results2011,
-        }
+        if options['bulk']:
+            bulk_load(self, [season for season in seasons if archive_path(season).exists()])
+            return
+        if options['incremental']:
+            self.incremental_load([season for season in seasons if archive_path(season).exists()])
+            return
         
         total_teams_created = 0
         total_games_created = 0
         
-        # Process each season
-        for season_year in sorted(seasons_data.keys()):
-            season_data = seasons_data[season_year]
-            self.stdout.write(f'\nLoading {season_year} NFL season data...')
-            
-            games_this_season = 0
-            
-            # Process each week
-            for week_num, week_games in enumerate(season_data, 1):
-                self.stdout.write(f'  Processing {season_year} week {week_num}...')
+        # Rebuild the derived tables once per season at the end, not per game
+        with deferred_refresh():
+            for season_year in seasons:
+                if not archive_path(season_year).exists():
+                    self.stdout.write(f'\nNo results for {season_year}, skipping')
+                    continue
+                self.stdout.write(f'\nLoading {season_year} NFL season data...')
                 
-                for game_data in week_games:
-                    # Handle different data formats
-                    if len(game_data) == 3:
-                        # New format: [('TEAM1', score1), ('TEAM2', score2), (year, month, day, hour, minute, second)]
-                        away_team_data, home_team_data, date_tuple = game_data
-                        away_team_name, away_score = away_team_data
-                        home_team_name, home_score = home_team_data
-                        year, month, day, hour, minute, second = date_tuple
-                        game_date = datetime(year, month, day, hour, minute, second)
-                    elif len(game_data) == 2:
-                        # Old format: [('TEAM1', score1), ('TEAM2', score2)]
-                        away_team_data, home_team_data = game_data
-                        away_team_name, away_score = away_team_data
-                        home_team_name, home_score = home_team_data
-                        # Use a default date for older seasons (week estimation)
-                        # NFL season typically starts in September, account for month overflow
-                        base_date = datetime(season_year, 9, 1, 13, 0, 0)
-                        game_date = base_date + timedelta(days=(week_num - 1) * 7)
-                    else:
-                        self.stdout.write(f'    Skipping invalid game data: {game_data}')
-                        continue
+                games_this_season = 0
+                week_num = None
+                
+                # Only this season's file is read
+                for game_data in open_season(season_year).iter_games():
+                    if game_data['week'] != week_num:
+                        week_num = game_data['week']
+                        self.stdout.write(f'  Processing {season_year} week {week_num}...')
                     
                     # Create or get teams
-                    away_team, created = Team.objects.get_or_create(name=away_team_name)
+                    away_team, created = get_or_create_team(game_data['away_team'])
                     if created:
                         total_teams_created += 1
-                        self.stdout.write(f'    Created team: {away_team_name}')
+                        self.stdout.write(f'    Created team: {away_team.name}')
                     
-                    home_team, created = Team.objects.get_or_create(name=home_team_name)
+                    home_team, created = get_or_create_team(game_data['home_team'])
                     if created:
                         total_teams_created += 1
-                        self.stdout.write(f'    Created team: {home_team_name}')
+                        self.stdout.write(f'    Created team: {home_team.name}')
                     
                     game, created = Game.objects.get_or_create(
                         home_team=home_team,
                         away_team=away_team,
-                        game_date=game_date,
+                        game_date=game_data['game_date'],
                         defaults={
-                            'home_score': home_score,
-                            'away_score': away_score,
+                            'home_score': game_data['home_score'],
+                            'away_score': game_data['away_score'],
                             'week': week_num,
                             'season': season_year
                         }
@@ -103,16 +121,28 @@ class Command(BaseCommand):
                     if created:
                         total_games_created += 1
                         games_this_season += 1
-            
-            self.stdout.write(f'  {season_year} season: {games_this_season} games loaded')
+                
+                self.stdout.write(f'  {season_year} season: {games_this_season} games loaded')
         
         self.stdout.write(
             self.style.SUCCESS(
                 f'\nSuccessfully loaded all seasons:\n'
                 f'- Teams: {total_teams_created} created\n'
                 f'- Games: {total_games_created} created\n'
-                f'- Seasons: 2011-2019 (9 seasons)\n'
+                f'- Seasons: {seasons[0]}-{seasons[-1]} ({len(seasons)} seasons)\n'
                 f'- Total teams in database: {Team.objects.count()}\n'
                 f'- Total games in database: {Game.objects.count()}'
             )
-        )
\ No newline at end of file
+        )
+
+    def incremental_load(self, seasons):
+        for season in seasons:
+            archive = open_season(season)
+            teams = {abbr: get_or_create_team(abbr)[0] for abbr in archive.teams}
+            records = [
+                {**game, 'home_team': teams[game['home_team']], 'away_team': teams[game['away_team']]}
+                for game in archive.iter_games()
+            ]
+            summary = import_weeks('results', season, records)
+            self.stdout.write(f'  {season}: {describe(summary)}')
+        self.stdout.write(self.style.SUCCESS(f'Total games in database: {Game.objects.count()}'))
@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand
-from football.models import Team, Game
+from football.models import Game
+from football.ledger import describe, import_weeks
+from football.teams import get_or_create_team
 from datetime import datetime, timedelta
 import pytz
 
@@ -12,6 +14,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing 2025 games before creating new schedule'
         )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only write weeks whose schedule changed since the last incremental import; never resets scores'
+        )
 
     def handle(self, *args, **options):
         if options['clear_existing']:
@@ -86,14 +93,29 @@ class Command(BaseCommand):
         
         games_created = 0
         
+        if options['incremental']:
+            records = [
+                {
+                    'week': week_num,
+                    'away_team': get_or_create_team(away_abbr)[0],
+                    'home_team': get_or_create_team(home_abbr)[0],
+                    'game_date': game_time,
+                }
+                for week_num, games in all_weeks.items()
+                for away_abbr, home_abbr, game_time in games
+            ]
+            summary = import_weeks('load_correct_2025_schedule', 2025, records, fields=('game_date',))
+            self.stdout.write(self.style.SUCCESS(f'2025 schedule: {describe(summary)}'))
+            return
+        
         for week_num, games in all_weeks.items():
             self.stdout.write(f'Creating Week {week_num} games...')
             
             for away_abbr, home_abbr, game_time in games:
                 try:
                     # Get or create teams
-                    away_team, created_away = Team.objects.get_or_create(name=away_abbr)
-                    home_team, created_home = Team.objects.get_or_create(name=home_abbr)
+                    away_team, created_away = get_or_create_team(away_abbr)
+                    home_team, created_home = get_or_create_team(home_abbr)
                     
                     if created_away:
                         self.stdout.write(f'  Created team: {away_abbr}')
@@ -1,9 +1,14 @@
 from django.core.management.base import BaseCommand
 from football.models import Team, Game
-from datetime import datetime
+from football.backfill import BACKFILL_RATE, fetch_scoreboards
+from football.espn import fetch_scoreboard, iter_game_records, pause
+from football.ingest import DryRunSink, HistoricalInsertSink, drain
+from football.ledger import describe, import_weeks
 import requests
 import json
-import time
+
+# Weeks fetched per season in a parallel backfill
+SEASON_WEEKS = {2: range(1, 19), 3: range(1, 6)}
 
 class Command(BaseCommand):
     help = 'Load NFL season data from ESPN API (2020-2025)'
@@ -32,11 +37,33 @@ class Command(BaseCommand):
             type=int,
             help='Specific week to load (optional, loads all weeks if not specified)'
         )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Parse the ESPN data without writing any games'
+        )
         parser.add_argument(
             '--clear-new',
             action='store_true',
             help='Clear games from 2020 onwards before loading'
         )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only write weeks whose ESPN data changed since the last incremental import'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Fetch every season/week scoreboard with this many concurrent requests (default: 1, one season at a time)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=BACKFILL_RATE,
+            help=f'Most requests per second sent to ESPN with --workers (default: {BACKFILL_RATE})'
+        )
 
     def handle(self, *args, **options):
         start_year = options['start_year']
@@ -49,131 +76,64 @@ class Command(BaseCommand):
             Game.objects.filter(season__gte=2020).delete()
             self.stdout.write('Cleared existing 2020+ data.')
         
-        # Team abbreviation mapping to handle changes
-        team_mapping = {
-            'LV': 'LV',   # Las Vegas Raiders (2020+)
-            'OAK': 'LV',  # Oakland Raiders -> Las Vegas Raiders
-            'LAR': 'LA',  # Los Angeles Rams
-            'LAC': 'LAC', # Los Angeles Chargers  
-            'WAS': 'WAS', # Washington (was WSH in some sources)
-        }
+        teams_before = Team.objects.count()
+        sink = DryRunSink() if options['dry_run'] or options['incremental'] else HistoricalInsertSink()
+        
+        years = range(start_year, end_year + 1)
+        if options['workers'] > 1:
+            self.backfill(sink, years, season_type, specific_week, options)
+        else:
+            self.load_years(sink, years, season_type, specific_week)
+        
+        total_games_loaded = len(sink.created)
+        if options['incremental'] and not options['dry_run']:
+            # The records were only collected; import them week by week against the ledger
+            seasons = {}
+            for record in sink.records:
+                seasons.setdefault(record['season'], []).append(record)
+            for season, records in sorted(seasons.items()):
+                summary = import_weeks(f'espn:{season_type}', season, records)
+                total_games_loaded += summary['created']
+                self.stdout.write(f'  {season}: {describe(summary)}')
         
-        total_games_loaded = 0
-        total_teams_created = 0
+        total_teams_created = Team.objects.count() - teams_before
+        if options['dry_run']:
+            self.stdout.write(f'Dry run: {sink.received} games parsed, nothing written')
         
-        for year in range(start_year, end_year + 1):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\nSuccessfully loaded ESPN data:\n'
+                f'- Teams created: {total_teams_created}\n'
+                f'- Games loaded: {total_games_loaded}\n'
+                f'- Years processed: {start_year}-{end_year}\n'
+                f'- Total teams in database: {Team.objects.count()}\n'
+                f'- Total games in database: {Game.objects.count()}'
+            )
+        )
+
+    def load_years(self, sink, years, season_type, specific_week):
+        """Fetch and load one season at a time"""
+        for year in years:
             self.stdout.write(f'\nLoading {year} NFL season data...')
             
-            # Construct API URL
-            url = f'https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?dates={year}&seasontype={season_type}'
-            if specific_week:
-                url += f'&week={specific_week}'
-            
             try:
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
-                data = response.json()
+                data = fetch_scoreboard(dates=year, seasontype=season_type, week=specific_week)
                 
                 if 'events' not in data:
                     self.stdout.write(f'No events found for {year}')
                     continue
                 
-                games_this_year = 0
-                
-                for event in data['events']:
-                    try:
-                        # Skip Pro Bowl and other special events
-                        event_name = event.get('name', '').lower()
-                        if any(skip_term in event_name for skip_term in ['pro bowl', 'all-star', 'hall of fame']):
-                            continue
-                        
-                        # Extract game information
-                        game_id = event['id']
-                        game_date_str = event['date']
-                        game_date = datetime.fromisoformat(game_date_str.replace('Z', '+00:00'))
-                        
-                        # Get season info
-                        season_info = event.get('season', {})
-                        actual_season = season_info.get('year', year)
-                        
-                        # Extract week information if available
-                        week = event.get('week', {}).get('number', 1)
-                        
-                        # Extract competitors (teams and scores)
-                        competition = event['competitions'][0]
-                        competitors = competition['competitors']
-                        
-                        if len(competitors) != 2:
-                            continue
-                            
-                        # Identify home and away teams
-                        home_team_info = None
-                        away_team_info = None
-                        
-                        for comp in competitors:
-                            home_away = comp.get('homeAway', '')
-                            if home_away == 'home':
-                                home_team_info = comp
-                            elif home_away == 'away':
-                                away_team_info = comp
-                        
-                        # Fallback if homeAway not available
-                        if not home_team_info or not away_team_info:
-                            home_team_info = competitors[0]  # Usually home team is first
-                            away_team_info = competitors[1]
-                        
-                        # Extract team data
-                        home_team_abbr = home_team_info['team']['abbreviation']
-                        away_team_abbr = away_team_info['team']['abbreviation']
-                        
-                        # Skip if teams are conference abbreviations or other invalid teams
-                        invalid_teams = ['AFC', 'NFC', 'PRO', 'ALL']
-                        if home_team_abbr in invalid_teams or away_team_abbr in invalid_teams:
-                            continue
-                        
-                        # Apply team mapping
-                        home_team_abbr = team_mapping.get(home_team_abbr, home_team_abbr)
-                        away_team_abbr = team_mapping.get(away_team_abbr, away_team_abbr)
-                        
-                        home_score = int(home_team_info.get('score', 0))
-                        away_score = int(away_team_info.get('score', 0))
-                        
-                        # Create or get teams
-                        home_team, created = Team.objects.get_or_create(name=home_team_abbr)
-                        if created:
-                            total_teams_created += 1
-                            self.stdout.write(f'  Created team: {home_team_abbr}')
-                        
-                        away_team, created = Team.objects.get_or_create(name=away_team_abbr)
-                        if created:
-                            total_teams_created += 1
-                            self.stdout.write(f'  Created team: {away_team_abbr}')
-                        
-                        # Create game
-                        game, created = Game.objects.get_or_create(
-                            home_team=home_team,
-                            away_team=away_team,
-                            game_date=game_date,
-                            defaults={
-                                'home_score': home_score,
-                                'away_score': away_score,
-                                'week': week,
-                                'season': actual_season
-                            }
-                        )
-                        
-                        if created:
-                            total_games_loaded += 1
-                            games_this_year += 1
-                            
-                    except Exception as e:
-                        self.stdout.write(f'  Error processing game {event.get("id", "unknown")}: {str(e)}')
-                        continue
+                parsed_before, loaded_before = sink.received, len(sink.created)
+                records = iter_game_records(data, on_error=self.report_event_error, create_teams=True)
+                drain(records, sink)
                 
-                self.stdout.write(f'  {year}: {games_this_year} games loaded')
+                self.stdout.write(
+                    f'  {year}: {len(sink.created) - loaded_before} games loaded '
+                    f'({sink.received - parsed_before} in ESPN data)'
+                )
                 
                 # Small delay between years to be respectful to the API
-                time.sleep(1)
+                pause(1)
                 
             except requests.RequestException as e:
                 self.stdout.write(f'Error fetching data for {year}: {str(e)}')
@@ -181,14 +141,32 @@ class Command(BaseCommand):
             except Exception as e:
                 self.stdout.write(f'Error processing {year} data: {str(e)}')
                 continue
-        
+
+    def backfill(self, sink, years, season_type, specific_week, options):
+        """Fetch all season/week scoreboards concurrently; records are written here, as they arrive"""
+        weeks = [specific_week] if specific_week else SEASON_WEEKS.get(season_type, [None])
+        queries = [
+            {'dates': year, 'seasontype': season_type, 'week': week}
+            for year in years
+            for week in weeks
+        ]
         self.stdout.write(
-            self.style.SUCCESS(
-                f'\nSuccessfully loaded ESPN data:\n'
-                f'- Teams created: {total_teams_created}\n'
-                f'- Games loaded: {total_games_loaded}\n'
-                f'- Years processed: {start_year}-{end_year}\n'
-                f'- Total teams in database: {Team.objects.count()}\n'
-                f'- Total games in database: {Game.objects.count()}'
-            )
-        )
\ No newline at end of file
+            f'\nFetching {len(queries)} scoreboards with {options["workers"]} workers '
+            f'at up to {options["rate"]:g} requests/s...'
+        )
+        
+        with sink:
+            for query, data, error in fetch_scoreboards(queries, options['workers'], options['rate']):
+                label = f'{query["dates"]} week {query["week"]}' if query['week'] else str(query['dates'])
+                if error is not None:
+                    self.stdout.write(f'Error fetching data for {label}: {error}')
+                    continue
+                
+                parsed_before = sink.received
+                # Added rather than drained so inserts are batched across weeks
+                for record in iter_game_records(data, on_error=self.report_event_error, create_teams=True):
+                    sink.add(record)
+                self.stdout.write(f'  {label}: {sink.received - parsed_before} games in ESPN data')
+
+    def report_event_error(self, event, error):
+        self.stdout.write(f'  Error processing game {event.get("id", "unknown")}: {error}')
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from football.models import Game, SeasonWeek
+from football.schedule import refresh_season_weeks
+
+class Command(BaseCommand):
+    help = 'Rebuild the SeasonWeek calendar from the Game schedule'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season',
+            type=int,
+            help='Season to rebuild (default: all seasons with games)'
+        )
+
+    def handle(self, *args, **options):
+        if options.get('season'):
+            seasons = [options['season']]
+        else:
+            seasons = list(Game.objects.values_list('season', flat=True).distinct().order_by('season'))
+            # Drop weeks of seasons that no longer have any games
+            SeasonWeek.objects.exclude(season__in=seasons).delete()
+        
+        total_weeks = 0
+        for season in seasons:
+            weeks = refresh_season_weeks(season)
+            total_weeks += weeks
+            self.stdout.write(f'  {season}: {weeks} weeks')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt {total_weeks} calendar weeks for {len(seasons)} seasons')
+        )
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from football.models import Game, TeamGameRecord, TeamSeasonStats
+from football.standings import rebuild_matchup_records, rebuild_team_game_records, rebuild_team_season_stats
+
+class Command(BaseCommand):
+    help = 'Rebuild the TeamSeasonStats, TeamGameRecord and MatchupRecord tables from Game results'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season',
+            type=int,
+            help='Season to rebuild (default: all seasons with games)'
+        )
+
+    def handle(self, *args, **options):
+        if options.get('season'):
+            seasons = [options['season']]
+        else:
+            seasons = list(Game.objects.values_list('season', flat=True).distinct().order_by('season'))
+            # Drop rows for seasons that no longer have any games
+            TeamSeasonStats.objects.exclude(season__in=seasons).delete()
+            TeamGameRecord.objects.exclude(season__in=seasons).delete()
+        
+        total_rows = 0
+        total_records = 0
+        for season in seasons:
+            rows = rebuild_team_season_stats(season)
+            records = rebuild_team_game_records(season)
+            total_rows += rows
+            total_records += records
+            self.stdout.write(f'  {season}: {rows} team rows, {records} running records')
+        
+        # Head-to-head series span seasons, so they are always rebuilt in full
+        matchups = rebuild_matchup_records()
+        self.stdout.write(f'  Head-to-head: {matchups} meetings')
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully rebuilt {total_rows} team season stats rows, '
+                f'{total_records} running records and {matchups} head-to-head meetings '
+                f'for {len(seasons)} seasons'
+            )
+        )
@@ -0,0 +1,52 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from football.jobs import claim_next, fail_stale_jobs, run_job, worker_name
+
+POLL_INTERVAL = 2
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs queued from the admin'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs queued now and exit instead of waiting for more',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=POLL_INTERVAL,
+            help=f'Seconds between checks of an empty queue (default: {POLL_INTERVAL})',
+        )
+
+    def handle(self, *args, **options):
+        worker = worker_name()
+        self.stdout.write(f'Job worker {worker} started')
+        try:
+            while True:
+                # Long-lived process: drop connections past CONN_MAX_AGE or broken ones
+                close_old_connections()
+                stale = fail_stale_jobs()
+                if stale:
+                    self.stdout.write(self.style.WARNING(f'Marked {stale} abandoned jobs as failed'))
+
+                job = claim_next(worker)
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                self.stdout.write(f'Running {job}...')
+                started = time.monotonic()
+                job = run_job(job)
+                elapsed = time.monotonic() - started
+                if job.status == job.SUCCEEDED:
+                    self.stdout.write(self.style.SUCCESS(f'{job} finished in {elapsed:.1f}s: {job.result}'))
+                else:
+                    self.stdout.write(self.style.ERROR(f'{job} failed after {elapsed:.1f}s:\n{job.result}'))
+        except KeyboardInterrupt:
+            self.stdout.write('Job worker stopped.')
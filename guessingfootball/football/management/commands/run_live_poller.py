@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import requests
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.db.models import Min
+from football.espn import fetch_scoreboard
+from football.models import Game, quarter_display
+from .poll_live_games import Command as PollLiveGamesCommand
+
+# Seconds between polls while a game is in progress, while every live game
+# is at halftime, and once a kickoff is due but ESPN hasn't flagged it live
+LIVE_INTERVAL = 5
+HALFTIME_INTERVAL = 60
+KICKOFF_INTERVAL = 30
+# Start polling this long before a kickoff, and keep watching a game that
+# hasn't finished for this long after it
+KICKOFF_LEAD = timedelta(minutes=5)
+GAME_WINDOW = timedelta(hours=5)
+# Longest idle sleep, so schedule changes are noticed
+MAX_IDLE_SLEEP = 3600
+MAX_ERROR_BACKOFF = 300
+
+
+def espn_season_type(week):
+    """ESPN (seasontype, week) for one of our week numbers; preseason games are stored as week 0"""
+    if week == 0:
+        return 1, None
+    if week > 18:
+        return 3, week - 18
+    return 2, week
+
+
+class Command(PollLiveGamesCommand):
+    help = 'Poll ESPN continuously: every few seconds during games, asleep until the next kickoff otherwise'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season',
+            type=int,
+            default=2025,
+            help='Season year (default: 2025)',
+        )
+        parser.add_argument(
+            '--live-interval',
+            type=int,
+            default=LIVE_INTERVAL,
+            help=f'Seconds between polls while games are in progress (default: {LIVE_INTERVAL})',
+        )
+
+    def handle(self, *args, **options):
+        self.season = options['season']
+        self.live_interval = options['live_interval']
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            self.stdout.write('Live poller stopped.')
+
+    async def run(self):
+        # One session for the life of the daemon keeps the ESPN connection alive
+        with requests.Session() as session:
+            failures = 0
+            while True:
+                delay, weeks = KICKOFF_INTERVAL, set()
+                try:
+                    delay, weeks = await sync_to_async(self.plan)(datetime.now(timezone.utc))
+                    for week in sorted(weeks):
+                        await self.poll_week(session, week)
+                    failures = 0
+                except requests.RequestException as e:
+                    failures += 1
+                    delay = min(delay * 2 ** failures, MAX_ERROR_BACKOFF)
+                    self.stdout.write(self.style.ERROR(f'Error fetching data from ESPN API: {e}'))
+                except Exception as e:
+                    # A locked database or a payload we can't parse mustn't
+                    # stop the daemon; drop the connection and back off
+                    failures += 1
+                    delay = min(delay * 2 ** failures, MAX_ERROR_BACKOFF)
+                    self.stdout.write(self.style.ERROR(f'Error processing data: {e!r}'))
+                    await sync_to_async(close_old_connections)()
+
+                if not weeks and not failures:
+                    self.stdout.write(f'No games in progress; sleeping {delay:.0f}s')
+                await asyncio.sleep(delay)
+
+    def plan(self, now):
+        """Seconds to wait after this round, and the weeks that need polling now"""
+        close_old_connections()
+        season_games = Game.objects.filter(season=self.season)
+
+        live = list(season_games.filter(is_live=True).values_list('week', 'game_status'))
+        # Kicked off (or about to) but not yet flagged live or finished
+        due = set(season_games.filter(
+            is_live=False,
+            home_score=0,
+            away_score=0,
+            game_date__gte=now - GAME_WINDOW,
+            game_date__lte=now + KICKOFF_LEAD,
+        ).values_list('week', flat=True))
+        weeks = {week for week, _ in live} | due
+
+        if live:
+            at_halftime = all(status.lower() == 'halftime' for _, status in live)
+            return (HALFTIME_INTERVAL if at_halftime else self.live_interval), weeks
+        if due:
+            return KICKOFF_INTERVAL, weeks
+
+        next_kickoff = season_games.filter(game_date__gt=now).aggregate(next=Min('game_date'))['next']
+        if next_kickoff is None:
+            return MAX_IDLE_SLEEP, weeks
+        until_window = (next_kickoff - KICKOFF_LEAD - now).total_seconds()
+        return min(max(until_window, KICKOFF_INTERVAL), MAX_IDLE_SLEEP), weeks
+
+    async def poll_week(self, session, week):
+        seasontype, espn_week = espn_season_type(week)
+        data = await asyncio.to_thread(
+            fetch_scoreboard, session, dates=self.season, seasontype=seasontype, week=espn_week, max_age=0,
+        )
+
+        games_updated, live_games = await sync_to_async(self.process_scoreboard)(data, self.season, week)
+        for game in live_games:
+            self.stdout.write(
+                f"  {game['away_team'].name} {game['away_score']} @ {game['home_team'].name} {game['home_score']}"
+                f" - {quarter_display(game['period'])} {game['clock']}"
+            )
+        self.stdout.write(f'Week {week}: {games_updated} games updated, {len(live_games)} live')
@@ -0,0 +1,72 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from football.schedule_validation import validate_schedule
+
+class Command(BaseCommand):
+    help = 'Validate a season schedule: weekly counts, double bookings, rest, team totals, home/away balance and kickoff slots'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season',
+            type=int,
+            default=2025,
+            help='Season to validate (default: 2025)'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the report as JSON'
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Exit with an error if any check fails'
+        )
+
+    def handle(self, *args, **options):
+        season = options['season']
+        report = validate_schedule(season)
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.display_report(report)
+
+        if options['strict'] and report['failed']:
+            raise CommandError(f"{season} schedule failed: {', '.join(report['failed'])}")
+
+    def display_report(self, report):
+        season = report['season']
+        self.stdout.write(f"\n{season} Schedule Validation")
+        self.stdout.write("=" * 50)
+        self.stdout.write(
+            f"{report['games']} games, {report['regular_season_games']} in the regular season "
+            f"(checked in {report['elapsed_ms']} ms)"
+        )
+
+        self.stdout.write("\nGames per week:")
+        for week, count in report['summary']['games_per_week'].items():
+            self.stdout.write(f"  Week {week:2d}: {count}")
+
+        self.stdout.write("\nKickoff slots:")
+        for slot, count in report['summary']['kickoff_slots'].items():
+            self.stdout.write(f"  {slot}: {count}")
+
+        self.stdout.write("\nChecks:")
+        for check in report['checks']:
+            if check['status'] == 'pass':
+                self.stdout.write(self.style.SUCCESS(f"  ✓ {check['message']}"))
+                continue
+            style = self.style.ERROR if check['status'] == 'fail' else self.style.WARNING
+            self.stdout.write(style(f"  ✗ {check['message']} ({len(check['issues'])} issue(s))"))
+            for issue in check['issues'][:10]:
+                self.stdout.write(f"      {issue}")
+            if len(check['issues']) > 10:
+                self.stdout.write(f"      ... and {len(check['issues']) - 10} more")
+
+        if report['status'] == 'pass':
+            self.stdout.write(self.style.SUCCESS(f"\n✓ {season} schedule passes every check"))
+        else:
+            self.stdout.write(
+                f"\n{len(report['failed'])} check(s) failed, {len(report['warnings'])} warning(s)"
+            )
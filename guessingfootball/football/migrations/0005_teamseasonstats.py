@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_team_season_stats(apps, schema_editor):
+    """Build the initial TeamSeasonStats rows from existing games"""
+    Game = apps.get_model('football', 'Game')
+    TeamSeasonStats = apps.get_model('football', 'TeamSeasonStats')
+
+    stats = {}
+    for game in Game.objects.all().iterator():
+        for side, team_id, team_score, opponent_score in (
+            ('home', game.home_team_id, game.home_score, game.away_score),
+            ('away', game.away_team_id, game.away_score, game.home_score),
+        ):
+            row = stats.setdefault((team_id, game.season), TeamSeasonStats(team_id=team_id, season=game.season))
+            row.games_scheduled += 1
+            if game.home_score == 0 and game.away_score == 0:
+                continue  # Unplayed game
+            row.games_played += 1
+            row.points_for += team_score
+            row.points_against += opponent_score
+            if team_score > opponent_score:
+                result = 'wins'
+            elif team_score < opponent_score:
+                result = 'losses'
+            else:
+                result = 'ties'
+            setattr(row, result, getattr(row, result) + 1)
+            setattr(row, f'{side}_{result}', getattr(row, f'{side}_{result}') + 1)
+
+    TeamSeasonStats.objects.bulk_create(stats.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0004_team_points_against_2024_team_points_for_2024_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamSeasonStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField()),
+                ('games_scheduled', models.IntegerField(default=0)),
+                ('games_played', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('ties', models.IntegerField(default=0)),
+                ('points_for', models.IntegerField(default=0)),
+                ('points_against', models.IntegerField(default=0)),
+                ('home_wins', models.IntegerField(default=0)),
+                ('home_losses', models.IntegerField(default=0)),
+                ('home_ties', models.IntegerField(default=0)),
+                ('away_wins', models.IntegerField(default=0)),
+                ('away_losses', models.IntegerField(default=0)),
+                ('away_ties', models.IntegerField(default=0)),
+                ('last_updated', models.DateTimeField(auto_now=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='football.team')),
+            ],
+            options={
+                'ordering': ['season', 'team'],
+                'unique_together': {('team', 'season')},
+            },
+        ),
+        migrations.RunPython(populate_team_season_stats, migrations.RunPython.noop),
+    ]
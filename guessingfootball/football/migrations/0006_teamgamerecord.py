@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_team_game_records(apps, schema_editor):
+    """Build the initial running records from existing games"""
+    Game = apps.get_model('football', 'Game')
+    TeamGameRecord = apps.get_model('football', 'TeamGameRecord')
+
+    running = {}
+    records = []
+    for game in Game.objects.order_by('season', 'game_date', 'id').iterator():
+        for team_id, team_score, opponent_score in (
+            (game.home_team_id, game.home_score, game.away_score),
+            (game.away_team_id, game.away_score, game.home_score),
+        ):
+            totals = running.setdefault((team_id, game.season), {
+                'games_played': 0, 'wins': 0, 'losses': 0, 'ties': 0,
+                'points_for': 0, 'points_against': 0,
+            })
+            if not (game.home_score == 0 and game.away_score == 0):
+                totals['games_played'] += 1
+                totals['points_for'] += team_score
+                totals['points_against'] += opponent_score
+                if team_score > opponent_score:
+                    totals['wins'] += 1
+                elif team_score < opponent_score:
+                    totals['losses'] += 1
+                else:
+                    totals['ties'] += 1
+            records.append(TeamGameRecord(
+                team_id=team_id, game_id=game.id, season=game.season,
+                game_date=game.game_date, **totals,
+            ))
+
+    TeamGameRecord.objects.bulk_create(records, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0005_teamseasonstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamGameRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField()),
+                ('game_date', models.DateTimeField()),
+                ('games_played', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('ties', models.IntegerField(default=0)),
+                ('points_for', models.IntegerField(default=0)),
+                ('points_against', models.IntegerField(default=0)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_records', to='football.game')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_records', to='football.team')),
+            ],
+            options={
+                'ordering': ['team', 'season', 'game_date'],
+                'indexes': [models.Index(fields=['team', 'season', 'game_date'], name='football_te_team_id_f0d18f_idx')],
+                'unique_together': {('team', 'game')},
+            },
+        ),
+        migrations.RunPython(populate_team_game_records, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_matchup_records(apps, schema_editor):
+    """Build the initial head-to-head index from existing played games"""
+    Game = apps.get_model('football', 'Game')
+    MatchupRecord = apps.get_model('football', 'MatchupRecord')
+
+    running = {}
+    records = []
+    games = Game.objects.exclude(home_score=0, away_score=0).order_by('game_date', 'id')
+    for game in games.iterator():
+        team_low_id, team_high_id = sorted((game.home_team_id, game.away_team_id))
+        totals = running.setdefault((team_low_id, team_high_id), {
+            'team_low_wins': 0, 'team_high_wins': 0, 'ties': 0,
+        })
+        if game.home_score == game.away_score:
+            totals['ties'] += 1
+        else:
+            winner_id = game.home_team_id if game.home_score > game.away_score else game.away_team_id
+            totals['team_low_wins' if winner_id == team_low_id else 'team_high_wins'] += 1
+        records.append(MatchupRecord(
+            team_low_id=team_low_id, team_high_id=team_high_id,
+            game_id=game.id, game_date=game.game_date, **totals,
+        ))
+
+    MatchupRecord.objects.bulk_create(records, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0006_teamgamerecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchupRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_date', models.DateTimeField()),
+                ('team_low_wins', models.IntegerField(default=0)),
+                ('team_high_wins', models.IntegerField(default=0)),
+                ('ties', models.IntegerField(default=0)),
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='matchup_record', to='football.game')),
+                ('team_high', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='football.team')),
+                ('team_low', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='football.team')),
+            ],
+            options={
+                'ordering': ['team_low', 'team_high', 'game_date'],
+                'indexes': [models.Index(fields=['team_low', 'team_high', 'game_date'], name='football_ma_team_lo_bf04ca_idx')],
+            },
+        ),
+        migrations.RunPython(populate_matchup_records, migrations.RunPython.noop),
+    ]
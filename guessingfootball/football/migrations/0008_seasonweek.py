@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:22
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def populate_season_weeks(apps, schema_editor):
+    """Build the initial calendar from the existing schedule"""
+    Game = apps.get_model('football', 'Game')
+    SeasonWeek = apps.get_model('football', 'SeasonWeek')
+
+    rows = Game.objects.order_by().values('season', 'week').annotate(
+        first_kickoff=models.Min('game_date'),
+        last_kickoff=models.Max('game_date'),
+        game_count=models.Count('id'),
+    )
+    season_weeks = []
+    for row in rows:
+        last_kickoff = row['last_kickoff']
+        days_until_tuesday = (1 - last_kickoff.weekday() + 7) % 7 or 7
+        season_weeks.append(SeasonWeek(
+            rollover=last_kickoff + timedelta(days=days_until_tuesday),
+            **row,
+        ))
+
+    SeasonWeek.objects.bulk_create(season_weeks, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0007_matchuprecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonWeek',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField()),
+                ('week', models.IntegerField()),
+                ('first_kickoff', models.DateTimeField()),
+                ('last_kickoff', models.DateTimeField()),
+                ('rollover', models.DateTimeField()),
+                ('game_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['season', 'week'],
+                'unique_together': {('season', 'week')},
+            },
+        ),
+        migrations.RunPython(populate_season_weeks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0008_seasonweek'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['season', 'week', 'game_date'], name='game_season_week_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['home_team', 'season', 'game_date'], name='game_home_season_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['away_team', 'season', 'game_date'], name='game_away_season_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['game_date'], name='game_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(condition=models.Q(('is_live', True)), fields=['game_date'], name='game_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teamseasonstats',
+            index=models.Index(fields=['season', 'team'], name='teamseasonstats_season_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0010_game_updated_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=10, unique=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='football.team')),
+            ],
+            options={
+                'ordering': ['alias'],
+                'verbose_name_plural': 'team aliases',
+            },
+        ),
+    ]
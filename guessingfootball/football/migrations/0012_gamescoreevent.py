@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0011_teamalias'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameScoreEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.SmallIntegerField()),
+                ('recorded_at', models.DateTimeField()),
+                ('home_score', models.PositiveSmallIntegerField()),
+                ('away_score', models.PositiveSmallIntegerField()),
+                ('is_live', models.BooleanField()),
+                ('game_status', models.CharField(blank=True, max_length=50)),
+                ('quarter', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('time_remaining', models.CharField(blank=True, max_length=20)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_events', to='football.game')),
+            ],
+            options={
+                'ordering': ['game', 'recorded_at', 'id'],
+                'indexes': [
+                    models.Index(fields=['game', 'recorded_at'], name='scoreevent_game_time_idx'),
+                    models.Index(fields=['season', 'recorded_at'], name='scoreevent_season_time_idx'),
+                ],
+            },
+        ),
+    ]
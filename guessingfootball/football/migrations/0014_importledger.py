@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0013_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50)),
+                ('season', models.IntegerField()),
+                ('week', models.IntegerField()),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('games', models.IntegerField(default=0)),
+                ('imported_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['source', 'season', 'week'],
+                'unique_together': {('source', 'season', 'week')},
+            },
+        ),
+    ]
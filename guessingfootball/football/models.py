@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 
 class Team(models.Model):
     name = models.CharField(max_length=10, unique=True)
@@ -179,43 +179,17 @@ class Team(models.Model):
     @classmethod
     def calculate_2024_rankings(cls):
         """Calculate and update 2024 season rankings for all teams"""
-        from django.db.models import Count, Q, F
+        # 2024 stats are maintained per team in TeamSeasonStats
+        season_stats = {
+            stats.team_id: stats
+            for stats in TeamSeasonStats.objects.filter(season=2024)
+        }
         
-        # Calculate 2024 stats for each team
         teams_data = []
         for team in cls.objects.all():
-            # Get 2024 games
-            home_games = team.home_games.filter(season=2024)
-            away_games = team.away_games.filter(season=2024)
-            
-            wins = losses = ties = 0
-            points_for = points_against = 0
-            
-            # Count home results
-            for game in home_games:
-                if game.home_score == 0 and game.away_score == 0:
-                    continue  # Skip unplayed games
-                points_for += game.home_score
-                points_against += game.away_score
-                if game.home_score > game.away_score:
-                    wins += 1
-                elif game.home_score < game.away_score:
-                    losses += 1
-                else:
-                    ties += 1
-            
-            # Count away results
-            for game in away_games:
-                if game.home_score == 0 and game.away_score == 0:
-                    continue  # Skip unplayed games
-                points_for += game.away_score
-                points_against += game.home_score
-                if game.away_score > game.home_score:
-                    wins += 1
-                elif game.away_score < game.home_score:
-                    losses += 1
-                else:
-                    ties += 1
+            stats = season_stats.get(team.id) or TeamSeasonStats(season=2024)
+            wins, losses, ties = stats.wins, stats.losses, stats.ties
+            points_for, points_against = stats.points_for, stats.points_against
             
             # Update team stats
             team.wins_2024 = wins
@@ -303,6 +277,31 @@ class Team(models.Model):
     class Meta:
         ordering = ['name']
 
+def quarter_display(quarter):
+    """Short label for a quarter number (ESPN's period): 1st-4th, then OT, OT2..."""
+    if not quarter:
+        return ""
+    if quarter == 1:
+        return "1st"
+    elif quarter == 2:
+        return "2nd"
+    elif quarter == 3:
+        return "3rd"
+    elif quarter == 4:
+        return "4th"
+    elif quarter > 4:
+        return f"OT{quarter - 4 if quarter > 5 else ''}"
+    return ""
+
+
+class GameQuerySet(models.QuerySet):
+    def delete(self):
+        # One rebuild of the seasons involved instead of a table update per game
+        from .signals import deferred_refresh
+        with deferred_refresh():
+            return super().delete()
+
+
 class Game(models.Model):
     home_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='home_games')
     away_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='away_games')
@@ -319,6 +318,8 @@ class Game(models.Model):
     time_remaining = models.CharField(max_length=20, blank=True)  # "12:34", "00:00", etc.
     last_updated = models.DateTimeField(auto_now=True)
     
+    objects = GameQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.away_team} @ {self.home_team} ({self.game_date.strftime('%Y-%m-%d')})"
     
@@ -338,25 +339,292 @@ class Game(models.Model):
     @property
     def quarter_display(self):
         """Get formatted quarter display"""
-        if not self.current_quarter:
-            return ""
-        if self.current_quarter == 1:
-            return "1st"
-        elif self.current_quarter == 2:
-            return "2nd"
-        elif self.current_quarter == 3:
-            return "3rd"
-        elif self.current_quarter == 4:
-            return "4th"
-        elif self.current_quarter > 4:
-            return f"OT{self.current_quarter - 4 if self.current_quarter > 5 else ''}"
-        return ""
+        return quarter_display(self.current_quarter)
+    
+    def save(self, *args, **kwargs):
+        # The post_save handlers update the derived tables; running them in
+        # the same transaction keeps those tables consistent with the game
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so signal handlers can tell what changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
     
     @classmethod
     def get_live_games(cls):
         """Get all currently live games"""
-        return cls.objects.filter(is_live=True).order_by('game_date')
+        return cls.objects.filter(is_live=True).select_related('home_team', 'away_team').order_by('game_date')
     
     class Meta:
         ordering = ['game_date']
         unique_together = ['home_team', 'away_team', 'game_date']
+        indexes = [
+            # Week pages, the home page and schedule loaders
+            models.Index(fields=['season', 'week', 'game_date'], name='game_season_week_idx'),
+            # A team's games in a season
+            models.Index(fields=['home_team', 'season', 'game_date'], name='game_home_season_idx'),
+            models.Index(fields=['away_team', 'season', 'game_date'], name='game_away_season_idx'),
+            # Date range scans
+            models.Index(fields=['game_date'], name='game_date_idx'),
+            # Live scoreboard; only created on backends with partial index support
+            models.Index(fields=['game_date'], condition=models.Q(is_live=True), name='game_live_idx'),
+            # Live score stream picks up rows written since its last check
+            models.Index(fields=['last_updated'], name='game_updated_idx'),
+        ]
+
+
+class TeamSeasonStats(models.Model):
+    """Season aggregates for one team, kept in sync with Game scores"""
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='season_stats')
+    season = models.IntegerField()
+    
+    games_scheduled = models.IntegerField(default=0)
+    games_played = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    ties = models.IntegerField(default=0)
+    points_for = models.IntegerField(default=0)
+    points_against = models.IntegerField(default=0)
+    
+    # Home/away splits
+    home_wins = models.IntegerField(default=0)
+    home_losses = models.IntegerField(default=0)
+    home_ties = models.IntegerField(default=0)
+    away_wins = models.IntegerField(default=0)
+    away_losses = models.IntegerField(default=0)
+    away_ties = models.IntegerField(default=0)
+    
+    last_updated = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.team} {self.season} ({self.wins}-{self.losses}-{self.ties})"
+    
+    @property
+    def win_percentage(self):
+        """Win percentage counting ties as half a win"""
+        if self.games_played == 0:
+            return 0.0
+        return (self.wins + (self.ties * 0.5)) / self.games_played
+    
+    @property
+    def avg_points_for(self):
+        return self.points_for / self.games_played if self.games_played > 0 else 0
+    
+    @property
+    def avg_points_against(self):
+        return self.points_against / self.games_played if self.games_played > 0 else 0
+    
+    class Meta:
+        ordering = ['season', 'team']
+        unique_together = ['team', 'season']
+        indexes = [
+            # Whole-league reads for one season
+            models.Index(fields=['season', 'team'], name='teamseasonstats_season_idx'),
+        ]
+
+
+class TeamGameRecord(models.Model):
+    """Running season record for a team as of the end of one of its games"""
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='game_records')
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='team_records')
+    season = models.IntegerField()
+    game_date = models.DateTimeField()
+    
+    # Cumulative totals including this game (unplayed 0-0 games add nothing)
+    games_played = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    ties = models.IntegerField(default=0)
+    points_for = models.IntegerField(default=0)
+    points_against = models.IntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.team} {self.season} through {self.game_date.strftime('%Y-%m-%d')} ({self.wins}-{self.losses}-{self.ties})"
+    
+    @property
+    def win_percentage(self):
+        """Win percentage counting ties as half a win"""
+        if self.games_played == 0:
+            return 0.0
+        return (self.wins + (self.ties * 0.5)) / self.games_played
+    
+    @classmethod
+    def before_game(cls, team, game):
+        """Latest running record for a team before the given game in its season"""
+        return cls.objects.filter(
+            team=team,
+            season=game.season,
+            game_date__lt=game.game_date,
+        ).order_by('-game_date').first()
+    
+    class Meta:
+        ordering = ['team', 'season', 'game_date']
+        unique_together = ['team', 'game']
+        indexes = [
+            models.Index(fields=['team', 'season', 'game_date']),
+        ]
+
+
+class MatchupRecord(models.Model):
+    """Cumulative head-to-head record of a team pair as of one of their meetings"""
+    # The pair is stored unordered: team_low always has the smaller id
+    team_low = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='+')
+    team_high = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='+')
+    game = models.OneToOneField(Game, on_delete=models.CASCADE, related_name='matchup_record')
+    game_date = models.DateTimeField()
+    
+    # Totals over every played meeting up to and including this one
+    team_low_wins = models.IntegerField(default=0)
+    team_high_wins = models.IntegerField(default=0)
+    ties = models.IntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.team_low} vs {self.team_high} through {self.game_date.strftime('%Y-%m-%d')}"
+    
+    def wins_for(self, team):
+        """Head-to-head wins for one side of the pair"""
+        return self.team_low_wins if team.id == self.team_low_id else self.team_high_wins
+    
+    @staticmethod
+    def pair(team_a_id, team_b_id):
+        """Order two team ids the way the pair is stored"""
+        return (team_a_id, team_b_id) if team_a_id < team_b_id else (team_b_id, team_a_id)
+    
+    @classmethod
+    def meetings(cls, team_a, team_b, before_date=None):
+        """Played meetings of two teams, most recent first"""
+        team_low_id, team_high_id = cls.pair(team_a.id, team_b.id)
+        records = cls.objects.filter(team_low_id=team_low_id, team_high_id=team_high_id)
+        if before_date:
+            records = records.filter(game_date__lt=before_date)
+        return records.order_by('-game_date')
+    
+    class Meta:
+        ordering = ['team_low', 'team_high', 'game_date']
+        indexes = [
+            models.Index(fields=['team_low', 'team_high', 'game_date']),
+        ]
+
+
+class SeasonWeek(models.Model):
+    """Kickoff window of one week of a season, derived from its games"""
+    season = models.IntegerField()
+    week = models.IntegerField()
+    first_kickoff = models.DateTimeField()
+    last_kickoff = models.DateTimeField()
+    rollover = models.DateTimeField()  # Tuesday after the last game, when the next week becomes current
+    game_count = models.IntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.season} Week {self.week}"
+    
+    class Meta:
+        ordering = ['season', 'week']
+        unique_together = ['season', 'week']
+
+
+class TeamAlias(models.Model):
+    """Another abbreviation a team appears under, such as a historical or ESPN-specific one"""
+    alias = models.CharField(max_length=10, unique=True)
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='aliases')
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.team}"
+    
+    class Meta:
+        ordering = ['alias']
+        verbose_name_plural = 'team aliases'
+
+
+class GameScoreEvent(models.Model):
+    """
+    One state of a game's scoreboard, appended each time it changes.
+
+    Rows are never updated. ``season`` is copied from the game so the log
+    can be read, archived or pruned one season at a time.
+    """
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='score_events')
+    season = models.SmallIntegerField()
+    recorded_at = models.DateTimeField()
+    home_score = models.PositiveSmallIntegerField()
+    away_score = models.PositiveSmallIntegerField()
+    is_live = models.BooleanField()
+    game_status = models.CharField(max_length=50, blank=True)
+    quarter = models.PositiveSmallIntegerField(null=True, blank=True)
+    time_remaining = models.CharField(max_length=20, blank=True)
+    
+    def __str__(self):
+        return f"{self.game_id} {self.away_score}-{self.home_score} at {self.recorded_at.isoformat()}"
+    
+    class Meta:
+        ordering = ['game', 'recorded_at', 'id']
+        indexes = [
+            # A game's timeline
+            models.Index(fields=['game', 'recorded_at'], name='scoreevent_game_time_idx'),
+            # Scoreboard replays and per-season archiving
+            models.Index(fields=['season', 'recorded_at'], name='scoreevent_season_time_idx'),
+        ]
+
+
+class Job(models.Model):
+    """A unit of background work queued from the admin and run by manage.py run_jobs"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+    
+    kind = models.CharField(max_length=50)  # A handler registered in football.jobs
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    
+    # Progress, reported by the handler while it runs
+    rows_processed = models.IntegerField(default=0)
+    rows_total = models.IntegerField(null=True, blank=True)
+    result = models.TextField(blank=True)  # Summary on success, traceback on failure
+    
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+    
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Workers claim the oldest queued job
+            models.Index(fields=['status', 'created_at'], name='job_status_created_idx'),
+        ]
+
+
+class ImportLedger(models.Model):
+    """Fingerprint of the last data imported for one week from one source; see football.ledger"""
+    source = models.CharField(max_length=50)  # e.g. "results", "espn:2", "load_correct_2025_schedule"
+    season = models.IntegerField()
+    week = models.IntegerField()
+    fingerprint = models.CharField(max_length=64)  # sha256 of the week's normalized games
+    games = models.IntegerField(default=0)
+    imported_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.source} {self.season} Week {self.week}"
+    
+    class Meta:
+        ordering = ['source', 'season', 'week']
+        unique_together = ['source', 'season', 'week']
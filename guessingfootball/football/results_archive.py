@@ -0,0 +1,261 @@
+import calendar
+import importlib.util
+import json
+import os
+import struct
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+import numpy as np
+from django.conf import settings
+from .ingest import BulkLoadSink
+from .teams import get_or_create_team
+
+# Columnar archive of the pre-ESPN seasons in results.py, one file per season.
+#
+# File layout:
+#   b'GFRA' | uint32 little-endian header length | JSON header | padding | columns
+# The header lists the team abbreviations (team ids are indexes into it),
+# the number of games and, for every column, its dtype and byte offset.
+# Columns start on 8-byte boundaries so each can be opened with numpy.memmap.
+#
+# Kickoffs are the naive wall-clock times of results.py stored as seconds
+# since the epoch; 0 means results.py has no date for the game.
+MAGIC = b'GFRA'
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+EPOCH = datetime(1970, 1, 1)
+
+COLUMNS = (
+    ('week', '<i2'),
+    ('away_team', '<i2'),
+    ('home_team', '<i2'),
+    ('away_score', '<i2'),
+    ('home_score', '<i2'),
+    ('kickoff', '<i4'),
+)
+
+
+def archive_dir():
+    return Path(settings.RESULTS_ARCHIVE_DIR)
+
+
+def archive_path(season, directory=None):
+    return Path(directory or archive_dir()) / f'results-{season}.gfra'
+
+
+def available_seasons(directory=None):
+    """Seasons with an archive file, oldest first"""
+    paths = Path(directory or archive_dir()).glob('results-*.gfra')
+    return sorted(int(path.stem.split('-', 1)[1]) for path in paths)
+
+
+def estimated_kickoff(season, week):
+    """Kickoff used for games results.py has no date for: Sunday 1pm, a week apart from September 1st"""
+    return datetime(season, 9, 1, 13, 0, 0) + timedelta(days=(week - 1) * 7)
+
+
+class SeasonArchive:
+    """
+    Read-only view of one season's archive.
+
+    Columns are numpy memmaps, so only the pages that are read are
+    loaded: ``archive['home_score']``, ``archive.column('week')``.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            magic, header_length = struct.unpack('<4sI', f.read(8))
+            if magic != MAGIC:
+                raise ValueError(f'{self.path} is not a results archive')
+            header = json.loads(f.read(header_length))
+        if header['version'] != FORMAT_VERSION:
+            raise ValueError(f'{self.path} has archive format {header["version"]}, expected {FORMAT_VERSION}')
+
+        self.season = header['season']
+        self.teams = header['teams']
+        self.games = header['games']
+        self._layout = header['columns']
+        self._columns = {}
+
+    def __len__(self):
+        return self.games
+
+    def column(self, name):
+        if name not in self._columns:
+            layout = self._layout[name]
+            if self.games == 0:
+                self._columns[name] = np.empty(0, dtype=layout['dtype'])
+            else:
+                self._columns[name] = np.memmap(
+                    self.path, dtype=layout['dtype'], mode='r', offset=layout['offset'], shape=(self.games,),
+                )
+        return self._columns[name]
+
+    __getitem__ = column
+
+    def weeks(self):
+        return [int(week) for week in np.unique(self.column('week'))]
+
+    def game_dates(self):
+        """Naive kickoff datetimes, estimated for games results.py has no date for"""
+        return [
+            EPOCH + timedelta(seconds=int(kickoff)) if kickoff
+            else estimated_kickoff(self.season, int(week))
+            for week, kickoff in zip(self.column('week'), self.column('kickoff'))
+        ]
+
+    def iter_games(self):
+        """Yield one dict per game: week, away/home team abbreviations and scores, game_date"""
+        columns = [self.column(name).tolist() for name, _ in COLUMNS[:5]]
+        for (week, away, home, away_score, home_score), game_date in zip(zip(*columns), self.game_dates()):
+            yield {
+                'week': week,
+                'away_team': self.teams[away],
+                'home_team': self.teams[home],
+                'away_score': away_score,
+                'home_score': home_score,
+                'game_date': game_date,
+            }
+
+
+def open_season(season, directory=None):
+    return SeasonArchive(archive_path(season, directory))
+
+
+def _season_columns(season_data):
+    """(teams, column arrays, skipped games) for one season of results.py"""
+    teams = {}
+    rows = []
+    skipped = []
+    for week, week_games in enumerate(season_data, 1):
+        for game in week_games:
+            if len(game) not in (2, 3):
+                skipped.append(game)
+                continue
+            (away, away_score), (home, home_score) = game[0], game[1]
+            # Games not played yet are stored with 'null' scores
+            if not all(isinstance(score, int) for score in (away_score, home_score)):
+                skipped.append(game)
+                continue
+            kickoff = calendar.timegm(tuple(game[2]) + (0, 0, 0)) if len(game) == 3 else 0
+            away_id = teams.setdefault(away, len(teams))
+            home_id = teams.setdefault(home, len(teams))
+            rows.append((week, away_id, home_id, away_score, home_score, kickoff))
+
+    columns = {
+        name: np.array([row[index] for row in rows], dtype=dtype)
+        for index, (name, dtype) in enumerate(COLUMNS)
+    }
+    return list(teams), columns, skipped
+
+
+def write_season(path, season, teams, columns):
+    """Write one archive file, replacing any existing one atomically"""
+    games = len(next(iter(columns.values())))
+
+    # The header holds the column offsets, which depend on the header's own
+    # length; lay it out until the offsets stop moving
+    layout = {name: {'dtype': dtype, 'offset': 0} for name, dtype in COLUMNS}
+    while True:
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'season': season,
+            'games': games,
+            'teams': teams,
+            'columns': layout,
+        }).encode()
+        offset = 8 + len(header)
+        placed = {}
+        for name, dtype in COLUMNS:
+            offset += -offset % ALIGNMENT
+            placed[name] = {'dtype': dtype, 'offset': offset}
+            offset += games * np.dtype(dtype).itemsize
+        if placed == layout:
+            break
+        layout = placed
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(struct.pack('<4sI', MAGIC, len(header)) + header)
+        for name, dtype in COLUMNS:
+            f.write(b'\0' * (layout[name]['offset'] - f.tell()))
+            f.write(columns[name].astype(dtype).tobytes())
+    os.replace(tmp, path)
+
+
+def load_results_module(source):
+    """Import results.py from a path without putting its directory on sys.path"""
+    spec = importlib.util.spec_from_file_location('results', source)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def results_source(source=None):
+    return Path(source or Path(settings.BASE_DIR) / 'results.py')
+
+
+def build_archive(source=None, directory=None, seasons=None):
+    """
+    Compile results.py into one archive file per season, only ``seasons`` if given.
+
+    Games whose entry is malformed or has no scores are skipped.
+    Returns {season: (games written, skipped entries)}.
+    """
+    results = load_results_module(results_source(source))
+    built = {}
+    for name, season_data in vars(results).items():
+        if not (name.startswith('results') and name[len('results'):].isdigit()):
+            continue
+        season = int(name[len('results'):])
+        if seasons is not None and season not in seasons:
+            continue
+        teams, columns, skipped = _season_columns(season_data)
+        write_season(archive_path(season, directory), season, teams, columns)
+        built[season] = (len(columns['week']), len(skipped))
+    return dict(sorted(built.items()))
+
+
+def stale_seasons(seasons, source=None, directory=None):
+    """Seasons whose archive file is missing or older than results.py"""
+    source_mtime = results_source(source).stat().st_mtime
+    stale = []
+    for season in seasons:
+        path = archive_path(season, directory)
+        if not path.exists() or path.stat().st_mtime < source_mtime:
+            stale.append(season)
+    return stale
+
+
+def ensure_archive(seasons, source=None, directory=None):
+    """Rebuild the archive of the seasons that are stale; returns build_archive()'s result"""
+    stale = stale_seasons(seasons, source, directory)
+    return build_archive(source, directory, stale) if stale else {}
+
+
+def bulk_load_seasons(seasons, directory=None, batch_size=None):
+    """
+    Insert the archived games of some seasons with BulkLoadSink.
+
+    Every team abbreviation is resolved once up front. Games already
+    stored are left alone. Returns the sink, whose ``received`` and
+    ``inserted`` count the games read and written.
+    """
+    archives = [open_season(season, directory) for season in seasons]
+    abbreviations = sorted({abbr for archive in archives for abbr in archive.teams})
+    teams = {abbr: get_or_create_team(abbr)[0] for abbr in abbreviations}
+
+    with BulkLoadSink(batch_size) as sink:
+        for archive in archives:
+            for game in archive.iter_games():
+                sink.add({
+                    **game,
+                    'season': archive.season,
+                    'home_team': teams[game['home_team']],
+                    'away_team': teams[game['away_team']],
+                })
+    return sink
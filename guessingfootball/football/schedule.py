@@ -0,0 +1,103 @@
+import time
+from datetime import datetime, timedelta
+from django.db.models import Count, Max, Min
+from .models import Game, SeasonWeek
+import pytz
+
+# Seconds a process keeps a season calendar before reading it again, so
+# schedule changes made by other processes are picked up
+CALENDAR_CACHE_SECONDS = 300
+
+_calendar_cache = {}
+
+
+def week_rollover(last_kickoff):
+    """The Tuesday after a week's last game, when the next week becomes current"""
+    # Most NFL weeks end on Sunday/Monday night
+    days_until_tuesday = (1 - last_kickoff.weekday() + 7) % 7  # 1 = Tuesday
+    if days_until_tuesday == 0:  # If it's already Tuesday
+        days_until_tuesday = 7  # Go to next Tuesday
+    return last_kickoff + timedelta(days=days_until_tuesday)
+
+
+def refresh_season_weeks(season, weeks=None):
+    """
+    Recalculate SeasonWeek rows for a season (or only some of its weeks) from Game.
+
+    Returns the number of weeks written.
+    """
+    games = Game.objects.filter(season=season)
+    stale = SeasonWeek.objects.filter(season=season)
+    if weeks is not None:
+        games = games.filter(week__in=weeks)
+        stale = stale.filter(week__in=weeks)
+
+    rows = games.order_by().values('week').annotate(
+        first_kickoff=Min('game_date'),
+        last_kickoff=Max('game_date'),
+        game_count=Count('id'),
+    )
+    season_weeks = [
+        SeasonWeek(
+            season=season,
+            week=row['week'],
+            first_kickoff=row['first_kickoff'],
+            last_kickoff=row['last_kickoff'],
+            rollover=week_rollover(row['last_kickoff']),
+            game_count=row['game_count'],
+        )
+        for row in rows
+    ]
+
+    # Weeks that no longer have any games are dropped
+    stale.exclude(week__in=[season_week.week for season_week in season_weeks]).delete()
+    SeasonWeek.objects.bulk_create(
+        season_weeks,
+        update_conflicts=True,
+        unique_fields=['season', 'week'],
+        update_fields=['first_kickoff', 'last_kickoff', 'rollover', 'game_count'],
+    )
+    invalidate_season_calendar(season)
+    return len(season_weeks)
+
+
+def invalidate_season_calendar(season=None):
+    """Drop this process's cached calendar for a season (or all seasons)"""
+    if season is None:
+        _calendar_cache.clear()
+    else:
+        _calendar_cache.pop(season, None)
+
+
+def get_season_calendar(season=2025):
+    """All SeasonWeek rows of a season, served from a process-level cache"""
+    cached = _calendar_cache.get(season)
+    if cached is not None and time.monotonic() - cached[0] < CALENDAR_CACHE_SECONDS:
+        return cached[1]
+
+    season_weeks = list(SeasonWeek.objects.filter(season=season).order_by('week'))
+    _calendar_cache[season] = (time.monotonic(), season_weeks)
+    return season_weeks
+
+
+def get_current_nfl_week(season=2025, now=None):
+    """Determine the current NFL week based on the current date"""
+    now = now or datetime.now(pytz.UTC)
+
+    # Regular season weeks only (exclude preseason week 0)
+    regular_weeks = [
+        season_week for season_week in get_season_calendar(season)
+        if 1 <= season_week.week <= 18
+    ]
+
+    # If no regular season games yet, default to Week 1
+    if not regular_weeks:
+        return 1
+
+    # The current week is the first one whose Tuesday rollover hasn't passed
+    for season_week in regular_weeks:
+        if now < season_week.rollover:
+            return season_week.week
+
+    # If we're past all weeks, return the last week
+    return regular_weeks[-1].week
@@ -0,0 +1,252 @@
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pytz
+from .completeness import expected_schedule
+from .models import Game, Team
+
+# Rules applied to a season's schedule by validate_schedule(). The season is
+# read with one query into numpy arrays (one element per game) and every rule
+# is a vectorized or grouped operation on them, so a season validates in
+# milliseconds.
+
+EASTERN = pytz.timezone('US/Eastern')
+EPOCH = datetime(1970, 1, 1)
+# Rest between two games of a team: shorter than MIN_REST is an error, and
+# two short rests (a Thursday game, say) in a row is flagged
+MIN_REST = timedelta(days=3, hours=12)
+SHORT_REST = timedelta(days=6)
+# Kickoffs outside these Eastern hours are unusual on any day
+EARLIEST_KICKOFF_HOUR = 9
+LATEST_KICKOFF_HOUR = 23
+# Most teams on a bye in one week
+MAX_TEAMS_ON_BYE = 6
+
+# Weekday numbers follow datetime.weekday(): Monday is 0
+KICKOFF_SLOTS = (
+    ('thursday_night', lambda day, hour: (day == 3) & (hour >= 19)),
+    ('saturday', lambda day, hour: day == 5),
+    ('sunday_early', lambda day, hour: (day == 6) & (hour < 16)),
+    ('sunday_late', lambda day, hour: (day == 6) & (hour >= 16) & (hour < 19)),
+    ('sunday_night', lambda day, hour: (day == 6) & (hour >= 19)),
+    ('monday_night', lambda day, hour: (day == 0) & (hour >= 19)),
+)
+
+
+def load_season(season):
+    """The season's games as columns: id, week, home, away (indexes into the teams playing that season) and kickoff seconds"""
+    rows = list(Game.objects.filter(season=season).order_by().values_list(
+        'id', 'week', 'home_team_id', 'away_team_id', 'game_date',
+    ))
+    # Only the teams with games this season: relocated franchises keep their old rows
+    team_ids = {row[2] for row in rows} | {row[3] for row in rows}
+    teams = dict(Team.objects.filter(id__in=team_ids).order_by('name').values_list('id', 'name'))
+    position = {team_id: index for index, team_id in enumerate(teams)}
+
+    count = len(rows)
+    columns = {
+        'id': np.fromiter((row[0] for row in rows), np.int64, count),
+        'week': np.fromiter((row[1] for row in rows), np.int16, count),
+        'home': np.fromiter((position[row[2]] for row in rows), np.int16, count),
+        'away': np.fromiter((position[row[3]] for row in rows), np.int16, count),
+        'kickoff': np.fromiter((int(row[4].timestamp()) for row in rows), np.int64, count),
+    }
+    return columns, list(teams.values())
+
+
+def _eastern_day_hour(kickoff):
+    """Eastern weekday and hour of UTC kickoff seconds; the offset is looked up once per distinct UTC day"""
+    days, inverse = np.unique(kickoff // 86400, return_inverse=True)
+    offsets = np.array([
+        EASTERN.utcoffset(EPOCH + timedelta(days=int(day), hours=12)).total_seconds()
+        for day in days
+    ], dtype=np.int64)
+    local = kickoff + offsets[inverse]
+    # 1970-01-01 was a Thursday (weekday 3)
+    return (local // 86400 + 3) % 7, (local % 86400) // 3600
+
+
+def _check(rule, issues, message, level='fail'):
+    return {'rule': rule, 'status': level if issues else 'pass', 'message': message, 'issues': issues}
+
+
+def validate_schedule(season):
+    """
+    Validate a season's schedule; returns a report dict.
+
+    ``checks`` holds one entry per rule with its ``status`` (pass,
+    warning or fail), a message and the offending games, teams or weeks.
+    ``summary`` holds per-week, per-team and per-slot counts.
+    """
+    started = time.perf_counter()
+    games, team_names = load_season(season)
+    expected_games, weeks = expected_schedule(season)
+    n_teams = len(team_names)
+    last_week = weeks[-1]
+
+    regular = (games['week'] >= weeks[0]) & (games['week'] <= last_week)
+    week = games['week'][regular]
+    home, away = games['home'][regular], games['away'][regular]
+    kickoff = games['kickoff'][regular]
+    # Each game once per team taking part
+    team = np.concatenate([home, away])
+    team_week = np.concatenate([week, week])
+    team_kickoff = np.concatenate([kickoff, kickoff])
+
+    checks = []
+
+    # Games per week, and the season total
+    week_counts = np.bincount(games['week'].clip(min=0), minlength=last_week + 1)
+    expected_total = expected_games * n_teams // 2
+    checks.append(_check(
+        'season_total',
+        [] if regular.sum() == expected_total else [{'games': int(regular.sum()), 'expected': expected_total}],
+        f'{int(regular.sum())} regular season games, {expected_total} expected',
+    ))
+    full_week = n_teams // 2
+    regular_counts = week_counts[weeks[0]:last_week + 1]
+    checks.append(_check(
+        'games_per_week',
+        [
+            {'week': int(w), 'games': int(c), 'most': full_week}
+            for w, c in zip(weeks, regular_counts) if c == 0 or c > full_week
+        ],
+        f'Every regular season week has between 1 and {full_week} games',
+    ))
+    checks.append(_check(
+        'short_weeks',
+        [
+            {'week': int(w), 'games': int(c), 'least': full_week - MAX_TEAMS_ON_BYE // 2}
+            for w, c in zip(weeks, regular_counts) if 0 < c < full_week - MAX_TEAMS_ON_BYE // 2
+        ],
+        f'No more than {MAX_TEAMS_ON_BYE} teams on a bye in a week',
+        level='warning',
+    ))
+    outside = games['week'][~regular]
+    checks.append(_check(
+        'weeks_outside_regular_season',
+        [{'week': int(w), 'games': int(c)} for w, c in zip(*np.unique(outside, return_counts=True))],
+        'Games outside the regular season weeks',
+        level='warning',
+    ))
+
+    # Games and home/away balance per team
+    totals = np.bincount(team, minlength=n_teams)
+    home_counts = np.bincount(home, minlength=n_teams)
+    away_counts = np.bincount(away, minlength=n_teams)
+    wrong_totals = np.flatnonzero(totals != expected_games)
+    checks.append(_check(
+        'team_totals',
+        [{'team': team_names[i], 'games': int(totals[i]), 'expected': expected_games} for i in wrong_totals],
+        f'Every team plays {expected_games} regular season games',
+    ))
+    unbalanced = np.flatnonzero(np.abs(home_counts - away_counts) > 1)
+    checks.append(_check(
+        'home_away_balance',
+        [{'team': team_names[i], 'home': int(home_counts[i]), 'away': int(away_counts[i])} for i in unbalanced],
+        'Home and away games differ by at most one',
+        level='warning',
+    ))
+
+    # Teams playing twice in a week, and bye weeks
+    keys, key_counts = np.unique(team.astype(np.int64) * 100 + team_week, return_counts=True)
+    double = keys[key_counts > 1]
+    checks.append(_check(
+        'double_booked',
+        [{'team': team_names[k // 100], 'week': int(k % 100)} for k in double],
+        'No team plays twice in a week',
+    ))
+    weeks_played = np.bincount(keys // 100, minlength=n_teams)
+    byes = len(weeks) - weeks_played
+    expected_byes = len(weeks) - expected_games
+    wrong_byes = np.flatnonzero(byes != expected_byes)
+    checks.append(_check(
+        'bye_weeks',
+        [{'team': team_names[i], 'byes': int(byes[i]), 'expected': expected_byes} for i in wrong_byes],
+        f'Every team has {expected_byes} bye week(s)',
+    ))
+
+    # The same pair meeting twice in a week, either way round
+    low, high = np.minimum(home, away).astype(np.int64), np.maximum(home, away).astype(np.int64)
+    pairs, pair_counts = np.unique((low * n_teams + high) * 100 + week, return_counts=True)
+    checks.append(_check(
+        'duplicate_matchups',
+        [
+            {'teams': [team_names[p // 100 // n_teams], team_names[p // 100 % n_teams]], 'week': int(p % 100)}
+            for p in pairs[pair_counts > 1]
+        ],
+        'No matchup is stored twice in a week',
+    ))
+
+    # Rest between consecutive games of each team
+    order = np.lexsort((team_kickoff, team))
+    sorted_team, sorted_kickoff, sorted_week = team[order], team_kickoff[order], team_week[order]
+    same_team = sorted_team[1:] == sorted_team[:-1]
+    rest = np.diff(sorted_kickoff)
+    too_short = np.flatnonzero(same_team & (rest < MIN_REST.total_seconds()))
+    short = same_team & (rest < SHORT_REST.total_seconds())
+    back_to_back = np.flatnonzero(short[1:] & short[:-1])
+    checks.append(_check(
+        'minimum_rest',
+        [
+            {'team': team_names[sorted_team[i]], 'week': int(sorted_week[i + 1]), 'rest_hours': round(float(rest[i]) / 3600, 1)}
+            for i in too_short
+        ],
+        f'At least {MIN_REST.total_seconds() / 86400:g} days between a team\'s games',
+    ))
+    checks.append(_check(
+        'back_to_back_short_rest',
+        [{'team': team_names[sorted_team[i]], 'weeks': [int(sorted_week[i + 1]), int(sorted_week[i + 2])]} for i in back_to_back],
+        f'No team gets less than {SHORT_REST.days} days of rest twice in a row',
+        level='warning',
+    ))
+
+    # Kickoff slots and times
+    day, hour = _eastern_day_hour(kickoff)
+    slots = {}
+    unslotted = np.ones(len(kickoff), dtype=bool)
+    for name, matches in KICKOFF_SLOTS:
+        in_slot = matches(day, hour)
+        slots[name] = int(in_slot.sum())
+        unslotted &= ~in_slot
+    slots['other'] = int(unslotted.sum())
+    unusual = np.flatnonzero((hour < EARLIEST_KICKOFF_HOUR) | (hour >= LATEST_KICKOFF_HOUR))
+    regular_ids = games['id'][regular]
+    checks.append(_check(
+        'kickoff_times',
+        [{'game': int(regular_ids[i]), 'week': int(week[i]), 'eastern_hour': int(hour[i])} for i in unusual],
+        f'Kickoffs between {EARLIEST_KICKOFF_HOUR}:00 and {LATEST_KICKOFF_HOUR}:00 Eastern',
+        level='warning',
+    ))
+
+    # Season window: September through January
+    window_start = datetime(season, 9, 1, tzinfo=pytz.UTC).timestamp()
+    window_end = datetime(season + 1, 2, 1, tzinfo=pytz.UTC).timestamp()
+    out_of_window = np.flatnonzero((kickoff < window_start) | (kickoff >= window_end))
+    checks.append(_check(
+        'season_window',
+        [{'game': int(regular_ids[i]), 'week': int(week[i])} for i in out_of_window],
+        f'Regular season games fall between September {season} and January {season + 1}',
+        level='warning',
+    ))
+
+    failed = [check['rule'] for check in checks if check['status'] == 'fail']
+    warnings = [check['rule'] for check in checks if check['status'] == 'warning']
+    return {
+        'season': season,
+        'games': int(len(games['id'])),
+        'regular_season_games': int(regular.sum()),
+        'status': 'fail' if failed else 'warning' if warnings else 'pass',
+        'failed': failed,
+        'warnings': warnings,
+        'summary': {
+            'games_per_week': {int(w): int(c) for w, c in enumerate(week_counts) if c},
+            'teams': {
+                team_names[i]: {'games': int(totals[i]), 'home': int(home_counts[i]), 'away': int(away_counts[i])}
+                for i in range(n_teams)
+            },
+            'kickoff_slots': slots,
+        },
+        'checks': checks,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,211 @@
+import threading
+from contextlib import contextmanager
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from . import live
+from .caching import bump_versions, season_scope, team_scope, week_scope, TEAMS_SCOPE
+from .models import Game, SeasonWeek, Team, TeamAlias
+from .schedule import refresh_season_weeks
+from .standings import (
+    RESULT_FIELDS, apply_game_write, rebuild_matchup_records, rebuild_team_game_records, rebuild_team_season_stats,
+)
+from .teams import invalidate_teams
+from .timeline import record_score_events
+from .utils import publish_live_games
+
+
+# Game fields the maintained tables, score log and page cache are derived from
+TRACKED_FIELDS = (*RESULT_FIELDS, 'week', 'is_live', 'game_status', 'current_quarter', 'time_remaining')
+SCHEDULE_FIELDS = ('season', 'week', 'game_date')
+
+# Seasons touched inside a deferred_refresh block, per thread
+_deferred = threading.local()
+
+
+def _state(values):
+    state = {field: values[field] for field in TRACKED_FIELDS}
+    if timezone.is_naive(state['game_date']):
+        # What saving the game stores
+        state['game_date'] = timezone.make_aware(state['game_date'])
+    return state
+
+
+def _current_state(game):
+    return _state({field: getattr(game, field) for field in TRACKED_FIELDS})
+
+
+def _stored_state(game):
+    """The game's fields as last read or written, or None when they aren't known"""
+    loaded = getattr(game, '_loaded_values', None)
+    if not loaded or any(field not in loaded for field in TRACKED_FIELDS):
+        return None
+    return _state(loaded)
+
+
+def _rebuild_team_aggregates(games):
+    """Recalculate the team and matchup rows of games written without a known previous state"""
+    team_seasons = {}
+    for game in games:
+        team_seasons.setdefault(game.season, set()).update({game.home_team_id, game.away_team_id})
+    for season, team_ids in team_seasons.items():
+        rebuild_team_season_stats(season, team_ids)
+        rebuild_team_game_records(season, team_ids)
+    rebuild_matchup_records({(game.home_team_id, game.away_team_id) for game in games})
+
+
+def _refresh_calendar(changes):
+    """Recalculate the SeasonWeek rows of the weeks games were scheduled into or out of"""
+    season_weeks = {}
+    for old, new in changes:
+        if old and new and all(old[field] == new[field] for field in SCHEDULE_FIELDS):
+            continue  # Score-only update
+        for state in (old, new):
+            if state:
+                season_weeks.setdefault(state['season'], set()).add(state['week'])
+    for season, weeks in season_weeks.items():
+        refresh_season_weeks(season, weeks)
+
+
+def _invalidate_pages(changes):
+    """Bump the page cache versions of every season, week and team the changes touch"""
+    season_weeks = set()
+    team_ids = set()
+    for old, new in changes:
+        for state in (old, new):
+            if state:
+                season_weeks.add((state['season'], state['week']))
+                team_ids |= {state['home_team_id'], state['away_team_id']}
+
+    scopes = [team_scope(name) for name in Team.objects.filter(id__in=team_ids).values_list('name', flat=True)]
+    for season, week in season_weeks:
+        scopes += [season_scope(season), week_scope(season, week)]
+    bump_versions(scopes)
+
+
+def refresh_derived_tables(games, created=False):
+    """
+    Bring the maintained tables, score log and page cache up to date after games are written.
+
+    Each game's change is worked out from the values it was read with
+    (Game.from_db) and only that difference is applied; games whose
+    tracked fields didn't change are skipped. ``created`` marks new
+    games. Called by the post_save handler, inside the saving
+    transaction, and directly by code that writes games with
+    bulk_create/bulk_update, which send no signals.
+    """
+    deferred_seasons = getattr(_deferred, 'seasons', None)
+    changes = []
+    changed_games = []
+    unknown = []
+    for game in games:
+        new = _current_state(game)
+        old = None if created else _stored_state(game)
+        if old == new:
+            continue
+        if deferred_seasons is not None:
+            deferred_seasons |= {state['season'] for state in (old, new) if state}
+        elif old is None and not created:
+            # Saved without being read first; its previous values are unknown
+            unknown.append(game)
+        else:
+            apply_game_write(game.pk, old, new)
+        changes.append((old, new))
+        changed_games.append(game)
+        # Later saves of this instance compare against what is now stored
+        game._loaded_values = new
+
+    if not changes or deferred_seasons is not None:
+        return
+    if unknown:
+        _rebuild_team_aggregates(unknown)
+    _refresh_calendar(changes)
+    score_events = record_score_events(changed_games)
+    _invalidate_pages(changes)
+    transaction.on_commit(live.broker.notify)
+    if score_events:
+        # A live scoreboard changed
+        transaction.on_commit(publish_live_games)
+
+
+def refresh_seasons(seasons):
+    """
+    Rebuild the maintained tables of whole seasons and invalidate their pages.
+
+    For bulk loads: one pass per season and one over every matchup is
+    cheaper than tracking thousands of individual games.
+    """
+    seasons = set(seasons)
+    if not seasons:
+        return
+    for season in seasons:
+        rebuild_team_season_stats(season)
+        rebuild_team_game_records(season)
+        refresh_season_weeks(season)
+    rebuild_matchup_records()
+
+    scopes = [team_scope(name) for name in Team.objects.values_list('name', flat=True)]
+    for season, week in SeasonWeek.objects.filter(season__in=seasons).values_list('season', 'week'):
+        scopes.append(week_scope(season, week))
+    bump_versions(scopes + [season_scope(season) for season in seasons])
+
+
+@contextmanager
+def deferred_refresh():
+    """
+    Hold back the per-game table updates and rebuild the touched seasons once on leaving the block.
+
+    For loads and deletes of many games, where refresh_seasons is
+    cheaper than applying every game on its own. The block runs in one
+    transaction; games written in it add nothing to the score log.
+    """
+    if getattr(_deferred, 'seasons', None) is not None:
+        # Nested: the outer block does the refresh
+        yield
+        return
+
+    _deferred.seasons = set()
+    try:
+        with transaction.atomic():
+            yield
+            seasons, _deferred.seasons = _deferred.seasons, None
+            refresh_seasons(seasons)
+    finally:
+        _deferred.seasons = None
+
+
+@receiver(post_save, sender=Game)
+def update_derived_tables(sender, instance, created=False, raw=False, **kwargs):
+    """Update the maintained team, matchup and calendar tables whenever a game is written"""
+    if raw:
+        return  # Fixture loading
+    refresh_derived_tables([instance], created)
+
+
+@receiver(post_delete, sender=Game)
+def remove_game_from_derived_tables(sender, instance, **kwargs):
+    """Take a deleted game out of the maintained team, matchup and calendar tables"""
+    old = _stored_state(instance) or _current_state(instance)
+    if getattr(_deferred, 'seasons', None) is not None:
+        _deferred.seasons.add(old['season'])
+        return
+    apply_game_write(instance.pk, old, None)
+    _refresh_calendar([(old, None)])
+    _invalidate_pages([(old, None)])
+    if old['is_live']:
+        transaction.on_commit(publish_live_games)
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def invalidate_team_pages(sender, instance, **kwargs):
+    """Team names and 2024 rankings appear on every public page"""
+    bump_versions([TEAMS_SCOPE])
+    invalidate_teams()
+
+
+@receiver(post_save, sender=TeamAlias)
+@receiver(post_delete, sender=TeamAlias)
+def invalidate_team_aliases(sender, instance, **kwargs):
+    invalidate_teams()
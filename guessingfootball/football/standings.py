@@ -0,0 +1,417 @@
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import Game, MatchupRecord, TeamGameRecord, TeamSeasonStats
+
+RECORD_FIELDS = ('scheduled', 'wins', 'losses', 'ties', 'points_for', 'points_against')
+
+# Game fields the team and matchup tables are derived from
+RESULT_FIELDS = ('season', 'game_date', 'home_team_id', 'away_team_id', 'home_score', 'away_score')
+
+
+def _side_rows(season, side, team_ids=None):
+    """Aggregate one side (home or away) of every game in a season per team"""
+    other = 'away' if side == 'home' else 'home'
+    team_score = F(f'{side}_score')
+    opponent_score = F(f'{other}_score')
+
+    # Unplayed games are stored as 0-0 and never count towards the record
+    played = ~Q(home_score=0, away_score=0)
+
+    games = Game.objects.filter(season=season)
+    if team_ids is not None:
+        games = games.filter(**{f'{side}_team__in': team_ids})
+
+    return games.order_by().values(
+        team_id=F(f'{side}_team')
+    ).annotate(
+        side=Value(side),
+        scheduled=Count('id'),
+        wins=Count('id', filter=played & Q(**{f'{side}_score__gt': opponent_score})),
+        losses=Count('id', filter=played & Q(**{f'{side}_score__lt': opponent_score})),
+        ties=Count('id', filter=played & Q(**{f'{side}_score': opponent_score})),
+        points_for=Coalesce(Sum(team_score, filter=played), Value(0)),
+        points_against=Coalesce(Sum(opponent_score, filter=played), Value(0)),
+    )
+
+
+def season_standings(season, team_ids=None):
+    """
+    Calculate W/L/T, points and games for every team in a season.
+
+    Home and away aggregates are combined with UNION ALL so the whole
+    league is computed in a single query regardless of the number of
+    teams or games. Returns a list of plain dicts keyed by ``team_id``,
+    including home_/away_ W/L/T splits.
+    """
+    home_rows = _side_rows(season, 'home', team_ids)
+    away_rows = _side_rows(season, 'away', team_ids)
+
+    standings = {}
+    for row in home_rows.union(away_rows, all=True):
+        totals = standings.setdefault(row['team_id'], {
+            'team_id': row['team_id'],
+            **{key: 0 for key in RECORD_FIELDS},
+            **{f'{side}_{key}': 0 for side in ('home', 'away') for key in ('wins', 'losses', 'ties')},
+        })
+        for key in RECORD_FIELDS:
+            totals[key] += row[key]
+        for key in ('wins', 'losses', 'ties'):
+            totals[f"{row['side']}_{key}"] += row[key]
+
+    for totals in standings.values():
+        totals['played'] = totals['wins'] + totals['losses'] + totals['ties']
+
+    return list(standings.values())
+
+
+def rebuild_team_season_stats(season, team_ids=None):
+    """
+    Recalculate TeamSeasonStats rows for a season.
+
+    With ``team_ids`` only those teams are refreshed. Game writes apply
+    their change with update_team_season_stats instead. Returns the
+    number of rows written.
+    """
+    rows = season_standings(season, team_ids)
+
+    stats = [
+        TeamSeasonStats(
+            team_id=row['team_id'],
+            season=season,
+            games_scheduled=row['scheduled'],
+            games_played=row['played'],
+            wins=row['wins'],
+            losses=row['losses'],
+            ties=row['ties'],
+            points_for=row['points_for'],
+            points_against=row['points_against'],
+            home_wins=row['home_wins'],
+            home_losses=row['home_losses'],
+            home_ties=row['home_ties'],
+            away_wins=row['away_wins'],
+            away_losses=row['away_losses'],
+            away_ties=row['away_ties'],
+        )
+        for row in rows
+    ]
+
+    # Teams that no longer have any games this season lose their row
+    stale = TeamSeasonStats.objects.filter(season=season).exclude(
+        team_id__in=[row['team_id'] for row in rows]
+    )
+    if team_ids is not None:
+        stale = stale.filter(team_id__in=team_ids)
+
+    with transaction.atomic():
+        stale.delete()
+        TeamSeasonStats.objects.bulk_create(
+            stats,
+            update_conflicts=True,
+            unique_fields=['team', 'season'],
+            update_fields=[
+                'games_scheduled', 'games_played', 'wins', 'losses', 'ties',
+                'points_for', 'points_against',
+                'home_wins', 'home_losses', 'home_ties',
+                'away_wins', 'away_losses', 'away_ties',
+                'last_updated',
+            ],
+        )
+    return len(stats)
+
+
+def rebuild_team_game_records(season, team_ids=None):
+    """
+    Recalculate the running TeamGameRecord rows for a season.
+
+    Each team's games are walked once in date order, so a whole season
+    is one read, one delete and one bulk insert. Returns the number of
+    rows written.
+    """
+    games = Game.objects.filter(season=season)
+    if team_ids is not None:
+        games = games.filter(Q(home_team__in=team_ids) | Q(away_team__in=team_ids))
+
+    running = {}
+    records = []
+    for game in games.order_by('game_date', 'id'):
+        for team_id, team_score, opponent_score in (
+            (game.home_team_id, game.home_score, game.away_score),
+            (game.away_team_id, game.away_score, game.home_score),
+        ):
+            if team_ids is not None and team_id not in team_ids:
+                continue
+
+            totals = running.setdefault(team_id, {
+                'games_played': 0, 'wins': 0, 'losses': 0, 'ties': 0,
+                'points_for': 0, 'points_against': 0,
+            })
+            # Unplayed games are stored as 0-0 and never count towards the record
+            if not (game.home_score == 0 and game.away_score == 0):
+                totals['games_played'] += 1
+                totals['points_for'] += team_score
+                totals['points_against'] += opponent_score
+                if team_score > opponent_score:
+                    totals['wins'] += 1
+                elif team_score < opponent_score:
+                    totals['losses'] += 1
+                else:
+                    totals['ties'] += 1
+
+            records.append(TeamGameRecord(
+                team_id=team_id,
+                game=game,
+                season=season,
+                game_date=game.game_date,
+                **totals,
+            ))
+
+    # Also catch rows left behind by games that moved from another season
+    stale = TeamGameRecord.objects.filter(Q(season=season) | Q(game__season=season))
+    if team_ids is not None:
+        stale = stale.filter(team_id__in=team_ids)
+
+    with transaction.atomic():
+        stale.delete()
+        TeamGameRecord.objects.bulk_create(records, batch_size=500)
+    return len(records)
+
+
+def rebuild_matchup_records(pairs=None):
+    """
+    Recalculate MatchupRecord rows for the given team id pairs (all pairs by default).
+
+    Every played meeting gets a row holding the cumulative series record
+    up to and including it, so the record before any date is the previous
+    row. Returns the number of rows written.
+    """
+    games = Game.objects.exclude(home_score=0, away_score=0)
+    stale = MatchupRecord.objects.all()
+    if pairs is not None:
+        pairs = {MatchupRecord.pair(team_a_id, team_b_id) for team_a_id, team_b_id in pairs}
+        if not pairs:
+            return 0
+        games_filter = Q()
+        stale_filter = Q()
+        for team_low_id, team_high_id in pairs:
+            games_filter |= Q(home_team=team_low_id, away_team=team_high_id)
+            games_filter |= Q(home_team=team_high_id, away_team=team_low_id)
+            stale_filter |= Q(team_low=team_low_id, team_high=team_high_id)
+        games = games.filter(games_filter)
+        # Also drop rows of these games left under a pair they no longer belong to
+        stale = stale.filter(stale_filter | Q(game__in=games))
+
+    running = {}
+    records = []
+    for game in games.order_by('game_date', 'id'):
+        team_low_id, team_high_id = MatchupRecord.pair(game.home_team_id, game.away_team_id)
+        totals = running.setdefault((team_low_id, team_high_id), {
+            'team_low_wins': 0, 'team_high_wins': 0, 'ties': 0,
+        })
+        if game.home_score == game.away_score:
+            totals['ties'] += 1
+        else:
+            winner_id = game.home_team_id if game.home_score > game.away_score else game.away_team_id
+            totals['team_low_wins' if winner_id == team_low_id else 'team_high_wins'] += 1
+
+        records.append(MatchupRecord(
+            team_low_id=team_low_id,
+            team_high_id=team_high_id,
+            game=game,
+            game_date=game.game_date,
+            **totals,
+        ))
+
+    with transaction.atomic():
+        stale.delete()
+        MatchupRecord.objects.bulk_create(records, batch_size=500)
+    return len(records)
+
+
+# A game write changes the tables by what the game added before and what
+# it adds now. The functions below take the game's RESULT_FIELDS before
+# and after the write as dicts (None for a created or deleted game) and
+# apply only that difference, so a score update touches the two teams'
+# rows and the rows that follow the game instead of rebuilding a season.
+
+def _is_played(game):
+    # Unplayed games are stored as 0-0 and never count towards the record
+    return not (game['home_score'] == 0 and game['away_score'] == 0)
+
+
+def _outcome(team_score, opponent_score):
+    if team_score > opponent_score:
+        return 'wins'
+    if team_score < opponent_score:
+        return 'losses'
+    return 'ties'
+
+
+def _sides(game):
+    """(side, team id, team score, opponent score) for both teams of a game"""
+    return (
+        ('home', game['home_team_id'], game['home_score'], game['away_score']),
+        ('away', game['away_team_id'], game['away_score'], game['home_score']),
+    )
+
+
+def _difference(new, old):
+    """Field by field new minus old, leaving out the fields that stay the same"""
+    change = {field: new.get(field, 0) - old.get(field, 0) for field in {*new, *old}}
+    return {field: value for field, value in change.items() if value}
+
+
+def _increment(rows, change):
+    if change:
+        rows.update(**{field: F(field) + value for field, value in change.items()})
+
+
+def _from_game(game_date, game_id, inclusive=True):
+    """Running rows of the game at (game_date, game_id) and the ones after it"""
+    same_date = {'game_id__gte' if inclusive else 'game_id__gt': game_id}
+    return Q(game_date__gt=game_date) | Q(game_date=game_date, **same_date)
+
+
+def _season_stats_totals(game):
+    """What a game adds to its teams' TeamSeasonStats rows, keyed by (team id, season)"""
+    totals = {}
+    if game is None:
+        return totals
+    for side, team_id, team_score, opponent_score in _sides(game):
+        row = {'games_scheduled': 1}
+        if _is_played(game):
+            outcome = _outcome(team_score, opponent_score)
+            row.update({
+                'games_played': 1, outcome: 1, f'{side}_{outcome}': 1,
+                'points_for': team_score, 'points_against': opponent_score,
+            })
+        totals[(team_id, game['season'])] = row
+    return totals
+
+
+def update_team_season_stats(old, new):
+    """Apply one game write to the TeamSeasonStats rows of its teams"""
+    old_totals = _season_stats_totals(old)
+    new_totals = _season_stats_totals(new)
+    for team_id, season in old_totals.keys() | new_totals.keys():
+        change = _difference(new_totals.get((team_id, season), {}), old_totals.get((team_id, season), {}))
+        if not change:
+            continue
+        rows = TeamSeasonStats.objects.filter(team_id=team_id, season=season)
+        updated = rows.update(last_updated=timezone.now(), **{
+            field: F(field) + value for field, value in change.items()
+        })
+        if not updated:
+            # No row yet (a team's first game, or a season loaded without its tables)
+            rebuild_team_season_stats(season, [team_id])
+        elif change.get('games_scheduled', 0) < 0:
+            # Teams that no longer have any games this season lose their row
+            rows.filter(games_scheduled__lte=0).delete()
+
+
+def _game_record_totals(game, team_id):
+    """What a game adds to a team's running TeamGameRecord totals"""
+    for side, side_team_id, team_score, opponent_score in _sides(game):
+        if side_team_id == team_id and _is_played(game):
+            return {
+                'games_played': 1, _outcome(team_score, opponent_score): 1,
+                'points_for': team_score, 'points_against': opponent_score,
+            }
+    return {}
+
+
+def update_team_game_records(game_id, old, new):
+    """Apply one game write to the running TeamGameRecord rows of its teams"""
+    old_teams = {old['home_team_id'], old['away_team_id']} if old else set()
+    new_teams = {new['home_team_id'], new['away_team_id']} if new else set()
+    same_slot = old and new and (old['season'], old['game_date']) == (new['season'], new['game_date'])
+
+    for team_id in old_teams | new_teams:
+        if same_slot and team_id in old_teams and team_id in new_teams:
+            # The game keeps its place in the team's season: shift its row and the later ones
+            rows = TeamGameRecord.objects.filter(team_id=team_id, season=new['season'])
+            change = _difference(_game_record_totals(new, team_id), _game_record_totals(old, team_id))
+            _increment(rows.filter(_from_game(new['game_date'], game_id)), change)
+            continue
+
+        if team_id in old_teams:
+            rows = TeamGameRecord.objects.filter(team_id=team_id, season=old['season'])
+            rows.filter(game_id=game_id).delete()
+            removed = _game_record_totals(old, team_id)
+            _increment(rows.filter(_from_game(old['game_date'], game_id, inclusive=False)),
+                       {field: -value for field, value in removed.items()})
+
+        if team_id in new_teams:
+            rows = TeamGameRecord.objects.filter(team_id=team_id, season=new['season'])
+            added = _game_record_totals(new, team_id)
+            previous = rows.exclude(_from_game(new['game_date'], game_id)).order_by('-game_date', '-game_id').first()
+            _increment(rows.filter(_from_game(new['game_date'], game_id, inclusive=False)), added)
+            TeamGameRecord.objects.create(
+                team_id=team_id,
+                game_id=game_id,
+                season=new['season'],
+                game_date=new['game_date'],
+                **{
+                    field: getattr(previous, field, 0) + added.get(field, 0)
+                    for field in ('games_played', 'wins', 'losses', 'ties', 'points_for', 'points_against')
+                },
+            )
+
+
+def _matchup_totals(game):
+    """The team pair of a played game and what the game adds to its series record"""
+    team_low_id, team_high_id = MatchupRecord.pair(game['home_team_id'], game['away_team_id'])
+    if game['home_score'] == game['away_score']:
+        return (team_low_id, team_high_id), {'ties': 1}
+    winner_id = game['home_team_id'] if game['home_score'] > game['away_score'] else game['away_team_id']
+    return (team_low_id, team_high_id), {'team_low_wins' if winner_id == team_low_id else 'team_high_wins': 1}
+
+
+def update_matchup_records(game_id, old, new):
+    """Apply one game write to the MatchupRecord rows of its team pair"""
+    old = old if old and _is_played(old) else None
+    new = new if new and _is_played(new) else None
+    if old is None and new is None:
+        return
+
+    if old and new and _matchup_totals(old)[0] == _matchup_totals(new)[0] and old['game_date'] == new['game_date']:
+        (team_low_id, team_high_id), old_totals = _matchup_totals(old)
+        rows = MatchupRecord.objects.filter(team_low_id=team_low_id, team_high_id=team_high_id)
+        _increment(rows.filter(_from_game(new['game_date'], game_id)), _difference(_matchup_totals(new)[1], old_totals))
+        return
+
+    if old:
+        (team_low_id, team_high_id), removed = _matchup_totals(old)
+        rows = MatchupRecord.objects.filter(team_low_id=team_low_id, team_high_id=team_high_id)
+        MatchupRecord.objects.filter(game_id=game_id).delete()
+        _increment(rows.filter(_from_game(old['game_date'], game_id, inclusive=False)),
+                   {field: -value for field, value in removed.items()})
+
+    if new:
+        (team_low_id, team_high_id), added = _matchup_totals(new)
+        rows = MatchupRecord.objects.filter(team_low_id=team_low_id, team_high_id=team_high_id)
+        previous = rows.exclude(_from_game(new['game_date'], game_id)).order_by('-game_date', '-game_id').first()
+        _increment(rows.filter(_from_game(new['game_date'], game_id, inclusive=False)), added)
+        MatchupRecord.objects.create(
+            team_low_id=team_low_id,
+            team_high_id=team_high_id,
+            game_id=game_id,
+            game_date=new['game_date'],
+            **{
+                field: getattr(previous, field, 0) + added.get(field, 0)
+                for field in ('team_low_wins', 'team_high_wins', 'ties')
+            },
+        )
+
+
+def apply_game_write(game_id, old, new):
+    """
+    Update TeamSeasonStats, TeamGameRecord and MatchupRecord for one game write.
+
+    ``old`` and ``new`` hold the game's RESULT_FIELDS before and after
+    it (None when the game is created or deleted).
+    """
+    update_team_season_stats(old, new)
+    update_team_game_records(game_id, old, new)
+    update_matchup_records(game_id, old, new)
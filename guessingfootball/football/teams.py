@@ -0,0 +1,91 @@
+import time
+from .models import Team, TeamAlias
+
+# Seconds a process keeps its team index before reading it again, so teams
+# and aliases added by other processes are picked up
+TEAM_CACHE_SECONDS = 300
+
+# Abbreviations used by ESPN or older seasons, and the team they belong to.
+# These are only suggestions: resolving goes through TeamAlias rows, which
+# `import_teams --default-aliases` creates from this table.
+DEFAULT_ALIASES = {
+    'WSH': 'WAS',
+    'LAR': 'LA',
+    'STL': 'LA',
+    'OAK': 'LV',
+    'SD': 'LAC',
+    'JAC': 'JAX',
+}
+
+_team_index = {}
+
+
+def invalidate_teams():
+    """Drop this process's team index; called when a Team or TeamAlias is written"""
+    _team_index.clear()
+
+
+def _get_index():
+    if _team_index and time.monotonic() - _team_index['loaded_at'] < TEAM_CACHE_SECONDS:
+        return _team_index
+
+    teams = {team.name: team for team in Team.objects.all()}
+    teams_by_id = {team.id: team for team in teams.values()}
+    _team_index.update(
+        loaded_at=time.monotonic(),
+        teams=teams,
+        aliases={
+            alias: teams_by_id[team_id].name
+            for alias, team_id in TeamAlias.objects.values_list('alias', 'team_id')
+            if team_id in teams_by_id
+        },
+    )
+    return _team_index
+
+
+def canonical_abbr(abbr):
+    """
+    Our abbreviation for a team given any of its aliases.
+
+    A team stored under the abbreviation itself wins over an alias, so
+    games already filed under an old abbreviation stay with that team.
+    """
+    index = _get_index()
+    if abbr in index['teams']:
+        return abbr
+    return index['aliases'].get(abbr, abbr)
+
+
+def get_team(abbr):
+    """The Team for an abbreviation or alias, or None; answered from memory"""
+    return _get_index()['teams'].get(canonical_abbr(abbr))
+
+
+def get_or_create_team(abbr, defaults=None):
+    """Like Team.objects.get_or_create(name=...) but resolving aliases and only querying for new teams"""
+    team = get_team(abbr)
+    if team is not None:
+        return team, False
+
+    team, created = Team.objects.get_or_create(name=canonical_abbr(abbr), defaults=defaults or {})
+    _get_index()['teams'][team.name] = team
+    return team, created
+
+
+def ensure_default_aliases():
+    """
+    Create the DEFAULT_ALIASES rows whose team exists; returns the number created.
+
+    An abbreviation that is itself a stored team gets no alias: that team
+    keeps resolving to itself anyway.
+    """
+    teams = Team.objects.in_bulk(set(DEFAULT_ALIASES.values()), field_name='name')
+    existing = set(TeamAlias.objects.values_list('alias', flat=True))
+    existing |= set(Team.objects.filter(name__in=DEFAULT_ALIASES).values_list('name', flat=True))
+    aliases = TeamAlias.objects.bulk_create([
+        TeamAlias(alias=alias, team=teams[name])
+        for alias, name in DEFAULT_ALIASES.items()
+        if name in teams and alias not in existing
+    ])
+    invalidate_teams()  # bulk_create sends no post_save
+    return len(aliases)
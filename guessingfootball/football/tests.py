@@ -1,3 +1,1208 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import re
+import tempfile
+from datetime import date, datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+import requests
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from football import backfill, espn, jobs, live, results_archive
+from football.espn_cache import ResponseCache, cache_key, query_is_final
+from football.espn_standin import StandIn, fixture_name, start_server
+from football.ingest import BulkLoadSink, DryRunSink, Sink, apply_game_updates, drain
+from football.ledger import import_weeks
+from football.live import LiveScoreBroker
+from football.management.commands import run_live_poller
+from football.models import (
+    Game, GameScoreEvent, ImportLedger, Job, MatchupRecord, SeasonWeek, Team, TeamAlias, TeamGameRecord,
+    TeamSeasonStats,
+)
+from football.schedule import get_current_nfl_week, invalidate_season_calendar
+from football.schedule_validation import EASTERN, validate_schedule
+from football.standings import (
+    rebuild_matchup_records, rebuild_team_game_records, rebuild_team_season_stats, season_standings,
+)
+from football.teams import ensure_default_aliases, get_or_create_team, get_team, invalidate_teams
+from football.timeline import game_timeline, record_score_events, scoreboard_at, scoring_plays
+from football.utils import check_live_games_exist, get_live_snapshot
 
-# Create your tests here.
+
+def kickoff(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+def game_record(home, away, week, game_date, home_score=0, away_score=0, **fields):
+    return {
+        'home_team': home,
+        'away_team': away,
+        'week': week,
+        'game_date': game_date,
+        'home_score': home_score,
+        'away_score': away_score,
+        'is_live': False,
+        'game_status': '',
+        'current_quarter': None,
+        'time_remaining': '',
+        **fields,
+    }
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def table_rows(model, *fields):
+    return sorted(model.objects.values_list(*fields))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DerivedTableTestCase(TestCase):
+    def setUp(self):
+        self.ne, self.nyj, self.mia = (Team.objects.create(name=name) for name in ('NE', 'NYJ', 'MIA'))
+
+    def create_games(self):
+        return [
+            Game.objects.create(
+                home_team=home, away_team=away, home_score=home_score, away_score=away_score,
+                game_date=game_date, week=week, season=2018,
+            )
+            for home, away, home_score, away_score, game_date, week in (
+                (self.ne, self.nyj, 24, 10, kickoff(2018, 9, 9, 17), 1),
+                (self.mia, self.ne, 20, 17, kickoff(2018, 9, 16, 17), 2),
+                (self.nyj, self.ne, 0, 0, kickoff(2018, 9, 23, 17), 3),
+            )
+        ]
+
+    def rewrite_games(self):
+        """Score, reschedule, re-pair and delete games the way corrections and live updates do"""
+        win, loss, unplayed = self.create_games()
+        Game.objects.create(
+            home_team=self.ne, away_team=self.mia, home_score=21, away_score=21,
+            game_date=kickoff(2019, 9, 8, 17), week=1, season=2019,
+        )
+        unplayed.home_score, unplayed.away_score = 13, 7
+        unplayed.save()
+        win.home_score = 3
+        win.save()
+        loss = Game.objects.get(pk=loss.pk)
+        loss.game_date = kickoff(2018, 9, 30, 17)
+        loss.week = 4
+        loss.save()
+        unplayed.home_team, unplayed.away_team = self.mia, self.nyj
+        unplayed.save()
+        loss.season = 2019
+        loss.save()
+        win.delete()
+
+
+class SeasonStandingsTests(DerivedTableTestCase):
+    def test_one_query_for_the_league(self):
+        self.create_games()
+        with self.assertNumQueries(1):
+            standings = {row['team_id']: row for row in season_standings(2018)}
+        ne = standings[self.ne.id]
+        self.assertEqual(
+            (ne['scheduled'], ne['played'], ne['wins'], ne['losses'], ne['ties']),
+            (3, 2, 1, 1, 0),
+        )
+        self.assertEqual((ne['points_for'], ne['points_against'], ne['home_wins'], ne['away_losses']), (41, 30, 1, 1))
+        self.assertEqual((standings[self.nyj.id]['played'], standings[self.mia.id]['home_wins']), (1, 1))
+
+class QueryPlanTests(DerivedTableTestCase):
+    def test_view_queries_use_indexes(self):
+        self.create_games()
+        out = StringIO()
+        call_command('explain_queries', season=2018, team='NE', stdout=out)
+        self.assertIn('No full table scans in 11 queries', out.getvalue())
+
+class TeamSeasonStatsTests(DerivedTableTestCase):
+    def stats(self, team):
+        return TeamSeasonStats.objects.get(team=team, season=2018)
+
+    def test_team_season_stats(self):
+        self.create_games()
+        stats = self.stats(self.ne)
+        self.assertEqual(
+            (stats.games_scheduled, stats.games_played, stats.wins, stats.losses, stats.ties),
+            (3, 2, 1, 1, 0),
+        )
+        self.assertEqual((stats.points_for, stats.points_against), (41, 30))
+        self.assertEqual((stats.home_wins, stats.away_losses), (1, 1))
+
+    def test_scores_and_deletes_update_stats(self):
+        _, loss, unplayed = self.create_games()
+        unplayed.home_score, unplayed.away_score = 13, 7
+        unplayed.save()
+        self.assertEqual((self.stats(self.ne).losses, self.stats(self.nyj).wins), (2, 1))
+
+        loss.delete()
+        self.assertEqual(self.stats(self.ne).games_scheduled, 2)
+        self.assertFalse(TeamSeasonStats.objects.filter(team=self.mia).exists())
+
+    def test_changes_match_a_rebuild(self):
+        self.rewrite_games()
+        fields = ('team', 'season', 'games_scheduled', 'games_played', 'wins', 'losses', 'ties',
+                  'points_for', 'points_against', 'home_wins', 'home_losses', 'home_ties',
+                  'away_wins', 'away_losses', 'away_ties')
+        maintained = table_rows(TeamSeasonStats, *fields)
+        for season in (2018, 2019):
+            rebuild_team_season_stats(season)
+        self.assertEqual(maintained, table_rows(TeamSeasonStats, *fields))
+
+    def test_queryset_delete(self):
+        self.create_games()
+        Game.objects.filter(week__lte=2).delete()
+        self.assertEqual(self.stats(self.ne).games_scheduled, 1)
+        self.assertFalse(TeamSeasonStats.objects.filter(team=self.mia).exists())
+
+    def test_unchanged_save_only_writes_the_game(self):
+        game = Game.objects.get(pk=self.create_games()[0].pk)
+        with self.assertNumQueries(1):
+            game.save()
+
+    def test_failed_update_rolls_back_the_game(self):
+        game = self.create_games()[0]
+        game.home_score = 30
+        with mock.patch('football.signals.record_score_events', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                game.save()
+        self.assertEqual(Game.objects.get(pk=game.pk).home_score, 24)
+        self.assertEqual(self.stats(self.ne).points_for, 41)
+
+
+class TeamGameRecordTests(DerivedTableTestCase):
+    def test_record_before_game(self):
+        win, loss, unplayed = self.create_games()
+        record = TeamGameRecord.before_game(self.ne, unplayed)
+        self.assertEqual(record.game, loss)
+        self.assertEqual((record.games_played, record.wins, record.losses), (2, 1, 1))
+        self.assertIsNone(TeamGameRecord.before_game(self.ne, win))
+
+    def test_score_update_shifts_later_records(self):
+        win, loss, unplayed = self.create_games()
+        win.home_score = 7
+        win.save()
+        records = TeamGameRecord.objects.filter(team=self.ne, season=2018).order_by('game_date')
+        self.assertEqual([(record.wins, record.losses) for record in records], [(0, 1), (0, 2), (0, 2)])
+        self.assertEqual([record.points_for for record in records], [7, 24, 24])
+
+    def test_changes_match_a_rebuild(self):
+        self.rewrite_games()
+        fields = ('team', 'game', 'season', 'game_date', 'games_played', 'wins', 'losses', 'ties',
+                  'points_for', 'points_against')
+        maintained = table_rows(TeamGameRecord, *fields)
+        for season in (2018, 2019):
+            rebuild_team_game_records(season)
+        self.assertEqual(maintained, table_rows(TeamGameRecord, *fields))
+
+class MatchupRecordTests(DerivedTableTestCase):
+    def test_meetings(self):
+        win, _, unplayed = self.create_games()
+        # The unplayed meeting isn't part of the series yet
+        self.assertEqual([record.game for record in MatchupRecord.meetings(self.nyj, self.ne)], [win])
+
+        unplayed.home_score, unplayed.away_score = 13, 7
+        unplayed.save()
+        latest = MatchupRecord.meetings(self.ne, self.nyj).first()
+        self.assertEqual(latest.game, unplayed)
+        self.assertEqual((latest.wins_for(self.ne), latest.wins_for(self.nyj), latest.ties), (1, 1, 0))
+        self.assertEqual(MatchupRecord.meetings(self.ne, self.nyj, before_date=unplayed.game_date).get().game, win)
+
+    def test_changes_match_a_rebuild(self):
+        self.rewrite_games()
+        fields = ('team_low', 'team_high', 'game', 'game_date', 'team_low_wins', 'team_high_wins', 'ties')
+        maintained = table_rows(MatchupRecord, *fields)
+        rebuild_matchup_records()
+        self.assertEqual(maintained, table_rows(MatchupRecord, *fields))
+
+class SeasonWeekTests(DerivedTableTestCase):
+    def setUp(self):
+        super().setUp()
+        # The calendar cache is per process and outlives each test's rollback
+        invalidate_season_calendar()
+        self.addCleanup(invalidate_season_calendar)
+
+    def test_season_weeks(self):
+        _, loss, _ = self.create_games()
+        week = SeasonWeek.objects.get(season=2018, week=1)
+        self.assertEqual((week.first_kickoff, week.game_count), (kickoff(2018, 9, 9, 17), 1))
+        self.assertEqual(week.rollover, kickoff(2018, 9, 11, 17))
+
+        # Moving a week's only game drops that week
+        loss.week = 1
+        loss.save()
+        self.assertEqual(
+            list(SeasonWeek.objects.filter(season=2018).values_list('week', 'game_count')),
+            [(1, 2), (3, 1)],
+        )
+
+    def test_current_week(self):
+        self.create_games()
+        self.assertEqual(get_current_nfl_week(2018, now=kickoff(2018, 8, 1)), 1)
+        self.assertEqual(get_current_nfl_week(2018, now=kickoff(2018, 9, 12)), 2)
+        self.assertEqual(get_current_nfl_week(2018, now=kickoff(2019, 1, 1)), 3)
+
+    def test_calendar_is_cached_until_the_schedule_changes(self):
+        win, _, _ = self.create_games()
+        get_current_nfl_week(2018, now=kickoff(2018, 9, 12))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_current_nfl_week(2018, now=kickoff(2018, 9, 12)), 2)
+
+        win.game_date = kickoff(2018, 9, 13, 17)
+        win.save()
+        self.assertEqual(get_current_nfl_week(2018, now=kickoff(2018, 9, 12)), 1)
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class WeekDetailTests(TestCase):
+    def schedule(self, home, away, week):
+        # Page versions are bumped on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            Game.objects.create(
+                home_team=Team.objects.get_or_create(name=home, defaults={'conference': 'AFC', 'division': 'East'})[0],
+                away_team=Team.objects.get_or_create(name=away, defaults={'conference': 'AFC', 'division': 'East'})[0],
+                home_score=0, away_score=0, game_date=kickoff(2025, 9, 7 * week, 17), week=week, season=2025,
+            )
+
+    def bye_teams(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('week_detail', args=[1]))
+        cards = re.findall(r'class="bye-team-card">\s*<span class="team-logo (\w+)">', response.content.decode())
+        return cards, len(queries)
+
+    def test_bye_teams(self):
+        self.schedule('NE', 'NYJ', 1)
+        self.schedule('MIA', 'BUF', 2)
+        # No 2025 games at all, so not a 2025 team
+        Team.objects.create(name='OAK')
+        self.assertEqual(self.bye_teams()[0], ['BUF', 'MIA'])
+
+    def test_query_count_does_not_grow_with_bye_teams(self):
+        self.schedule('NE', 'NYJ', 1)
+        self.schedule('MIA', 'BUF', 2)
+        _, queries = self.bye_teams()
+        self.schedule('KC', 'DEN', 2)
+        self.schedule('LAC', 'LV', 2)
+        bye_teams, more_queries = self.bye_teams()
+        self.assertEqual((len(bye_teams), more_queries), (6, queries))
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PageCacheTests(TestCase):
+    def setUp(self):
+        invalidate_season_calendar()
+        self.addCleanup(invalidate_season_calendar)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.game = Game.objects.create(
+                home_team=Team.objects.create(name='NE'), away_team=Team.objects.create(name='NYJ'),
+                home_score=0, away_score=0, game_date=kickoff(2025, 9, 7, 17), week=1, season=2025,
+            )
+        self.url = reverse('week_detail', args=[1])
+
+    def test_anonymous_get_is_served_without_queries(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+
+    def test_game_write_invalidates_the_page(self):
+        self.client.get(self.url)
+        self.game.home_score = 38
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.game.save()
+        # Until the write commits the cached page is still served
+        with self.assertNumQueries(0):
+            self.assertNotContains(self.client.get(self.url), '38')
+
+        for callback in callbacks:
+            callback()
+        self.assertContains(self.client.get(self.url), '38')
+
+    def test_logged_in_users_get_a_fresh_render(self):
+        self.client.get(self.url)
+        self.client.force_login(User.objects.create_user('fan', 'fan@example.com', 'password'))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertTrue(queries)
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ApiConditionalGetTests(TestCase):
+    def setUp(self):
+        self.game = Game.objects.create(
+            home_team=Team.objects.create(name='NE'), away_team=Team.objects.create(name='NYJ'),
+            home_score=0, away_score=0, game_date=kickoff(2025, 9, 7, 17), week=1, season=2025,
+        )
+
+    def assertRevalidates(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.game.home_score = 7
+        self.game.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_scoreboard(self):
+        self.assertRevalidates(reverse('api_scoreboard', args=[2025, 1]))
+
+    def test_team_records(self):
+        self.assertRevalidates(reverse('api_team_records', args=[2025]))
+
+    def test_game_detail(self):
+        self.assertRevalidates(reverse('api_game_detail', args=[self.game.id]))
+
+    def test_responses_must_be_revalidated(self):
+        response = self.client.get(reverse('api_scoreboard', args=[2025, 1]))
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertEqual(response.json()['games'][0]['id'], self.game.id)
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class LiveScoreBrokerTests(TestCase):
+    def setUp(self):
+        self.ne, self.nyj = Team.objects.create(name='NE'), Team.objects.create(name='NYJ')
+        self.broker = LiveScoreBroker()
+        games, self.cursor = live._fetch_games()
+        self.broker._state = {game['id']: game for game in games}
+
+    def poll(self):
+        games, self.cursor = live._fetch_games(self.cursor, list(self.broker._state))
+        return self.broker._changes(games)
+
+    def create_game(self, **fields):
+        return Game.objects.create(
+            home_team=self.ne, away_team=self.nyj, home_score=0, away_score=0,
+            game_date=kickoff(2025, 9, 7, 17), week=1, season=2025, **fields,
+        )
+
+    def test_schedule_write_sends_nothing(self):
+        self.create_game()
+        Game.objects.create(
+            home_team=self.nyj, away_team=self.ne, home_score=24, away_score=10,
+            game_date=kickoff(2024, 9, 8, 17), week=1, season=2024,
+        )
+        self.assertEqual(self.poll(), [])
+        self.assertEqual(self.broker._state, {})
+
+    def test_live_game_is_diffed_until_it_ends(self):
+        game = self.create_game()
+        game.is_live, game.game_status, game.current_quarter = True, 'In Progress', 1
+        game.save()
+        self.assertEqual(self.poll()[0]['is_live'], True)
+
+        game.home_score = 7
+        game.save()
+        self.assertEqual(self.poll(), [{'id': game.id, 'home_score': 7}])
+
+        game.is_live, game.game_status = False, 'Final'
+        game.save()
+        self.assertEqual(self.poll(), [{'id': game.id, 'is_live': False, 'status': 'Final'}])
+        self.assertNotIn(game.id, self.broker._state)
+
+        # A correction after the final whistle isn't streamed
+        game.home_score = 10
+        game.save()
+        self.assertEqual(self.poll(), [])
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class EspnStandInTests(TestCase):
+    def setUp(self):
+        ne, nyj = Team.objects.create(name='NE'), Team.objects.create(name='NYJ')
+        for home, away, home_score, away_score, day in ((ne, nyj, 24, 10, 8), (nyj, ne, 0, 0, 15)):
+            Game.objects.create(
+                home_team=home, away_team=away, home_score=home_score, away_score=away_score,
+                game_date=kickoff(2024, 9, day, 17), week=1 if day == 8 else 2, season=2024,
+            )
+
+    def serve(self, standin):
+        server, url = start_server(standin)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return url
+
+    def test_fixtures_are_served_with_etags(self):
+        params = {'dates': '2024', 'seasontype': '2', 'week': '1'}
+        with tempfile.TemporaryDirectory() as fixtures:
+            Path(fixtures, fixture_name(params)).write_text(json.dumps(scoreboard_payload()))
+            standin = StandIn(fixtures=fixtures)
+            url = self.serve(standin)
+
+            first = requests.get(url, params=params, timeout=5)
+            self.assertEqual(first.json(), scoreboard_payload())
+            self.assertIn('Last-Modified', first.headers)
+            again = requests.get(url, params=params, headers={'If-None-Match': first.headers['ETag']}, timeout=5)
+        self.assertEqual((again.status_code, again.content), (304, b''))
+        self.assertEqual((standin.requests, standin.not_modified, standin.events_served), (2, 1, 1))
+
+    def test_snapshot_answers_week_queries(self):
+        standin = StandIn(snapshot=True)
+        Game.objects.all().delete()
+        payload = standin.scoreboard({'dates': '2024', 'seasontype': '2', 'week': '1'})
+        self.assertEqual(len(payload['events']), 1)
+        record = espn.parse_event(payload['events'][0], create_teams=True)
+        self.assertEqual((record['home_team'].name, record['home_score'], record['week']), ('NE', 24, 1))
+
+    def test_benchmark_leaves_the_database_unchanged(self):
+        fields = ('home_team', 'away_team', 'game_date', 'home_score', 'away_score', 'week', 'season', 'last_updated')
+        games = table_rows(Game, *fields)
+        stats = table_rows(TeamSeasonStats, 'team', 'season', 'wins', 'points_for')
+        out = StringIO()
+        call_command('benchmark_ingestion', target=['load', 'poll'], season=2024, repeat=2, stdout=out)
+        self.assertEqual(table_rows(Game, *fields), games)
+        self.assertEqual(table_rows(TeamSeasonStats, 'team', 'season', 'wins', 'points_for'), stats)
+        # Every load run is served the whole season
+        load_runs = [line.split() for line in out.getvalue().splitlines() if line.startswith('load')]
+        self.assertEqual([run[2] for run in load_runs], ['2', '2'])
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class LiveSnapshotTests(TestCase):
+    def setUp(self):
+        self.ne, self.nyj = Team.objects.create(name='NE'), Team.objects.create(name='NYJ')
+
+    def write(self, game):
+        # The snapshot is republished when the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            game.save()
+        return game
+
+    def test_snapshot_contents(self):
+        game = self.write(Game(
+            home_team=self.ne, away_team=self.nyj, home_score=7, away_score=3, is_live=True,
+            game_status='In Progress', current_quarter=2, time_remaining='4:12',
+            game_date=kickoff(2025, 9, 7, 17), week=1, season=2025,
+        ))
+        with self.assertNumQueries(0):
+            info, = get_live_snapshot()['games']
+            self.assertTrue(check_live_games_exist())
+        self.assertEqual(
+            (info['game'], info['home_team'], info['away_team'], info['home_score'], info['away_score']),
+            (game, self.ne, self.nyj, 7, 3),
+        )
+        self.assertEqual((info['quarter'], info['time_remaining'], info['status']), ('2nd', '4:12', 'In Progress'))
+
+    def test_snapshot_follows_live_games(self):
+        game = self.write(Game(
+            home_team=self.ne, away_team=self.nyj, home_score=0, away_score=0, is_live=True,
+            game_date=kickoff(2025, 9, 7, 17), week=1, season=2025,
+        ))
+        version = get_live_snapshot()['version']
+
+        game.home_score = 7
+        self.write(game)
+        snapshot = get_live_snapshot()
+        self.assertGreater(snapshot['version'], version)
+        self.assertEqual(snapshot['games'][0]['home_score'], 7)
+
+        # Writes that change no live scoreboard leave the snapshot alone
+        self.write(Game(
+            home_team=self.nyj, away_team=self.ne, home_score=0, away_score=0,
+            game_date=kickoff(2025, 9, 14, 17), week=2, season=2025,
+        ))
+        self.assertEqual(get_live_snapshot()['version'], snapshot['version'])
+
+        game.is_live, game.game_status = False, 'Final'
+        self.write(game)
+        self.assertEqual(get_live_snapshot()['games'], [])
+        self.assertFalse(check_live_games_exist())
+
+RESULTS_SOURCE = """
+results2018=[
+[[('NYJ', 10), ('NE', 24), (2018, 9, 9, 13, 0, 0)],
+[('MIA', 'null'), ('BUF', 'null'), (2018, 9, 9, 13, 0, 0)]],
+[[('NE', 17), ('MIA', 14)],
+[('BUF', 3)]]
+]
+results2019=[
+[[('NE', 33), ('NYJ', 0), (2019, 9, 8, 13, 0, 0)]]
+]
+"""
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ResultsArchiveTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name) / 'archive'
+        self.source = Path(tmp.name) / 'results.py'
+        self.source.write_text(RESULTS_SOURCE)
+
+    def test_games_without_scores_are_skipped(self):
+        built = results_archive.build_archive(self.source, self.directory)
+        self.assertEqual(built, {2018: (2, 2), 2019: (1, 0)})
+
+        games = list(results_archive.open_season(2018, self.directory).iter_games())
+        self.assertEqual([(g['away_team'], g['home_team'], g['away_score'], g['home_score']) for g in games], [
+            ('NYJ', 'NE', 10, 24),
+            ('NE', 'MIA', 17, 14),
+        ])
+        self.assertEqual(str(games[0]['game_date']), '2018-09-09 13:00:00')
+        # No date in results.py: estimated from the week
+        self.assertEqual(games[1]['game_date'], results_archive.estimated_kickoff(2018, 2))
+
+    def test_only_requested_seasons_are_built(self):
+        built = results_archive.build_archive(self.source, self.directory, seasons=[2019])
+        self.assertEqual(list(built), [2019])
+        self.assertEqual(results_archive.available_seasons(self.directory), [2019])
+
+    def test_stale_archives_are_rebuilt(self):
+        self.assertEqual(list(results_archive.ensure_archive([2018, 2019], self.source, self.directory)), [2018, 2019])
+        self.assertEqual(results_archive.ensure_archive([2018, 2019], self.source, self.directory), {})
+
+        # results.py edited after the archive was written
+        mtime = results_archive.archive_path(2019, self.directory).stat().st_mtime
+        os.utime(self.source, (mtime + 10, mtime + 10))
+        os.utime(results_archive.archive_path(2018, self.directory), (mtime + 20, mtime + 20))
+        self.assertEqual(results_archive.stale_seasons([2018, 2019], self.source, self.directory), [2019])
+        self.assertEqual(list(results_archive.ensure_archive([2018, 2019], self.source, self.directory)), [2019])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ApplyGameUpdatesTests(TestCase):
+    def setUp(self):
+        self.ne = Team.objects.create(name='NE')
+        self.nyj = Team.objects.create(name='NYJ')
+        self.kickoff = kickoff(2024, 9, 8, 13)
+
+    def test_create_update_and_no_op(self):
+        created, updated, collisions = apply_game_updates(2024, [game_record(self.ne, self.nyj, 1, self.kickoff)])
+        self.assertEqual((len(created), updated, collisions), (1, [], []))
+        game = Game.objects.get()
+        self.assertEqual((game.home_score, game.away_score, game.season, game.week), (0, 0, 2024, 1))
+
+        created, updated, _ = apply_game_updates(2024, [game_record(self.ne, self.nyj, 1, self.kickoff, 7, 3, is_live=True)])
+        self.assertEqual((created, [g.pk for g in updated]), ([], [game.pk]))
+        game.refresh_from_db()
+        self.assertEqual((game.home_score, game.away_score, game.is_live), (7, 3, True))
+
+        created, updated, _ = apply_game_updates(2024, [game_record(self.ne, self.nyj, 1, self.kickoff, 7, 3, is_live=True)])
+        self.assertEqual((created, updated), ([], []))
+        self.assertEqual(Game.objects.count(), 1)
+
+    def test_unchanged_games_keep_last_updated(self):
+        apply_game_updates(2024, [game_record(self.ne, self.nyj, 1, self.kickoff, 7, 3)])
+        stamp = timezone.now() - timedelta(days=1)
+        Game.objects.update(last_updated=stamp)
+
+        apply_game_updates(2024, [game_record(self.ne, self.nyj, 1, self.kickoff, 7, 3)])
+        self.assertEqual(Game.objects.get().last_updated, stamp)
+
+        apply_game_updates(2024, [game_record(self.ne, self.nyj, 1, self.kickoff, 14, 3)])
+        self.assertGreater(Game.objects.get().last_updated, stamp)
+
+    def test_same_kickoff_in_another_week_updates_the_stored_game(self):
+        apply_game_updates(2024, [game_record(self.ne, self.nyj, 1, self.kickoff)])
+
+        created, updated, collisions = apply_game_updates(2024, [game_record(self.ne, self.nyj, 2, self.kickoff, 21, 10)])
+        self.assertEqual((created, len(updated), collisions), ([], 1, []))
+        self.assertEqual(
+            list(Game.objects.values_list('week', 'home_score', 'away_score')), [(1, 21, 10)]
+        )
+
+    def test_moved_kickoff_updates_the_game_of_that_week(self):
+        apply_game_updates(2024, [game_record(self.ne, self.nyj, 1, self.kickoff)])
+        moved = self.kickoff + timedelta(hours=7)
+
+        created, updated, _ = apply_game_updates(2024, [game_record(self.ne, self.nyj, 1, moved)], fields=('game_date',))
+        self.assertEqual((created, len(updated)), ([], 1))
+        self.assertEqual(Game.objects.get().game_date, moved)
+
+    def test_game_of_another_season_is_a_collision(self):
+        apply_game_updates(2018, [game_record(self.ne, self.nyj, 1, self.kickoff, 24, 10)])
+        records = [
+            game_record(self.ne, self.nyj, 1, self.kickoff, 24, 10),
+            game_record(self.nyj, self.ne, 2, self.kickoff + timedelta(days=7), 3, 6),
+        ]
+
+        created, updated, collisions = apply_game_updates(2019, records)
+        self.assertEqual((len(created), updated, collisions), (1, [], records[:1]))
+        self.assertEqual(sorted(Game.objects.values_list('season', 'week')), [(2018, 1), (2019, 2)])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ImportLedgerTests(TestCase):
+    def setUp(self):
+        self.ne = Team.objects.create(name='NE')
+        self.nyj = Team.objects.create(name='NYJ')
+        self.records = [
+            game_record(self.ne, self.nyj, 1, datetime(2018, 9, 9, 13), 24, 10),
+            game_record(self.nyj, self.ne, 2, datetime(2018, 9, 16, 13), 3, 6),
+        ]
+
+    def test_unchanged_weeks_are_skipped(self):
+        summary = import_weeks('results', 2018, self.records)
+        self.assertEqual((summary['written'], summary['created']), ([1, 2], 2))
+
+        self.records[1]['home_score'] = 13
+        summary = import_weeks('results', 2018, self.records)
+        self.assertEqual((summary['unchanged'], summary['written'], summary['updated']), ([1], [2], 1))
+
+    def test_cleared_weeks_are_imported_again(self):
+        import_weeks('results', 2018, self.records)
+        Game.objects.filter(week=1).delete()
+
+        summary = import_weeks('results', 2018, self.records)
+        self.assertEqual((summary['unchanged'], summary['written'], summary['created']), ([2], [1], 1))
+
+    def test_games_stored_in_another_season_are_skipped(self):
+        import_weeks('results', 2018, self.records)
+        # results2019 repeats games of 2018
+        repeated = [dict(self.records[0]), game_record(self.ne, self.nyj, 1, datetime(2019, 9, 8, 13), 33, 0)]
+
+        summary = import_weeks('results', 2019, repeated)
+        self.assertEqual((summary['written'], summary['created'], len(summary['collisions'])), ([1], 1, 1))
+        self.assertEqual(ImportLedger.objects.get(season=2019).games, 1)
+        self.assertEqual(import_weeks('results', 2019, repeated)['unchanged'], [1])
+        self.assertEqual(Game.objects.count(), 3)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class GameAdminTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        ne, nyj = Team.objects.create(name='NE'), Team.objects.create(name='NYJ')
+        Game.objects.create(
+            home_team=ne, away_team=nyj, home_score=24, away_score=10,
+            game_date=kickoff(2018, 9, 9, 13), week=1, season=2018,
+        )
+
+    def test_change_list_links_to_completeness(self):
+        response = self.client.get(reverse('admin:football_game_changelist'))
+        self.assertContains(response, 'href="completeness/"')
+
+    def test_completeness_report(self):
+        response = self.client.get(reverse('admin:football_game_completeness'), {'season': 2018})
+        self.assertTemplateUsed(response, 'admin/football/game/completeness.html')
+        self.assertContains(response, '2018 data completeness')
+        self.assertContains(response, 'Incomplete teams')
+
+
+@jobs.job_handler('test_count')
+def count_rows(job, progress):
+    progress(0, job.params['rows'])
+    if job.params.get('fail'):
+        raise ValueError('bad rows')
+    progress(job.params['rows'])
+    return f"Counted {job.params['rows']} rows"
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class JobQueueTests(TestCase):
+    def test_enqueue_returns_the_pending_job_of_the_same_kind(self):
+        job = jobs.enqueue('test_count', rows=3)
+        self.assertEqual(jobs.enqueue('test_count', rows=3), job)
+        self.assertNotEqual(jobs.enqueue('test_count', rows=4), job)
+        with self.assertRaises(ValueError):
+            jobs.enqueue('no_such_job')
+
+    def test_run_records_progress_and_result(self):
+        job = jobs.enqueue('test_count', rows=3)
+        self.assertEqual(jobs.claim_next('worker-1'), job)
+        self.assertIsNone(jobs.claim_next('worker-2'))
+
+        jobs.run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.rows_processed, job.rows_total), (Job.SUCCEEDED, 3, 3))
+        self.assertEqual((job.worker, job.result), ('worker-1', 'Counted 3 rows'))
+
+    def test_failure_keeps_the_traceback(self):
+        job = jobs.enqueue('test_count', rows=3, fail=True)
+        jobs.run_job(jobs.claim_next('worker-1'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn('ValueError: bad rows', job.result)
+
+    def test_stale_jobs_fail(self):
+        job = jobs.enqueue('test_count', rows=3)
+        jobs.claim_next('worker-1')
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - jobs.STALE_AFTER - timedelta(minutes=1))
+
+        self.assertEqual(jobs.fail_stale_jobs(), 1)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.FAILED)
+        # The same kind can be queued again
+        self.assertNotEqual(jobs.enqueue('test_count', rows=3), job)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class JobAdminTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+
+    def test_running_job_shows_progress_and_refreshes(self):
+        job = Job.objects.create(kind='test_count', status=Job.RUNNING, rows_processed=2, rows_total=5)
+        response = self.client.get(reverse('admin:football_job_change', args=[job.pk]))
+        self.assertContains(response, '<progress value="2" max="5"')
+        self.assertContains(response, '<meta http-equiv="refresh" content="2">')
+
+    def test_finished_job_stops_refreshing(self):
+        job = Job.objects.create(kind='test_count', status=Job.SUCCEEDED, rows_processed=5, rows_total=5)
+        response = self.client.get(reverse('admin:football_job_change', args=[job.pk]))
+        self.assertContains(response, '<progress value="5" max="5"')
+        self.assertNotContains(response, 'http-equiv="refresh"')
+
+    def test_fetch_button_queues_a_job(self):
+        response = self.client.post(reverse('admin:fetch_espn_data'))
+        job = Job.objects.get()
+        self.assertEqual((job.kind, job.status), ('fetch_espn_preseason', Job.QUEUED))
+        self.assertRedirects(response, reverse('admin:football_job_change', args=[job.pk]))
+
+    def test_job_urls_need_an_admin_login(self):
+        self.client.logout()
+        for name in ('admin:fetch_espn_data', 'admin:calculate_rankings'):
+            response = self.client.post(reverse(name))
+            self.assertRedirects(response, f"{reverse('admin:login')}?next={reverse(name)}")
+        self.assertFalse(Job.objects.exists())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TeamResolutionTests(TestCase):
+    def setUp(self):
+        invalidate_teams()
+        self.addCleanup(invalidate_teams)
+        self.la = Team.objects.create(name='LA')
+        self.lv = Team.objects.create(name='LV')
+
+    def test_old_abbreviations_are_teams_of_their_own_without_aliases(self):
+        stl, created = get_or_create_team('STL')
+        self.assertTrue(created)
+        self.assertEqual(stl.name, 'STL')
+        self.assertEqual(get_team('STL'), stl)
+
+    def test_alias_rows_resolve_to_their_team(self):
+        TeamAlias.objects.create(alias='STL', team=self.la)
+        self.assertEqual(get_or_create_team('STL'), (self.la, False))
+
+    def test_stored_team_wins_over_its_alias(self):
+        oak = Team.objects.create(name='OAK')
+        TeamAlias.objects.create(alias='OAK', team=self.lv)
+        self.assertEqual(get_team('OAK'), oak)
+
+    def test_default_aliases_skip_abbreviations_stored_as_teams(self):
+        Team.objects.create(name='OAK')
+        # LAC, JAX and WAS aren't stored, so SD, JAC and WSH get no alias either
+        self.assertEqual(ensure_default_aliases(), 2)
+        self.assertEqual(list(TeamAlias.objects.values_list('alias', 'team__name')), [('LAR', 'LA'), ('STL', 'LA')])
+
+    def test_espn_abbreviations_resolve_through_aliases(self):
+        was = Team.objects.create(name='WAS')
+        ensure_default_aliases()
+        event = {'competitions': [{'competitors': [
+            {'homeAway': 'home', 'team': {'abbreviation': 'WSH'}, 'score': '17'},
+            {'homeAway': 'away', 'team': {'abbreviation': 'LAR'}, 'score': '20'},
+        ]}], 'date': '2024-09-08T17:00Z'}
+        record = espn.parse_event(event, create_teams=True)
+        self.assertEqual((record['home_team'], record['away_team']), (was, self.la))
+        self.assertFalse(Team.objects.filter(name__in=['WSH', 'LAR']).exists())
+
+
+def scoreboard_payload(state='post', kickoff='2024-09-08T17:00Z'):
+    completed = state == 'post'
+    return {'events': [{
+        'date': kickoff,
+        'competitions': [{'status': {'type': {'state': state, 'completed': completed}}}],
+    }]}
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = headers or {}
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Answers scoreboard requests from a list of responses, recording the request headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ESPN_CACHE_TTL=600, ESPN_CACHE_LIVE_TTL=30)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        self.cache = ResponseCache(tmp.name)
+
+    def stored_expiry(self, params, payload):
+        key = cache_key('url', params)
+        self.cache.store(key, 'url', params, payload, {})
+        return self.cache.load(key)[1]['expires']
+
+    def test_settled_week_never_expires(self):
+        self.assertIsNone(self.stored_expiry({'dates': '2024', 'week': '1'}, scoreboard_payload()))
+        self.assertIsNone(self.stored_expiry({'dates': '20240908'}, scoreboard_payload()))
+
+    def test_settled_payload_of_an_unpinned_query_expires(self):
+        # The current week of a season changes from one week to the next
+        self.assertEqual(self.stored_expiry({'dates': str(date.today().year), 'seasontype': '2'}, scoreboard_payload()), 600)
+        self.assertEqual(self.stored_expiry({'seasontype': '2'}, scoreboard_payload()), 600)
+
+    def test_live_and_open_payloads_expire(self):
+        self.assertEqual(self.stored_expiry({'week': '1'}, scoreboard_payload('in')), 30)
+        self.assertEqual(self.stored_expiry({'week': '1'}, scoreboard_payload('pre', '2999-09-08T17:00Z')), 600)
+
+    def test_past_queries_are_final(self):
+        self.assertTrue(query_is_final({'dates': '20240901-20240910'}))
+        self.assertTrue(query_is_final({'dates': '2019'}))
+        self.assertFalse(query_is_final({'week': '1'}))
+        self.assertFalse(query_is_final({'dates': str(date.today().year)}))
+
+    def test_stale_entries_are_revalidated(self):
+        session = FakeSession(
+            FakeResponse(200, scoreboard_payload('pre', '2999-09-08T17:00Z'), {'ETag': '"v1"'}),
+            FakeResponse(304),
+        )
+        with override_settings(ESPN_CACHE_DIR=self.directory, ESPN_SCOREBOARD_URL='http://espn.test/scoreboard'):
+            first = espn.fetch_scoreboard(session=session, week=1)
+            self.assertEqual(espn.fetch_scoreboard(session=session, week=1), first)
+            self.assertEqual(espn.fetch_scoreboard(session=session, week=1, max_age=0), first)
+        self.assertEqual(session.requests, [{}, {'If-None-Match': '"v1"'}])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class LivePollerTests(TestCase):
+    def run_rounds(self, rounds, **patches):
+        """Run the poller's loop for some rounds; returns the delays it slept and its output"""
+        command = run_live_poller.Command(stdout=StringIO())
+        command.season, command.live_interval = 2025, run_live_poller.LIVE_INTERVAL
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+            if len(delays) == rounds:
+                raise KeyboardInterrupt
+
+        with mock.patch.object(run_live_poller.asyncio, 'sleep', sleep), \
+                mock.patch.object(run_live_poller, 'close_old_connections') as close_old_connections, \
+                mock.patch.multiple(command, **patches):
+            with self.assertRaises(KeyboardInterrupt):
+                asyncio.run(command.run())
+        return delays, command.stdout.getvalue(), close_old_connections
+
+    def test_database_errors_back_off_instead_of_stopping(self):
+        delays, output, close_old_connections = self.run_rounds(
+            3, plan=mock.Mock(side_effect=DatabaseError('database is locked')),
+        )
+        interval = run_live_poller.KICKOFF_INTERVAL
+        self.assertEqual(delays, [interval * 2, interval * 4, interval * 8])
+        self.assertIn('database is locked', output)
+        self.assertEqual(close_old_connections.call_count, 3)
+
+    def test_parse_errors_back_off_and_recover(self):
+        poll_week = mock.AsyncMock(side_effect=[KeyError('events'), None])
+        delays, output, _ = self.run_rounds(
+            2, plan=mock.Mock(return_value=(5, {1})), poll_week=poll_week,
+        )
+        self.assertEqual(delays, [10, 5])
+        self.assertIn("KeyError('events')", output)
+
+    def test_live_games_are_listed_with_their_quarter(self):
+        command = run_live_poller.Command(stdout=StringIO())
+        command.season = 2025
+        game = {
+            'home_team': Team(name='NE'), 'away_team': Team(name='NYJ'),
+            'home_score': 20, 'away_score': 17, 'period': 5, 'clock': '3:12',
+        }
+        with mock.patch.object(run_live_poller, 'fetch_scoreboard'), \
+                mock.patch.object(command, 'process_scoreboard', return_value=(1, [game])):
+            asyncio.run(command.poll_week(None, 3))
+        self.assertIn('NYJ 17 @ NE 20 - OT 3:12', command.stdout.getvalue())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class BackfillTests(TestCase):
+    def test_failed_queries_are_reported_without_stopping_the_others(self):
+        def fetch(session, throttle, week):
+            throttle()
+            if week == 2:
+                raise ValueError('Expecting value: line 1 column 1')
+            if week == 3:
+                return ['not', 'a', 'scoreboard']
+            return {'events': [], 'week': {'number': week}}
+
+        queries = [{'week': week} for week in (1, 2, 3, 4)]
+        with mock.patch.object(backfill, 'fetch_scoreboard', fetch):
+            results = {query['week']: (payload, error) for query, payload, error in backfill.fetch_scoreboards(queries, 2, 100)}
+
+        self.assertEqual(sorted(results), [1, 2, 3, 4])
+        self.assertEqual(results[1], ({'events': [], 'week': {'number': 1}}, None))
+        self.assertIsInstance(results[2][1], ValueError)
+        self.assertIn('Unexpected scoreboard payload', str(results[3][1]))
+        self.assertIsNone(results[4][1])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class BulkLoadTests(TestCase):
+    def setUp(self):
+        invalidate_teams()
+        self.addCleanup(invalidate_teams)
+        self.ne = Team.objects.create(name='NE')
+        self.nyj = Team.objects.create(name='NYJ')
+
+    def record(self, season, week, game_date, home, away):
+        return {
+            'season': season, 'week': week, 'game_date': game_date,
+            'home_team': home, 'away_team': away, 'home_score': 10, 'away_score': 7,
+        }
+
+    def test_counts_inserts_and_skips_stored_games(self):
+        stored = kickoff(2018, 9, 9, 13)
+        Game.objects.create(
+            season=2018, week=1, game_date=stored, home_team=self.ne, away_team=self.nyj, home_score=24, away_score=10,
+        )
+        with BulkLoadSink(batch_size=2) as sink:
+            sink.add(self.record(2018, 1, stored, self.ne, self.nyj))
+            sink.add(self.record(2019, 1, kickoff(2019, 9, 8, 13), self.ne, self.nyj))
+            sink.add(self.record(2019, 2, kickoff(2019, 9, 15, 13), self.nyj, self.ne))
+            # Repeated within the load
+            sink.add(self.record(2019, 2, kickoff(2019, 9, 15, 13), self.nyj, self.ne))
+
+        self.assertEqual((sink.received, sink.inserted, sink.seasons), (4, 2, {2019}))
+        self.assertEqual(Game.objects.count(), 3)
+        self.assertEqual(Game.objects.get(season=2018).home_score, 24)
+
+    def test_archived_seasons_load_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = Path(directory) / 'results.py'
+            source.write_text(RESULTS_SOURCE)
+            results_archive.build_archive(source, directory)
+
+            first = results_archive.bulk_load_seasons([2018, 2019], directory)
+            again = results_archive.bulk_load_seasons([2018, 2019], directory)
+        self.assertEqual((first.received, first.inserted), (3, 3))
+        self.assertEqual((again.received, again.inserted), (3, 0))
+        self.assertEqual(set(Team.objects.values_list('name', flat=True)), {'NE', 'NYJ', 'MIA'})
+
+    def test_load_command_refreshes_once(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(RESULTS_ARCHIVE_DIR=directory), \
+                mock.patch('football.signals.apply_game_write') as apply_game_write:
+            call_command('load_all_seasons', seasons=[2018], stdout=StringIO())
+
+        apply_game_write.assert_not_called()
+        self.assertEqual(Game.objects.filter(season=2018).count(), 264)
+        loaded = table_rows(TeamSeasonStats, 'season', 'team_id', 'wins', 'losses', 'ties', 'points_for')
+        rebuild_team_season_stats(2018)
+        self.assertEqual(loaded, table_rows(TeamSeasonStats, 'season', 'team_id', 'wins', 'losses', 'ties', 'points_for'))
+        self.assertEqual(TeamGameRecord.objects.filter(season=2018).count(), 2 * 264)
+
+
+def eastern(*args):
+    return EASTERN.localize(datetime(*args))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ScheduleValidationTests(TestCase):
+    def setUp(self):
+        ne, nyj, mia, buf = (Team.objects.create(name=name) for name in ('NE', 'NYJ', 'MIA', 'BUF'))
+        schedule = [
+            (1, ne, nyj, eastern(2024, 9, 8, 13)),
+            (1, mia, buf, eastern(2024, 9, 8, 13)),
+            (2, nyj, ne, eastern(2024, 9, 15, 13)),
+            (2, buf, mia, eastern(2024, 9, 15, 16)),
+            # NE and BUF again in week 2, three days after their last game
+            (2, ne, buf, eastern(2024, 9, 18, 13)),
+        ]
+        for week, home, away, game_date in schedule:
+            Game.objects.create(
+                season=2024, week=week, home_team=home, away_team=away, game_date=game_date, home_score=0, away_score=0,
+            )
+
+    def checks(self, report):
+        return {check['rule']: check for check in report['checks']}
+
+    def test_rules(self):
+        report = validate_schedule(2024)
+        checks = self.checks(report)
+        self.assertEqual(report['status'], 'fail')
+        self.assertEqual(report['summary']['games_per_week'], {1: 2, 2: 3})
+
+        weeks = {issue['week']: issue['games'] for issue in checks['games_per_week']['issues']}
+        self.assertEqual(weeks[2], 3)
+        self.assertEqual(weeks[3], 0)
+        self.assertNotIn(1, weeks)
+        self.assertEqual(checks['double_booked']['issues'], [{'team': 'BUF', 'week': 2}, {'team': 'NE', 'week': 2}])
+        self.assertEqual(sorted(issue['team'] for issue in checks['minimum_rest']['issues']), ['BUF', 'NE'])
+        self.assertEqual(checks['duplicate_matchups']['status'], 'pass')
+        self.assertEqual(report['summary']['teams']['NE'], {'games': 3, 'home': 2, 'away': 1})
+        self.assertEqual(report['summary']['kickoff_slots']['sunday_early'], 3)
+
+    def test_command_output(self):
+        out = StringIO()
+        call_command('validate_schedule', season=2024, json=True, stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['regular_season_games'], 5)
+
+        with self.assertRaises(CommandError):
+            call_command('validate_schedule', season=2024, strict=True, stdout=StringIO())
+
+    def test_archived_season_passes(self):
+        # Rows left behind by relocations play no games in 2018
+        Team.objects.create(name='SD')
+        Team.objects.create(name='STL')
+        with tempfile.TemporaryDirectory() as directory, override_settings(RESULTS_ARCHIVE_DIR=directory):
+            results_archive.ensure_archive([2018])
+            results_archive.bulk_load_seasons([2018])
+
+        report = validate_schedule(2018)
+        checks = self.checks(report)
+        self.assertEqual(report['failed'], [])
+        self.assertEqual(report['regular_season_games'], 256)
+        self.assertEqual(len(report['summary']['teams']), 32)
+        self.assertNotIn('STL', report['summary']['teams'])
+        self.assertEqual(checks['bye_weeks']['status'], 'pass')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SinkTests(TestCase):
+    def test_sink_must_implement_write(self):
+        with self.assertRaises(TypeError):
+            Sink()
+
+    def test_records_are_written_in_batches(self):
+        batches = []
+
+        class RecordingSink(DryRunSink):
+            def write(self, records):
+                batches.append(len(records))
+                super().write(records)
+
+        sink, = drain(({'n': n} for n in range(5)), RecordingSink(batch_size=2))
+        self.assertEqual((batches, sink.received, len(sink.records)), ([2, 2, 1], 5, 5))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ScoreTimelineTests(TestCase):
+    def setUp(self):
+        self.ne, self.nyj = Team.objects.create(name='NE'), Team.objects.create(name='NYJ')
+
+    def live_game(self, home_score=0, away_score=0):
+        return Game.objects.create(
+            home_team=self.ne, away_team=self.nyj, game_date=kickoff(2025, 9, 7, 17),
+            week=1, season=2025, home_score=home_score, away_score=away_score,
+            is_live=True, game_status='In Progress', current_quarter=1,
+        )
+
+    def log_event(self, game, recorded_at, home_score, away_score, **fields):
+        return GameScoreEvent.objects.create(
+            game=game, season=game.season, recorded_at=recorded_at,
+            home_score=home_score, away_score=away_score, is_live=True, **fields,
+        )
+
+    def test_changes_are_appended_once(self):
+        game = self.live_game()
+        game.save()
+        self.assertEqual(GameScoreEvent.objects.filter(game=game).count(), 1)
+
+        game.home_score = 7
+        game.save()
+        game.save()
+        events = list(game_timeline(game.id))
+        self.assertEqual([(event.home_score, event.away_score) for event in events], [(0, 0), (7, 0)])
+
+        # Writing the same state through the bulk path adds nothing either
+        self.assertEqual(record_score_events([game]), [])
+
+    def test_games_never_live_are_not_logged(self):
+        game = Game.objects.create(
+            home_team=self.ne, away_team=self.nyj, game_date=kickoff(2018, 9, 9, 13),
+            week=1, season=2018, home_score=24, away_score=10, game_status='Final',
+        )
+        game.home_score = 27
+        game.save()
+        self.assertFalse(GameScoreEvent.objects.exists())
+
+    def test_final_state_of_a_live_game_is_logged(self):
+        game = self.live_game(home_score=24, away_score=10)
+        game.is_live = False
+        game.game_status = 'Final'
+        game.save()
+        last = game_timeline(game.id).last()
+        self.assertEqual((last.is_live, last.game_status, last.home_score), (False, 'Final', 24))
+
+    def test_scoring_plays(self):
+        game = self.live_game()
+        start = kickoff(2025, 9, 7, 17)
+        events = [
+            self.log_event(game, start, 0, 0),
+            self.log_event(game, start + timedelta(minutes=5), 0, 7),
+            self.log_event(game, start + timedelta(minutes=6), 0, 7, time_remaining='8:00'),
+            self.log_event(game, start + timedelta(minutes=20), 3, 7),
+        ]
+        plays = scoring_plays(events)
+        self.assertEqual(
+            [(play['event'], play['home_points'], play['away_points'], play['margin']) for play in plays],
+            [(events[1], 0, 7, -7), (events[3], 3, 0, -4)],
+        )
+
+    def test_scoreboard_at(self):
+        first = self.live_game()
+        second = Game.objects.create(
+            home_team=self.nyj, away_team=self.ne, game_date=kickoff(2025, 9, 7, 20),
+            week=1, season=2025, home_score=0, away_score=0,
+        )
+        GameScoreEvent.objects.all().delete()
+        start = kickoff(2025, 9, 7, 17)
+        self.log_event(first, start, 0, 0)
+        self.log_event(first, start + timedelta(hours=1), 7, 0)
+        self.log_event(second, start + timedelta(hours=3), 0, 3)
+
+        def scores(moment, week=1):
+            return {
+                game_id: (event.home_score, event.away_score)
+                for game_id, event in scoreboard_at(moment, 2025, week).items()
+            }
+
+        self.assertEqual(scores(start - timedelta(minutes=1)), {})
+        self.assertEqual(scores(start + timedelta(minutes=30)), {first.id: (0, 0)})
+        self.assertEqual(scores(start + timedelta(hours=1)), {first.id: (7, 0)})
+        self.assertEqual(scores(start + timedelta(hours=4)), {first.id: (7, 0), second.id: (0, 3)})
+        self.assertEqual(scores(start + timedelta(hours=4), week=2), {})
+
+    def test_timeline_endpoint(self):
+        game = self.live_game()
+        game.away_score = 7
+        game.save()
+        data = self.client.get(reverse('api_game_timeline', args=[game.id])).json()
+        self.assertEqual(data['game_id'], game.id)
+        self.assertEqual([event['away_score'] for event in data['events']], [0, 7])
+        self.assertEqual(
+            [(play['away_points'], play['margin']) for play in data['scoring']],
+            [(7, -7)],
+        )
+
+    def test_replay_endpoint(self):
+        game = self.live_game()
+        GameScoreEvent.objects.all().delete()
+        start = kickoff(2025, 9, 7, 17)
+        self.log_event(game, start, 0, 0)
+        self.log_event(game, start + timedelta(hours=1), 14, 3)
+
+        url = reverse('api_scoreboard_replay', args=[2025, 1])
+        data = self.client.get(url, {'at': (start + timedelta(minutes=30)).isoformat()}).json()
+        self.assertEqual(
+            [(row['id'], row['home_score'], row['away_score']) for row in data['games']],
+            [(game.id, 0, 0)],
+        )
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'at': '2025-09-07T18:00:00'}).status_code, 400)
@@ -0,0 +1,88 @@
+from django.db.models import Max
+from django.utils import timezone
+from .models import GameScoreEvent
+
+# Game fields copied into the score log, as (Game field, GameScoreEvent field)
+TIMELINE_FIELDS = (
+    ('home_score', 'home_score'),
+    ('away_score', 'away_score'),
+    ('is_live', 'is_live'),
+    ('game_status', 'game_status'),
+    ('current_quarter', 'quarter'),
+    ('time_remaining', 'time_remaining'),
+)
+
+
+def _latest_events(events):
+    """The newest event of every game in a GameScoreEvent queryset, keyed by game id"""
+    # Events are only appended, so the highest id is the newest
+    latest_ids = events.order_by().values('game_id').annotate(latest=Max('id')).values_list('latest', flat=True)
+    return {event.game_id: event for event in GameScoreEvent.objects.filter(id__in=list(latest_ids))}
+
+
+def record_score_events(games, now=None):
+    """
+    Append a GameScoreEvent for every game whose scoreboard differs from its last event.
+
+    Only games that are live, or were live earlier, are logged, so
+    historical loads add nothing. Returns the events written.
+    """
+    games = [game for game in games if game.pk is not None]
+    if not games:
+        return []
+
+    last_events = _latest_events(GameScoreEvent.objects.filter(game_id__in=[game.pk for game in games]))
+    now = now or timezone.now()
+    events = []
+    for game in games:
+        last = last_events.get(game.pk)
+        if last is None and not game.is_live:
+            continue
+        state = {event_field: getattr(game, game_field) for game_field, event_field in TIMELINE_FIELDS}
+        if last is not None and all(getattr(last, field) == value for field, value in state.items()):
+            continue
+        events.append(GameScoreEvent(game_id=game.pk, season=game.season, recorded_at=now, **state))
+
+    GameScoreEvent.objects.bulk_create(events)
+    return events
+
+
+def game_timeline(game_id):
+    """Every recorded state of a game, oldest first"""
+    return GameScoreEvent.objects.filter(game_id=game_id).order_by('recorded_at', 'id')
+
+
+def scoring_plays(events):
+    """
+    The events where the score changed, with the points and running margin.
+
+    Returns dicts of the event, ``home_points``/``away_points`` scored
+    since the previous change and ``margin`` (home minus away), which is
+    what a momentum chart plots.
+    """
+    plays = []
+    home, away = 0, 0
+    for event in events:
+        if (event.home_score, event.away_score) == (home, away):
+            continue
+        plays.append({
+            'event': event,
+            'home_points': event.home_score - home,
+            'away_points': event.away_score - away,
+            'margin': event.home_score - event.away_score,
+        })
+        home, away = event.home_score, event.away_score
+    return plays
+
+
+def scoreboard_at(moment, season, week=None):
+    """
+    The scoreboard as it stood at ``moment``: the last event of every logged game, keyed by game id.
+
+    Games with no event by then are left out; they hadn't kicked off
+    or were never polled live.
+    """
+    events = GameScoreEvent.objects.filter(season=season, recorded_at__lte=moment)
+    if week is not None:
+        events = events.filter(game__week=week)
+    return _latest_events(events)
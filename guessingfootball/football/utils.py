@@ -1,31 +1,54 @@
+import time
 from datetime import datetime, timezone
+from django.core.cache import cache
 from .models import Game
 
+# The live games are published to the shared cache as one snapshot, with
+# teams already loaded, whenever a game write changes a live scoreboard (see
+# football.signals). Pages read the snapshot instead of querying. It also
+# expires after a while in case a write slipped past the signals.
+LIVE_SNAPSHOT_KEY = 'live:snapshot'
+LIVE_SNAPSHOT_SECONDS = 300
+
+
+def _live_game_info(game):
+    return {
+        'game': game,
+        'home_team': game.home_team,
+        'away_team': game.away_team,
+        'home_score': game.home_score,
+        'away_score': game.away_score,
+        'quarter': game.quarter_display,
+        'time_remaining': game.time_remaining,
+        'status': game.game_status,
+        'is_live': game.is_live,
+        'last_updated': game.last_updated,
+    }
+
+
+def publish_live_games():
+    """Read the live games and store them as the shared snapshot; returns the snapshot"""
+    snapshot = {
+        # Clock based so versions keep increasing across processes and cache evictions
+        'version': time.time_ns(),
+        'games': [_live_game_info(game) for game in Game.get_live_games()],
+    }
+    cache.set(LIVE_SNAPSHOT_KEY, snapshot, LIVE_SNAPSHOT_SECONDS)
+    return snapshot
+
+
+def get_live_snapshot():
+    """The shared live games snapshot, building it if no process has yet"""
+    return cache.get(LIVE_SNAPSHOT_KEY) or publish_live_games()
+
+
 def get_live_games():
     """Get all currently live games with detailed status"""
-    live_games = Game.get_live_games()
-    
-    live_game_data = []
-    for game in live_games:
-        game_info = {
-            'game': game,
-            'home_team': game.home_team,
-            'away_team': game.away_team,
-            'home_score': game.home_score,
-            'away_score': game.away_score,
-            'quarter': game.quarter_display,
-            'time_remaining': game.time_remaining,
-            'status': game.game_status,
-            'is_live': game.is_live,
-            'last_updated': game.last_updated,
-        }
-        live_game_data.append(game_info)
-    
-    return live_game_data
+    return get_live_snapshot()['games']
 
 def check_live_games_exist():
     """Quick check if any games are currently live"""
-    return Game.objects.filter(is_live=True).exists()
+    return bool(get_live_snapshot()['games'])
 
 def get_current_week():
     """Determine current NFL week based on current date"""
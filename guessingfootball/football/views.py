@@ -1,65 +1,32 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.db.models import Count, Q, F, Min, Max, Avg, Sum
+from django.db.models import Count, Q, F, Min, Max, Avg, Sum, Exists, OuterRef
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from .models import Team, Game
+from .models import Team, Game, MatchupRecord, TeamGameRecord, TeamSeasonStats
 from .forms import CustomUserCreationForm, UserProfileForm
 from .utils import get_live_games, check_live_games_exist
+from .caching import versioned_page, game_page_scopes, season_scope, team_scope, week_scope, TEAMS_SCOPE
 
+@versioned_page(lambda: [season_scope(2025), TEAMS_SCOPE])
 def teams_list(request):
-    # Get teams that have games in the 2025 season and calculate their stats manually
-    teams_with_2025_games = Team.objects.filter(
-        Q(home_games__season=2025) | Q(away_games__season=2025)
-    ).distinct()
+    # Read each team's maintained 2025 record (one row per team)
+    season_stats = TeamSeasonStats.objects.filter(season=2025).select_related('team')
     
-    # Calculate 2025 stats for each team manually
+    # Only teams that have games in the 2025 season are listed
     teams_with_stats = []
-    for team in teams_with_2025_games:
-        home_games_2025 = team.home_games.filter(season=2025)
-        away_games_2025 = team.away_games.filter(season=2025)
-        
-        total_scheduled_games_2025 = home_games_2025.count() + away_games_2025.count()
-        wins_2025 = 0
-        losses_2025 = 0
-        ties_2025 = 0
-        
-        # Count home wins/losses/ties (exclude unplayed games with 0-0 score)
-        for game in home_games_2025:
-            # Skip unplayed games (both scores are 0)
-            if game.home_score == 0 and game.away_score == 0:
-                continue
-            
-            if game.home_score > game.away_score:
-                wins_2025 += 1
-            elif game.home_score < game.away_score:
-                losses_2025 += 1
-            else:
-                ties_2025 += 1
-        
-        # Count away wins/losses/ties (exclude unplayed games with 0-0 score)
-        for game in away_games_2025:
-            # Skip unplayed games (both scores are 0)
-            if game.home_score == 0 and game.away_score == 0:
-                continue
-                
-            if game.away_score > game.home_score:
-                wins_2025 += 1
-            elif game.away_score < game.home_score:
-                losses_2025 += 1
-            else:
-                ties_2025 += 1
-        
-        # Calculate played games (only games with actual results)
-        played_games_2025 = wins_2025 + losses_2025 + ties_2025
+    total_scheduled = 0
+    for stats in season_stats:
+        team = stats.team
         
         # Add calculated stats to team object
-        team.total_games_2025 = played_games_2025  # Show played games, not scheduled
-        team.total_scheduled_games_2025 = total_scheduled_games_2025  # Keep scheduled for reference
-        team.wins_2025 = wins_2025
-        team.losses_2025 = losses_2025
-        team.ties_2025 = ties_2025
+        team.total_games_2025 = stats.games_played  # Show played games, not scheduled
+        team.total_scheduled_games_2025 = stats.games_scheduled  # Keep scheduled for reference
+        team.wins_2025 = stats.wins
+        team.losses_2025 = stats.losses
+        team.ties_2025 = stats.ties
         teams_with_stats.append(team)
+        total_scheduled += stats.games_scheduled
     
     # Organize teams by conference and division
     # Define division order: North, East, South, West
@@ -86,8 +53,8 @@ def teams_list(request):
         for div in organized_teams[conf]:
             organized_teams[conf][div].sort(key=lambda t: t.name)
     
-    # Get 2025 season stats
-    total_2025_games = Game.objects.filter(season=2025).count()
+    # Every game is scheduled for exactly two teams
+    total_2025_games = total_scheduled // 2
     
     context = {
         'title': '2025 NFL Teams',
@@ -99,58 +66,26 @@ def teams_list(request):
     }
     return render(request, 'teams.jinja', context)
 
+@versioned_page(lambda team_abbr: [team_scope(team_abbr.upper()), TEAMS_SCOPE])
 def team_detail(request, team_abbr):
     team = get_object_or_404(Team, name=team_abbr.upper())
     
     # Get only 2025 season games for this team
-    home_games_2025 = team.home_games.filter(season=2025)
-    away_games_2025 = team.away_games.filter(season=2025)
-    
-    # Combine games using Q objects instead of UNION to avoid ORDER BY issues
     all_games_2025 = Game.objects.filter(
         Q(home_team=team, season=2025) | Q(away_team=team, season=2025)
-    ).order_by('-game_date')
+    ).select_related('home_team', 'away_team').order_by('-game_date')
     
-    # Calculate 2025 team statistics
-    total_games_2025 = all_games_2025.count()
-    
-    # Calculate wins, losses, ties for 2025
-    wins_2025 = 0
-    losses_2025 = 0
-    ties_2025 = 0
-    points_for_2025 = 0
-    points_against_2025 = 0
-    
-    for game in all_games_2025:
-        # Skip unplayed games (both scores are 0) for record calculation
-        if game.home_score == 0 and game.away_score == 0:
-            continue
-            
-        if game.home_team == team:
-            # Team played at home
-            team_score = game.home_score
-            opponent_score = game.away_score
-            points_for_2025 += team_score
-            points_against_2025 += opponent_score
-        else:
-            # Team played away
-            team_score = game.away_score
-            opponent_score = game.home_score
-            points_for_2025 += team_score
-            points_against_2025 += opponent_score
-        
-        if team_score > opponent_score:
-            wins_2025 += 1
-        elif team_score < opponent_score:
-            losses_2025 += 1
-        else:
-            ties_2025 += 1
+    # Season records are maintained in TeamSeasonStats
+    season_stats = {
+        stats.season: stats
+        for stats in TeamSeasonStats.objects.filter(team=team, season__in=[2024, 2025])
+    }
+    stats_2025 = season_stats.get(2025) or TeamSeasonStats(team=team, season=2025)
+    stats_2024 = season_stats.get(2024) or TeamSeasonStats(team=team, season=2024)
     
-    # Calculate averages for 2025 (only based on played games)
-    played_games_2025 = wins_2025 + losses_2025 + ties_2025
-    avg_points_for_2025 = points_for_2025 / played_games_2025 if played_games_2025 > 0 else 0
-    avg_points_against_2025 = points_against_2025 / played_games_2025 if played_games_2025 > 0 else 0
-    win_percentage_2025 = wins_2025 / played_games_2025 if played_games_2025 > 0 else 0
+    # Calculate 2025 rates (only based on played games)
+    played_games_2025 = stats_2025.games_played
+    win_percentage_2025 = stats_2025.wins / played_games_2025 if played_games_2025 > 0 else 0
     
     # Create week-by-week schedule including bye weeks
     # Get all 2025 games ordered by week
@@ -176,82 +111,48 @@ def team_detail(request, team_abbr):
                 'game': None
             })
     
-    # Calculate 2024 season statistics
+    # 2024 season games
     all_games_2024 = Game.objects.filter(
         Q(home_team=team, season=2024) | Q(away_team=team, season=2024)
     ).order_by('-game_date')
     
-    # Calculate 2024 team statistics
-    wins_2024 = 0
-    losses_2024 = 0
-    ties_2024 = 0
-    points_for_2024 = 0
-    points_against_2024 = 0
-    
-    for game in all_games_2024:
-        # Skip unplayed games (both scores are 0) for record calculation
-        if game.home_score == 0 and game.away_score == 0:
-            continue
-            
-        if game.home_team == team:
-            # Team played at home
-            team_score = game.home_score
-            opponent_score = game.away_score
-            points_for_2024 += team_score
-            points_against_2024 += opponent_score
-        else:
-            # Team played away
-            team_score = game.away_score
-            opponent_score = game.home_score
-            points_for_2024 += team_score
-            points_against_2024 += opponent_score
-        
-        if team_score > opponent_score:
-            wins_2024 += 1
-        elif team_score < opponent_score:
-            losses_2024 += 1
-        else:
-            ties_2024 += 1
-    
-    # Calculate averages for 2024 (only based on played games)
-    played_games_2024 = wins_2024 + losses_2024 + ties_2024
-    avg_points_for_2024 = points_for_2024 / played_games_2024 if played_games_2024 > 0 else 0
-    avg_points_against_2024 = points_against_2024 / played_games_2024 if played_games_2024 > 0 else 0
-    win_percentage_2024 = wins_2024 / played_games_2024 if played_games_2024 > 0 else 0
+    played_games_2024 = stats_2024.games_played
+    win_percentage_2024 = stats_2024.wins / played_games_2024 if played_games_2024 > 0 else 0
     
     context = {
         'title': f'{team.name} - 2025 Season',
         'team': team,
         'total_games_2025': played_games_2025,  # Show played games, not all scheduled
-        'total_scheduled_games_2025': total_games_2025,  # Keep scheduled count for reference
-        'wins_2025': wins_2025,
-        'losses_2025': losses_2025,
-        'ties_2025': ties_2025,
+        'total_scheduled_games_2025': stats_2025.games_scheduled,  # Keep scheduled count for reference
+        'wins_2025': stats_2025.wins,
+        'losses_2025': stats_2025.losses,
+        'ties_2025': stats_2025.ties,
         'win_percentage_2025': win_percentage_2025,
-        'points_for_2025': points_for_2025,
-        'points_against_2025': points_against_2025,
-        'avg_points_for_2025': avg_points_for_2025,
-        'avg_points_against_2025': avg_points_against_2025,
+        'points_for_2025': stats_2025.points_for,
+        'points_against_2025': stats_2025.points_against,
+        'avg_points_for_2025': stats_2025.avg_points_for,
+        'avg_points_against_2025': stats_2025.avg_points_against,
         'complete_schedule_2025': complete_schedule,
         'season': 2025,
         # 2024 season statistics
         'total_games_2024': played_games_2024,
-        'wins_2024': wins_2024,
-        'losses_2024': losses_2024,
-        'ties_2024': ties_2024,
+        'wins_2024': stats_2024.wins,
+        'losses_2024': stats_2024.losses,
+        'ties_2024': stats_2024.ties,
         'win_percentage_2024': win_percentage_2024,
-        'points_for_2024': points_for_2024,
-        'points_against_2024': points_against_2024,
-        'avg_points_for_2024': avg_points_for_2024,
-        'avg_points_against_2024': avg_points_against_2024,
+        'points_for_2024': stats_2024.points_for,
+        'points_against_2024': stats_2024.points_against,
+        'avg_points_for_2024': stats_2024.avg_points_for,
+        'avg_points_against_2024': stats_2024.avg_points_against,
         'games_2024': all_games_2024,
     }
     
     return render(request, 'team_detail.jinja', context)
 
+@versioned_page(lambda week_number: [week_scope(2025, week_number), TEAMS_SCOPE])
 def week_detail(request, week_number):
     # Get all games for the specified week in 2025 season
-    games = Game.objects.filter(
+    week_games = Game.objects.filter(
         season=2025, 
         week=week_number
     ).exclude(
@@ -260,35 +161,26 @@ def week_detail(request, week_number):
         home_team__name='DET',
         game_date__day=1,
         game_date__month=8
-    ).order_by('game_date')
+    )
+    games = list(week_games.select_related('home_team', 'away_team').order_by('game_date'))
     
     # Check if week exists
-    if not games.exists():
+    if not games:
         # Check if week number is valid (1-18 for regular season + playoffs)
         if week_number < 1 or week_number > 22:
             from django.http import Http404
             raise Http404("Invalid week number")
     
     # Count total games scheduled vs played
-    total_games = games.count()
-    played_games = games.exclude(home_score=0, away_score=0).count()
-    
-    # Calculate teams on bye week
-    # Get all teams that have games this week
-    teams_playing_this_week = set()
-    for game in games:
-        teams_playing_this_week.add(game.home_team)
-        teams_playing_this_week.add(game.away_team)
-    
-    # Get all teams and find those not playing this week
-    all_teams = Team.objects.filter(
-        Q(home_games__season=2025) | Q(away_games__season=2025)
-    ).distinct().order_by('name')
-    
-    bye_week_teams = []
-    for team in all_teams:
-        if team not in teams_playing_this_week:
-            bye_week_teams.append(team)
+    total_games = len(games)
+    played_games = sum(1 for game in games if game.home_score != 0 or game.away_score != 0)
+    
+    # Teams on bye: 2025 teams with no game this week, as a single anti-join
+    bye_week_teams = list(
+        Team.objects.filter(season_stats__season=2025).exclude(
+            Exists(week_games.filter(Q(home_team=OuterRef('pk')) | Q(away_team=OuterRef('pk'))))
+        )
+    )
     
     # Sort bye week teams by conference and division
     bye_week_teams.sort(key=lambda t: (t.conference or 'ZZZ', t.division or 'ZZZ', t.name))
@@ -340,6 +232,7 @@ def account(request):
     }
     return render(request, 'registration/account.jinja', context)
 
+@versioned_page(game_page_scopes)
 def game_detail(request, game_id):
     game = get_object_or_404(Game, id=game_id)
     
@@ -372,84 +265,45 @@ def game_detail(request, game_id):
 
 def calculate_team_stats_before_game(team, current_game):
     """Calculate team statistics before the current game"""
-    # Get all games for this team in the same season before current game
-    team_games = Game.objects.filter(
-        Q(home_team=team) | Q(away_team=team),
-        season=current_game.season,
-        game_date__lt=current_game.game_date
-    ).exclude(home_score=0, away_score=0).order_by('game_date')
-    
-    wins = losses = ties = 0
-    points_for = points_against = 0
-    
-    for game in team_games:
-        if game.home_team == team:
-            team_score = game.home_score
-            opponent_score = game.away_score
-        else:
-            team_score = game.away_score  
-            opponent_score = game.home_score
-            
-        points_for += team_score
-        points_against += opponent_score
-        
-        if team_score > opponent_score:
-            wins += 1
-        elif team_score < opponent_score:
-            losses += 1
-        else:
-            ties += 1
+    # The running record after the team's previous game this season
+    record = TeamGameRecord.before_game(team, current_game)
     
-    total_games = wins + losses + ties
-    win_pct = (wins + ties * 0.5) / total_games if total_games > 0 else 0
+    if record is None:
+        record = TeamGameRecord(season=current_game.season)
     
     return {
-        'wins': wins,
-        'losses': losses,
-        'ties': ties,
-        'win_percentage': win_pct,
-        'points_for': points_for,
-        'points_against': points_against,
-        'games_played': total_games
+        'wins': record.wins,
+        'losses': record.losses,
+        'ties': record.ties,
+        'win_percentage': record.win_percentage,
+        'points_for': record.points_for,
+        'points_against': record.points_against,
+        'games_played': record.games_played
     }
 
 def calculate_head_to_head(away_team, home_team, before_date=None):
     """Calculate head-to-head record between two teams"""
-    h2h_games = Game.objects.filter(
-        Q(home_team=home_team, away_team=away_team) |
-        Q(home_team=away_team, away_team=home_team)
+    # The latest meeting carries the cumulative series record
+    recent_meetings = list(
+        MatchupRecord.meetings(away_team, home_team, before_date=before_date)
+        .select_related('game__home_team', 'game__away_team')[:5]
     )
     
-    if before_date:
-        h2h_games = h2h_games.filter(game_date__lt=before_date)
-    
-    h2h_games = h2h_games.exclude(home_score=0, away_score=0).order_by('-game_date')
+    if not recent_meetings:
+        return {
+            'away_wins': 0,
+            'home_wins': 0,
+            'ties': 0,
+            'recent_games': []
+        }
     
-    away_wins = home_wins = ties = 0
-    
-    for game in h2h_games:
-        if game.home_team == home_team:
-            # Home team is current home team
-            if game.home_score > game.away_score:
-                home_wins += 1
-            elif game.home_score < game.away_score:
-                away_wins += 1
-            else:
-                ties += 1
-        else:
-            # Away team is current home team (teams switched positions)
-            if game.away_score > game.home_score:
-                home_wins += 1
-            elif game.away_score < game.home_score:
-                away_wins += 1
-            else:
-                ties += 1
+    latest = recent_meetings[0]
     
     return {
-        'away_wins': away_wins,
-        'home_wins': home_wins,
-        'ties': ties,
-        'recent_games': h2h_games[:5]  # Last 5 games
+        'away_wins': latest.wins_for(away_team),
+        'home_wins': latest.wins_for(home_team),
+        'ties': latest.ties,
+        'recent_games': [meeting.game for meeting in recent_meetings]  # Last 5 games
     }
 
 def logout_view(request):
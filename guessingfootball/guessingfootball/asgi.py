@@ -2,6 +2,8 @@
 ASGI config for guessingfootball project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it (e.g. ``uvicorn guessingfootball.asgi:application``) for the live
+score stream at /api/live/stream/, which holds connections open.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
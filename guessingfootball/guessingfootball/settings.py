@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -73,7 +74,7 @@ TEMPLATES = [
     },
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -99,6 +100,49 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Shared between processes so page versions bumped by the live poller and
+# other management commands invalidate pages cached by the web server
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    }
+}
+
+
+# ESPN
+# Scoreboard endpoint used by every ingestion command and the admin fetch.
+# Point it at the local stand-in (manage.py espn_standin) to run ingestion
+# offline, e.g. ESPN_SCOREBOARD_URL=http://127.0.0.1:8765/scoreboard
+
+ESPN_SCOREBOARD_URL = os.environ.get(
+    'ESPN_SCOREBOARD_URL',
+    'https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard',
+)
+
+# Backfill commands wait between requests to be gentle on ESPN
+ESPN_PAUSE_BETWEEN_REQUESTS = True
+
+# On-disk cache of scoreboard responses (see football/espn_cache.py); None
+# turns it off. Finished seasons are kept forever, the rest for these
+# many seconds before being revalidated.
+ESPN_CACHE_DIR = BASE_DIR / 'espn_cache'
+ESPN_CACHE_TTL = 600
+ESPN_CACHE_LIVE_TTL = 30
+
+
+# Historical results
+# Columnar archive compiled from results.py by manage.py build_results_archive
+
+RESULTS_ARCHIVE_DIR = BASE_DIR / 'results_archive'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
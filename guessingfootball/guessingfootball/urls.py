@@ -19,6 +19,7 @@ from django.urls import path, include
 from django.contrib.auth import views as auth_views
 from . import views
 from football.views import teams_list, team_detail, week_detail, game_detail, signup, account, logout_view
+from football import api
 
 urlpatterns = [
     path('', views.home, name='home'),
@@ -28,6 +29,15 @@ urlpatterns = [
     path('game/<int:game_id>/', game_detail, name='game_detail'),
     path('admin/', admin.site.urls),
     
+    # JSON API
+    path('api/scoreboard/<int:season>/<int:week>/', api.scoreboard, name='api_scoreboard'),
+    path('api/scoreboard/<int:season>/<int:week>/replay/', api.scoreboard_replay, name='api_scoreboard_replay'),
+    path('api/live/', api.live_games, name='api_live_games'),
+    path('api/live/stream/', api.live_stream, name='api_live_stream'),
+    path('api/teams/<int:season>/', api.team_records, name='api_team_records'),
+    path('api/games/<int:game_id>/', api.game_detail, name='api_game_detail'),
+    path('api/games/<int:game_id>/timeline/', api.game_score_timeline, name='api_game_timeline'),
+    
     # Authentication URLs
     path('accounts/login/', auth_views.LoginView.as_view(template_name='registration/login.jinja'), name='login'),
     path('accounts/logout/', logout_view, name='logout'),
@@ -0,0 +1,50 @@
+// Keep live scores on the page current from the /api/live/stream/ event stream.
+// Elements marked data-live-game="<id>" hold children marked data-live-field.
+(function () {
+    const games = {};
+
+    function render(state) {
+        document.querySelectorAll(`[data-live-game="${state.id}"]`).forEach(container => {
+            const set = (field, text) => {
+                container.querySelectorAll(`[data-live-field="${field}"]`).forEach(element => {
+                    element.textContent = text;
+                });
+            };
+            set('away_score', state.away_score);
+            set('home_score', state.home_score);
+            set('status', state.status);
+
+            const clock = [state.quarter ? `${state.quarter} Quarter` : '', state.time_remaining].filter(Boolean);
+            set('clock', clock.join(' - '));
+
+            const { homeTeam, awayTeam } = container.dataset;
+            if (homeTeam && awayTeam) {
+                let leader = 'Tied';
+                if (state.home_score > state.away_score) leader = `${homeTeam} Leading`;
+                else if (state.away_score > state.home_score) leader = `${awayTeam} Leading`;
+                set('leader', leader);
+            }
+        });
+    }
+
+    function apply(change) {
+        const known = document.querySelector(`[data-live-game="${change.id}"]`);
+        if (!known) {
+            return;
+        }
+        if (change.is_live === false) {
+            // The game just ended; the final layout differs, so load it fresh
+            window.location.reload();
+            return;
+        }
+        games[change.id] = Object.assign(games[change.id] || {}, change);
+        render(games[change.id]);
+    }
+
+    if (!window.EventSource || !document.querySelector('[data-live-game]')) {
+        return;
+    }
+    const source = new EventSource('/api/live/stream/');
+    source.addEventListener('snapshot', event => JSON.parse(event.data).forEach(apply));
+    source.addEventListener('update', event => JSON.parse(event.data).forEach(apply));
+})();